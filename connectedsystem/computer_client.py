@@ -2,11 +2,16 @@ from zeroconf import ServiceBrowser, ServiceListener, Zeroconf
 import socket
 import time
 import threading
-import pyautogui
+import os
+import sys
 import tkinter as tk
 from tkinter import ttk
 import logging
 
+# Key injection is shared with the gesture scripts
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'optimize'))
+from inject import open_injector
+
 class GestureServiceListener(ServiceListener):
     def __init__(self):
         self.server_info = None
@@ -45,6 +50,7 @@ class GestureClient:
         self.status_callback = None
         self.recording_callback = None
         self.is_recording = False
+        self.injector = open_injector()  # No 0.1 s pause per key, unlike pyautogui.press
         
     def connect_to_server(self, service_info):
         if self.connected:
@@ -100,9 +106,9 @@ class GestureClient:
                         self.recording_callback(False)
                 #elif self.is_recording:  # Only process movement commands if recording
                 if command == "NEXT":
-                    pyautogui.press('right')
+                    self.injector.press('right')
                 elif command == "PREV":
-                    pyautogui.press('left')
+                    self.injector.press('left')
                         
             except Exception as e:
                 print(f"Error receiving command: {e}")
@@ -115,6 +121,8 @@ class GestureClient:
                 
     def cleanup(self):
         self.connected = False
+        self.injector.close()
+        print(self.injector.report())
         if self.socket:
             try:
                 self.socket.close()
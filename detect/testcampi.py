@@ -1,282 +1,141 @@
 import cv2
-import mediapipe as mp
-import pyautogui
+import signal
 import threading
 import time
-import numpy as np
-import math
-import keyboard_server as ps
+import argparse
+import os
+import sys
 from threading import Lock
 
-###################### SET UP ######################################
-# Camera and Mediapipe setup
-width_cam, height_cam = 640, 480
-mp_hand = mp.solutions.hands.Hands(
-    static_image_mode=False,
-    max_num_hands=1,
-    min_detection_confidence=0.75,
-    min_tracking_confidence=0.75,
-    model_complexity=1
-)
-
-cap = cv2.VideoCapture(0)  # Open default camera
-if not cap.isOpened():
-    print("Error: Camera not initialized. Check connection or permissions.")
-    exit()
-
-cap.set(cv2.CAP_PROP_FRAME_WIDTH, 320)  # Lower resolution for performance
-cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)
-
-# Recording and threading setup
-hand_status = ''
-prev_time = 0
-record_flag = False
-recording_thread = None
-last_toggle_time = 0
-server = ps.KeyboardServer()
-lock = Lock()  # Thread safety for recording toggle
-
-frame_counter = 0
-skip_frames = 3  # Process every 3rd frame to reduce load
-###################################################################
-
-def key_press(direction):
-    """Simulates a key press using pyautogui."""
-    pyautogui.press(direction)
-
-def record_screen():
-    """Records the screen and saves to a file."""
-    global record_flag
-    try:
-        screen_size = pyautogui.size()
-        fourcc = cv2.VideoWriter_fourcc(*"XVID")
-        fps = 30  # Adjusted for smoother recording
-        out = cv2.VideoWriter('screen_recording.avi', fourcc, fps, screen_size)
-
-        print("Recording started...")
-        start_time = time.time()
-        frame_count = 0
-
-        while record_flag:
-            img = pyautogui.screenshot()
-            frame = np.array(img)
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            out.write(frame)
-            frame_count += 1
-
-            elapsed_time = time.time() - start_time
-            expected_time = frame_count / fps
-            if elapsed_time < expected_time:
-                time.sleep(expected_time - elapsed_time)
-
-        out.release()
-        print("Recording stopped and saved.")
-    except Exception as e:
-        print(f"Error during screen recording: {e}")
-
-def manage_recording():
-    """Manages recording toggle on/off."""
-    global record_flag, recording_thread, last_toggle_time
-
-    current_time = time.time()
-    if current_time - last_toggle_time < 1:  # Prevent rapid toggling
-        return
-
-    with lock:
-        if not record_flag:
-            record_flag = True
-            recording_thread = threading.Thread(target=record_screen)
-            recording_thread.start()
-            print("Recording started")
-        else:
-            record_flag = False
-            if recording_thread is not None:
-                recording_thread.join()
-            print("Recording stopped")
-
-    last_toggle_time = current_time
-
-def interact(frame, x, y):
-    """Handles interactions based on hand position."""
-    frame_height, frame_width = frame.shape[:2]
-    if x < frame_width * 0.3:
-        server.start('left')
-        time.sleep(1.1)
-    elif x > frame_width * 0.7:
-        server.start('right')
-        time.sleep(1.1)
-
-######################### MAIN PROCESS ################################
-try:
-    while True:
-        success, frame = cap.read()
-        if not success:
-            print("Error: Failed to capture frame.")
-            break
-
-        frame_counter += 1
-        if frame_counter % skip_frames != 0:  # Skip frames to reduce CPU load
-            continue
-
-        frame = cv2.flip(frame, 1)
-        frame_shape = frame.shape
-        frame.flags.writeable = False
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = mp_hand.process(rgb_frame)
-
-        frame.flags.writeable = True
-        left_coordinate = None
-        right_coordinate = None
-        left_hand_detected, right_hand_detected = False, False
-        x_center, y_center = None, None
-
-        if result.multi_hand_landmarks:
-            for handlm, handedness in zip(result.multi_hand_landmarks, result.multi_handedness):
-                hand_label = handedness.classification[0].label
-                h, w, _ = frame_shape
-
-                cx, cy = int(handlm.landmark[8].x * w), int(handlm.landmark[8].y * h)
-                if hand_label == "Left":
-                    left_hand_detected = True
-                    left_coordinate = (cx, cy)
-                else:
-                    right_hand_detected = True
-                    right_coordinate = (cx, cy)
-
-                # Draw hand landmarks
-                cv2.circle(frame, (cx, cy), 10, (0, 255, 0), -1)
-
-                if left_hand_detected:
-                    cv2.putText(frame, f"Left Index: {left_coordinate}", (10, 30),
-                                cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
-                if right_hand_detected:
-                    cv2.putText(frame, f"Right Index: {right_coordinate}", (10, 70),
-                                cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-
-                if hand_label == "Right":
-                    thumb_tip = handlm.landmark[4]
-                    index_tip = handlm.landmark[8]
-
-                    x_thumb, y_thumb = int(thumb_tip.x * w), int(thumb_tip.y * h)
-                    x_index, y_index = int(index_tip.x * w), int(index_tip.y * h)
-
-                    cv2.circle(frame, (x_thumb, y_thumb), 10, (255, 0, 0), -1)
-                    cv2.circle(frame, (x_index, y_index), 10, (0, 255, 0), -1)
-
-                    distance = math.hypot(x_thumb - x_index, y_thumb - y_index)
-                    if distance < 24:
-                        cv2.circle(frame, ((x_thumb + x_index) // 2, (y_thumb + y_index) // 2), 10, (0, 255, 255), -1)
-                        manage_recording()
-                    else:
-                        interact(frame, x_index, y_index)
-
-        cv2.putText(frame, f"Recording: {'ON' if record_flag else 'OFF'}", (10, 110),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0) if record_flag else (0, 0, 255), 2)
-
-        curr_time = time.time()
-        fps = 1 / (curr_time - prev_time)
-        prev_time = curr_time
-
-        cv2.putText(frame, f'FPS: {int(fps)}', (430, 35), cv2.FONT_HERSHEY_COMPLEX,
-                    1, (255, 0, 255), 2)
-
-        cv2.imshow("Hand Frame", frame)
-        key = cv2.waitKey(1)
-        if key == 27:  # Press Esc to exit
-            break
-
-except Exception as e:
-    print(f"Error: {e}")
-finally:
-    if record_flag:
-        record_flag = False
-        if recording_thread is not None:
-            recording_thread.join()
-    cap.release()
-    cv2.destroyAllWindows()
-import cv2
-import mediapipe as mp
-import pyautogui
-import threading
-import time
-import numpy as np
-import math
+# Shared pipeline modules live next to the optimized entry point
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'optimize'))
 import keyboard_server as ps
-from threading import Lock
+from capture import FrameGrabber
+from framepool import FramePool
+from sources import open_source
+from calibration import load_calibration
+from screenfind import DriftMonitor
+from dispatcher import ActionDispatcher
+from scheduler import AdaptiveScheduler
+from motion import MotionGate
+from pipeline import GesturePipeline, make_hands
+from sampler import StackSampler
+from screenrec import ScreenRecorder
+from landmarklog import LandmarkLog
+from pointer import PointerController
+from inject import BACKENDS, open_injector
+from config import hands_options, load_profile
+from metrics import StageMetrics
 
 ###################### SET UP ######################################
-# Camera and Mediapipe setup
+parser = argparse.ArgumentParser(description="Hand gesture slide control")
+parser.add_argument('--preview', action='store_true',
+                    help="show the camera window with overlays (off by default for projector deployments)")
+parser.add_argument('--metrics-port', type=int, default=9108,
+                    help="serve Prometheus metrics on this port (0 disables)")
+parser.add_argument('--metrics-host', default='127.0.0.1',
+                    help="address the metrics endpoint listens on (0.0.0.0 lets other machines scrape it)")
+parser.add_argument('--log-interval', type=float, default=30,
+                    help="seconds between metrics log lines (0 disables)")
+parser.add_argument('--source', default='0',
+                    help="camera index or /dev/videoN, a video file, an image folder or synthetic")
+parser.add_argument('--calibration', help="screen calibration from detect/videos/tesstcam.py (default: optimize/calibration.json)")
+parser.add_argument('--auto-calibrate', action='store_true',
+                    help="find the projector screen in the camera image when there is no calibration")
+parser.add_argument('--drift-interval', type=float, default=30,
+                    help="seconds between checks that the screen hasn't moved (0 disables)")
+parser.add_argument('--profile', help="tuning profile from optimize/autotune.py (default: optimize/gesture_profile.json)")
+parser.add_argument('--backend', default='legacy', choices=('legacy', 'live'),
+                    help="blocking Hands.process() or the Tasks HandLandmarker in live-stream mode, which never blocks the loop")
+parser.add_argument('--fixed-complexity', action='store_true',
+                    help="always run the configured model instead of tracking with the light one")
+parser.add_argument('--hand-model', help="hand_landmarker.task for --backend live (default: optimize/hand_landmarker.task)")
+parser.add_argument('--no-motion-gate', action='store_true',
+                    help="run hand inference even when nothing in view moves")
+parser.add_argument('--pointer', action='store_true',
+                    help="the index fingertip moves the mouse and a pinch clicks; swipes still change slides")
+parser.add_argument('--input', default='auto', choices=['auto'] + list(BACKENDS),
+                    help="how keys and the pointer are injected (auto: uinput, then xtest, then pyautogui)")
+parser.add_argument('--session-log', metavar='DIR',
+                    help="keep every frame's landmarks and decisions under DIR for replay with landmarklog.py")
+parser.add_argument('--sample-stacks', action='store_true',
+                    help="profile all threads from the start (kill -USR2 <pid> toggles it at any time)")
+parser.add_argument('--sample-dir', default='.', help="where collapsed-stack profiles are written")
+args = parser.parse_args()
+preview = args.preview  # Headless: no drawing, no imshow, no FPS text
+
+# Camera and Mediapipe setup; an autotuned profile overrides these defaults
 width_cam, height_cam = 640, 480
-mp_hand = mp.solutions.hands.Hands(
-    static_image_mode=False,
-    max_num_hands=1,
-    min_detection_confidence=0.75,
-    min_tracking_confidence=0.75,
-    model_complexity=1
-)
-
-cap = cv2.VideoCapture(0)  # Open default camera
+settings = load_profile(args.profile, defaults={
+    'width': 320,  # Lower resolution for performance
+    'height': 240,
+    'model_complexity': 1,
+    'min_detection_confidence': 0.75,
+    'min_tracking_confidence': 0.75,
+})
+mp_hand = make_hands(**hands_options(settings), backend=args.backend, model_path=args.hand_model,
+                     dynamic=not args.fixed_complexity)
+
+# Cameras are asked for MJPEG at this size; files and test patterns play in real time
+cap = open_source(args.source, settings['width'], settings['height'])
 if not cap.isOpened():
     print("Error: Camera not initialized. Check connection or permissions.")
     exit()
 
-cap.set(cv2.CAP_PROP_FRAME_WIDTH, 320)  # Lower resolution for performance
-cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)
+metrics = StageMetrics()
+pool = FramePool()  # Camera and mirror buffers are recycled instead of allocated per frame
+grabber = FrameGrabber(cap, metrics, pool).start()  # Camera I/O runs off the inference loop
 
 # Recording and threading setup
-hand_status = ''
 prev_time = 0
 record_flag = False
 recording_thread = None
-last_toggle_time = 0
 server = ps.KeyboardServer()
+accept_thread = threading.Thread(target=server.accept_connections)
+accept_thread.daemon = True
+accept_thread.start()
 lock = Lock()  # Thread safety for recording toggle
 
-frame_counter = 0
-skip_frames = 3  # Process every 3rd frame to reduce load
+# Inference rate and input size adapt to hit this gesture-to-action budget (seconds);
+# the hand is tracked in a cropped region between detections. The pointer needs every frame.
+pipeline = GesturePipeline(mp_hand, scheduler=AdaptiveScheduler(target_latency=0.15,
+                                                                max_stride=1 if args.pointer else 6),
+                           left_zone=0.3, right_zone=0.7,
+                           motion_gate=None if args.no_motion_gate else MotionGate(), pool=pool,
+                           calibration=load_calibration(args.calibration))
+if args.session_log:
+    pipeline.log = LandmarkLog.create(args.session_log, calibration=pipeline.calibration)
+# Re-calibrates when the camera was bumped, or calibrates from scratch with --auto-calibrate
+drift = None
+if args.drift_interval and (pipeline.calibration is not None or args.auto_calibrate):
+    drift = DriftMonitor(pipeline.calibration, args.drift_interval, path=args.calibration)
+injector = open_injector(args.input)  # No per-call pause, unlike pyautogui.press
+pointer = None
+if args.pointer:
+    pointer = PointerController(injector.move, lambda: injector.button(True),
+                                lambda: injector.button(False), injector.screen_size).start()
 ###################################################################
 
 def key_press(direction):
-    """Simulates a key press using pyautogui."""
-    pyautogui.press(direction)
+    """Simulates a key press through the input injector."""
+    injector.press(direction)
 
 def record_screen():
     """Records the screen and saves to a file."""
-    global record_flag
     try:
-        screen_size = pyautogui.size()
-        fourcc = cv2.VideoWriter_fourcc(*"XVID")
-        fps = 30  # Adjusted for smoother recording
-        out = cv2.VideoWriter('screen_recording.avi', fourcc, fps, screen_size)
-
+        # Frames are paced on the monotonic clock and repeated when a grab runs late,
+        # so the file plays back at the real speed whatever rate the screen can be grabbed at
+        recorder = ScreenRecorder('screen_recording.avi', fps=30)
         print("Recording started...")
-        start_time = time.time()
-        frame_count = 0
-
-        while record_flag:
-            img = pyautogui.screenshot()
-            frame = np.array(img)
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            out.write(frame)
-            frame_count += 1
-
-            elapsed_time = time.time() - start_time
-            expected_time = frame_count / fps
-            if elapsed_time < expected_time:
-                time.sleep(expected_time - elapsed_time)
-
-        out.release()
+        recorder.record(lambda: record_flag)
         print("Recording stopped and saved.")
+        print(recorder.report())
     except Exception as e:
         print(f"Error during screen recording: {e}")
 
 def manage_recording():
     """Manages recording toggle on/off."""
-    global record_flag, recording_thread, last_toggle_time
-
-    current_time = time.time()
-    if current_time - last_toggle_time < 1:  # Prevent rapid toggling
-        return
+    global record_flag, recording_thread
 
     with lock:
         if not record_flag:
@@ -290,81 +149,103 @@ def manage_recording():
                 recording_thread.join()
             print("Recording stopped")
 
-    last_toggle_time = current_time
-
-def interact(frame, x, y):
-    """Handles interactions based on hand position."""
-    frame_height, frame_width = frame.shape[:2]
-    if x < frame_width * 0.3:
-        server.start('left')
-        time.sleep(1.1)
-    elif x > frame_width * 0.7:
-        server.start('right')
-        time.sleep(1.1)
+# Slide actions run on the dispatcher thread; cooldowns replace time.sleep
+dispatcher = ActionDispatcher()
+dispatcher.register('left', lambda: server.broadcast_command("PREV"), cooldown=1.1, group='slide')
+dispatcher.register('right', lambda: server.broadcast_command("NEXT"), cooldown=1.1, group='slide')
+dispatcher.start()
+# Stopping waits for the screen writer to finish, so recording toggles get their own thread
+recording = ActionDispatcher(maxsize=2)
+recording.register('record', manage_recording, cooldown=1)  # Prevent rapid toggling
+recording.start()
+
+if args.metrics_port:
+    metrics.serve(args.metrics_port, args.metrics_host)
+if args.log_interval:
+    metrics.start_logging(args.log_interval)
+metrics.add_gauge('gesture_dropped_frames_total', "Camera frames overwritten before use",
+                  lambda: grabber.dropped, kind='counter')
+metrics.add_gauge('gesture_capture_fps', "Frames per second delivered by the source", cap.fps)
+metrics.add_gauge('gesture_decode_seconds', "Average time to decode one camera frame", cap.avg_decode)
+metrics.add_gauge('gesture_inferences_saved_total', "Inferences skipped because nothing moved",
+                  lambda: pipeline.motion_gate.skipped if pipeline.motion_gate else 0, kind='counter')
+metrics.add_gauge('gesture_inference_stride', "Inference runs on every Nth frame",
+                  lambda: pipeline.scheduler.stride)
+metrics.add_gauge('gesture_inference_scale', "Input scale handed to MediaPipe",
+                  lambda: pipeline.scheduler.scale)
+metrics.add_gauge('gesture_scheduler_changes_total', "Stride or scale changes made by the scheduler",
+                  lambda: pipeline.scheduler.changes, kind='counter')
+if hasattr(mp_hand, 'light_runs'):
+    metrics.add_gauge('gesture_light_model_runs_total', "Inferences on the light hand model",
+                      lambda: mp_hand.light_runs, kind='counter')
+    metrics.add_gauge('gesture_full_model_runs_total', "Inferences on the full hand model",
+                      lambda: mp_hand.full_runs, kind='counter')
+if pointer is not None:
+    metrics.add_gauge('gesture_pointer_latency_seconds', "Median camera-to-cursor latency",
+                      lambda: (pointer.latency()[0] or 0.0) / 1000)
+    metrics.add_gauge('gesture_pointer_coalesced_total', "Cursor positions dropped for a newer one",
+                      lambda: pointer.coalesced, kind='counter')
+metrics.add_gauge('gesture_recording', "1 while screen recording is on", lambda: record_flag)
+
+# Stack sampling profiler; SIGUSR2 starts it and the next SIGUSR2 writes the flamegraph input
+sampler = StackSampler(args.sample_dir)
+if hasattr(signal, 'SIGUSR2'):
+    signal.signal(signal.SIGUSR2, lambda signum, frame: sampler.toggle())
+if args.sample_stacks:
+    sampler.start()
 
 ######################### MAIN PROCESS ################################
 try:
     while True:
-        success, frame = cap.read()
+        success, frame = grabber.read()
         if not success:
             print("Error: Failed to capture frame.")
             break
 
-        frame_counter += 1
-        if frame_counter % skip_frames != 0:  # Skip frames to reduce CPU load
+        if not pipeline.should_process():  # Skip frames to reduce CPU load
+            pool.release(frame)
             continue
 
-        frame = cv2.flip(frame, 1)
-        frame_shape = frame.shape
-        frame.flags.writeable = False
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = mp_hand.process(rgb_frame)
-
-        frame.flags.writeable = True
-        left_coordinate = None
-        right_coordinate = None
-        left_hand_detected, right_hand_detected = False, False
-        x_center, y_center = None, None
-
-        if result.multi_hand_landmarks:
-            for handlm, handedness in zip(result.multi_hand_landmarks, result.multi_handedness):
-                hand_label = handedness.classification[0].label
-                h, w, _ = frame_shape
-
-                cx, cy = int(handlm.landmark[8].x * w), int(handlm.landmark[8].y * h)
-                if hand_label == "Left":
-                    left_hand_detected = True
-                    left_coordinate = (cx, cy)
-                else:
-                    right_hand_detected = True
-                    right_coordinate = (cx, cy)
-
-                # Draw hand landmarks
-                cv2.circle(frame, (cx, cy), 10, (0, 255, 0), -1)
-
-                if left_hand_detected:
-                    cv2.putText(frame, f"Left Index: {left_coordinate}", (10, 30),
-                                cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
-                if right_hand_detected:
-                    cv2.putText(frame, f"Right Index: {right_coordinate}", (10, 70),
-                                cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-
-                if hand_label == "Right":
-                    thumb_tip = handlm.landmark[4]
-                    index_tip = handlm.landmark[8]
-
-                    x_thumb, y_thumb = int(thumb_tip.x * w), int(thumb_tip.y * h)
-                    x_index, y_index = int(index_tip.x * w), int(index_tip.y * h)
-
-                    cv2.circle(frame, (x_thumb, y_thumb), 10, (255, 0, 0), -1)
-                    cv2.circle(frame, (x_index, y_index), 10, (0, 255, 0), -1)
+        out = pipeline.process(frame, grabber.read_time)
+        if drift is not None and drift.check(frame) is not None:
+            pipeline.set_calibration(drift.calibration)
+        pool.release(frame)  # Only the mirrored copy is used from here on
+        frame = out.frame
+        metrics.observe_all(pipeline.timings)
+        if pointer is not None:
+            pointer.feed(out, grabber.read_time)
+            # Pinch clicks and pointing doesn't flip slides; a swipe the SlideGate held back has no action
+            if out.gesture in ('swipe_left', 'swipe_right') and out.action in ('left', 'right'):
+                dispatcher.post(out.action)
+        elif out.action == 'record':
+            recording.post('record')
+        elif out.action is not None:
+            dispatcher.post(out.action)
+
+        if not preview:
+            metrics.frame_done()
+            pool.release(frame)
+            continue
 
-                    distance = math.hypot(x_thumb - x_index, y_thumb - y_index)
-                    if distance < 24:
-                        cv2.circle(frame, ((x_thumb + x_index) // 2, (y_thumb + y_index) // 2), 10, (0, 255, 255), -1)
-                        manage_recording()
-                    else:
-                        interact(frame, x_index, y_index)
+        # Draw hand landmarks
+        draw_start = time.perf_counter()
+        for hand_label, points in out.hands:
+            cx, cy = int(points[8, 0]), int(points[8, 1])
+            cv2.circle(frame, (cx, cy), 10, (0, 255, 0), -1)
+            if hand_label == "Left":
+                cv2.putText(frame, f"Left Index: {(cx, cy)}", (10, 30),
+                            cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
+            else:
+                cv2.putText(frame, f"Right Index: {(cx, cy)}", (10, 70),
+                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+
+        if out.gesture is not None:
+            cv2.circle(frame, out.thumb, 10, (255, 0, 0), -1)
+            cv2.circle(frame, out.index, 10, (0, 255, 0), -1)
+            cv2.putText(frame, out.gesture, (10, 150), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
+            if out.gesture == 'pinch':
+                cv2.circle(frame, ((out.thumb[0] + out.index[0]) // 2, (out.thumb[1] + out.index[1]) // 2),
+                           10, (0, 255, 255), -1)
 
         cv2.putText(frame, f"Recording: {'ON' if record_flag else 'OFF'}", (10, 110),
                     cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0) if record_flag else (0, 0, 255), 2)
@@ -376,17 +257,46 @@ try:
         cv2.putText(frame, f'FPS: {int(fps)}', (430, 35), cv2.FONT_HERSHEY_COMPLEX,
                     1, (255, 0, 255), 2)
 
+        display_start = time.perf_counter()
+        metrics.observe('draw', display_start - draw_start)
         cv2.imshow("Hand Frame", frame)
         key = cv2.waitKey(1)
+        metrics.observe('display', time.perf_counter() - display_start)
+        metrics.frame_done()
+        pool.release(frame)
         if key == 27:  # Press Esc to exit
             break
 
+except KeyboardInterrupt:  # Ctrl-C is the way out when there is no window
+    pass
 except Exception as e:
     print(f"Error: {e}")
 finally:
+    sampler.stop()
+    dispatcher.stop()
+    print(dispatcher.report())
+    recording.stop(timeout=None)  # Let a stop in progress finish saving
+    if pointer is not None:
+        pointer.stop()
+        print(pointer.report())
+    injector.close()
+    print(injector.report())
     if record_flag:
         record_flag = False
         if recording_thread is not None:
             recording_thread.join()
+    grabber.stop()
+    print(grabber.report())
+    print(cap.report())
+    print(pool.report())
+    if drift is not None:
+        print(drift.report())
+    print(pipeline.report())
+    if pipeline.log is not None:
+        pipeline.log.close()
+        print(pipeline.log.report())
+    print(metrics.log_line())
+    metrics.stop()
     cap.release()
-    cv2.destroyAllWindows()
+    if preview:
+        cv2.destroyAllWindows()
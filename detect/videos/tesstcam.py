@@ -1,5 +1,12 @@
 import cv2
 import numpy as np
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'optimize'))
+from sources import open_source
+from calibration import Calibration, save_calibration
+from screenfind import find_screen
 
 # Global variables to store mouse position and clicked points
 mouse_x = 0
@@ -44,7 +51,7 @@ def draw_rectangle(frame):
                     cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
 
 # Initialize the camera
-cap = cv2.VideoCapture('/dev/video2')
+cap = open_source(sys.argv[1] if len(sys.argv) > 1 else '/dev/video2')
 
 # Check if the camera opened successfully
 if not cap.isOpened():
@@ -54,6 +61,10 @@ if not cap.isOpened():
 # Create window and set mouse callback
 cv2.namedWindow('Camera Feed with Rectangle Drawing')
 cv2.setMouseCallback('Camera Feed with Rectangle Drawing', mouse_callback)
+print("Click the four screen corners (or 'a' to find them), then 's' to save the calibration, "
+      "'r' to preview the rectified screen")
+show_rectified = False
+calibration = None
 
 while True:
     # Capture frame-by-frame
@@ -93,6 +104,13 @@ while True:
     
     # Display the frame
     cv2.imshow('Camera Feed with Rectangle Drawing', frame_with_overlay)
+
+    if len(clicked_points) < 4:
+        calibration = None
+    elif calibration is None:  # Homography and remap tables are built once per set of corners
+        calibration = Calibration(clicked_points, (frame.shape[1], frame.shape[0]))
+    if calibration is not None and show_rectified:
+        cv2.imshow('Rectified screen', calibration.rectify(frame, (640, 360)))
     
     # Break the loop on 'q' press, 'c' to clear points
     key = cv2.waitKey(1) & 0xFF
@@ -101,6 +119,23 @@ while True:
     elif key == ord('c'):  # Clear all stored points
         clicked_points.clear()
         print("Cleared all stored points")
+    elif key == ord('s'):  # Save for the gesture scripts
+        if calibration is None:
+            print("Click all 4 corners before saving")
+        else:
+            print(f"Calibration saved to {save_calibration(calibration)}")
+    elif key == ord('a'):  # Brightest quadrilateral in view
+        corners = find_screen(frame)
+        if corners is None:
+            print("No screen found")
+        else:
+            clicked_points[:] = [(int(round(x)), int(round(y))) for x, y in corners]
+            calibration = None
+            print(f"Screen found: {clicked_points}")
+    elif key == ord('r'):
+        show_rectified = not show_rectified
+        if not show_rectified:
+            cv2.destroyWindow('Rectified screen')
 
 # Print final stored coordinates
 print("\nFinal stored coordinates:")
@@ -0,0 +1,148 @@
+"""Sweeps camera resolution and MediaPipe settings over recorded replays.
+
+Every combination is replayed through the gesture pipeline with bench.py's
+harness. The fastest one whose accuracy clears --min-accuracy is written to
+the tuning profile, which the gesture entry points load at startup.
+
+    python autotune.py lecture1.mp4 lecture2.mp4 --min-accuracy 0.9
+
+Accuracy is the gesture-trigger F1 score when every source has a
+<video>.truth.csv sidecar. Otherwise it is per-frame agreement with the
+highest-quality setting in the sweep, counted only on frames with a hand.
+Models are built with the same light/full switching the live scripts use,
+unless --fixed-complexity is given.
+"""
+import argparse
+import itertools
+
+from bench import read_ground_truth, run_benchmark, truth_sidecar
+from config import PROFILE_PATH, hands_options, save_profile
+from pipeline import GesturePipeline, make_hands
+
+
+def parse_list(text, cast=float):
+    return [cast(item) for item in text.split(',') if item]
+
+
+def parse_resolution(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def evaluate(sources, settings, truths, limit, fps, dynamic=True):
+    """Replays every source with one setting; returns (fps, trigger F1 or None, per-frame gestures)."""
+    frames, seconds, hits, expected, fired = 0, 0.0, 0, 0, 0
+    gestures = []
+    for source in sources:
+        hands = make_hands(**hands_options(settings), dynamic=dynamic)
+        pipeline = GesturePipeline(hands)
+        truth = truths.get(source)
+        results = run_benchmark(source, pipeline, truth, fps=fps, limit=limit,
+                                size=(settings['width'], settings['height']), keep_gestures=True)
+        hands.close()
+
+        frames += results['frames']
+        if results['fps']:
+            seconds += results['frames'] / results['fps']
+        gestures.extend(results['gestures'])
+        if truth is not None:
+            hits += results['accuracy']['hits']
+            expected += results['accuracy']['labelled']
+            fired += len(results['triggers'])
+
+    speed = frames / seconds if seconds else 0.0
+    f1 = 2.0 * hits / (expected + fired) if len(truths) == len(sources) and expected + fired else None
+    return speed, f1, gestures
+
+
+def agreement(gestures, reference):
+    """(recall, precision) of per-frame gestures against the reference run.
+
+    Frames without a hand in either run don't count, so footage with no
+    hands scores 0 and a setting that detects nothing can't win.
+    """
+    pairs = list(zip(gestures, reference))
+    matched = sum(1 for a, b in pairs if b is not None and a == b)
+    seen = sum(1 for _, b in pairs if b is not None)
+    found = sum(1 for a, _ in pairs if a is not None)
+    return (matched / seen if seen else 0.0), (matched / found if found else 0.0)
+
+
+def f1_score(recall, precision):
+    return 2.0 * recall * precision / (recall + precision) if recall + precision else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the fastest gesture settings that stay accurate")
+    parser.add_argument('sources', nargs='+', help="recorded videos or image folders")
+    parser.add_argument('--resolutions', default='320x240,480x360,640x480')
+    parser.add_argument('--complexities', default='0,1')
+    parser.add_argument('--detection', default='0.5,0.75', help="min_detection_confidence values")
+    parser.add_argument('--tracking', default='0.5,0.75', help="min_tracking_confidence values")
+    parser.add_argument('--min-accuracy', type=float, default=0.9)
+    parser.add_argument('--limit', type=int, help="frames per source (keeps the sweep short)")
+    parser.add_argument('--fps', type=float, default=30.0, help="frame rate of image folders")
+    parser.add_argument('--fixed-complexity', action='store_true',
+                        help="tune for scripts run with --fixed-complexity (no light/full switching)")
+    parser.add_argument('--profile', default=PROFILE_PATH, help="where to write the result")
+    parser.add_argument('--dry-run', action='store_true', help="print the winner without saving it")
+    args = parser.parse_args()
+
+    truths = {}
+    for source in args.sources:
+        path = truth_sidecar(source)
+        if path:
+            truths[source] = read_ground_truth(path)
+    use_truth = len(truths) == len(args.sources)
+    if not use_truth:
+        print("No ground truth for every source: scoring against the highest-quality setting")
+
+    grid = [
+        {'width': w, 'height': h, 'model_complexity': c,
+         'min_detection_confidence': d, 'min_tracking_confidence': t}
+        for (w, h), c, d, t in itertools.product(
+            [parse_resolution(r) for r in args.resolutions.split(',')],
+            parse_list(args.complexities, int), parse_list(args.detection), parse_list(args.tracking))
+    ]
+    # Highest quality first so it can serve as the reference
+    grid.sort(key=lambda s: (-s['width'] * s['height'], -s['model_complexity'],
+                             s['min_detection_confidence'], s['min_tracking_confidence']))
+
+    reference = None
+    rows = []
+    for settings in grid:
+        speed, f1, gestures = evaluate(args.sources, settings, truths, args.limit, args.fps,
+                                       dynamic=not args.fixed_complexity)
+        detail = ''
+        if use_truth:
+            accuracy = f1 or 0.0
+        else:
+            if reference is None:
+                reference = gestures
+            recall, precision = agreement(gestures, reference)
+            accuracy = f1_score(recall, precision)
+            detail = f" (recall {recall:.3f}, precision {precision:.3f})"
+        rows.append((settings, speed, accuracy))
+        print(f"{settings['width']}x{settings['height']} complexity={settings['model_complexity']} "
+              f"det={settings['min_detection_confidence']} track={settings['min_tracking_confidence']}: "
+              f"{speed:.1f} FPS, accuracy {accuracy:.3f}{detail}")
+
+    passing = [row for row in rows if row[2] >= args.min_accuracy]
+    if passing:
+        best = max(passing, key=lambda row: row[1])
+    else:
+        best = max(rows, key=lambda row: (row[2], row[1]))
+        print(f"Warning: no setting reached accuracy {args.min_accuracy}; using the most accurate one")
+
+    settings, speed, accuracy = best
+    print(f"\nBest: {settings} at {speed:.1f} FPS, accuracy {accuracy:.3f}")
+    if not args.dry_run:
+        measured = {'fps': round(speed, 2), 'accuracy': round(accuracy, 4),
+                    'metric': 'trigger_f1' if use_truth else 'reference_agreement_f1',
+                    'dynamic': not args.fixed_complexity, 'dataset': args.sources}
+        path = save_profile(settings, args.profile, measured)
+        print(f"Profile written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""Batch analysis of recorded lectures: when were gestures made and slides changed.
+
+Runs over a folder of recordings (screen captures from record_screen,
+camera recordings from CameraRecorder) on a process pool, one video per
+worker. Only every `--stride`th frame is decoded; the others are just
+grabbed. Each video gets a timeline sidecar next to it:
+
+    lecture.mp4  ->  lecture.timeline.json
+
+A sidecar is written atomically once its video is done. On the next run,
+videos with an up-to-date sidecar are skipped, so an interrupted pass over
+a large archive resumes where it stopped.
+
+    python batch.py recordings/ --workers 4 --stride 3
+    python batch.py recordings/ --no-gestures          # screen recordings: slide changes only
+    python batch.py raw/ --raw-camera                  # straight from the camera, not mirrored yet
+
+CameraRecorder saves the mirrored frames the gesture loop works on, so by
+default videos are not flipped again before hand detection.
+"""
+import argparse
+import glob
+import json
+import multiprocessing as mp
+import os
+import time
+
+import cv2
+import numpy as np
+
+VIDEO_EXTENSIONS = ('.avi', '.mp4', '.mkv', '.mov')
+TIMELINE_VERSION = 2  # 2: camera recordings are no longer flipped twice
+
+
+class SlideChangeDetector:
+    """Flags the moments a slide is replaced by a different one.
+
+    Every sample is shrunk to a blurred grayscale thumbnail and compared
+    with the last settled slide. When the change is big enough and the
+    next sample looks the same as this one, the slide has changed; slide
+    transitions, builds in progress and a presenter walking past do not
+    settle and are ignored.
+    """
+
+    def __init__(self, threshold=12.0, settle=4.0, size=(96, 54)):
+        self.threshold = threshold  # mean grey-level difference to the settled slide
+        self.settle = settle        # max difference between two samples of a settled slide
+        self.size = size
+        self.slide = None
+        self.previous = None
+        self.candidate = None       # (time, difference) of a change waiting to settle
+
+    def thumbnail(self, frame):
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(small, (3, 3), 0).astype(np.float32)
+
+    def update(self, frame, timestamp):
+        """Returns (time, difference) when a new slide has settled, else None."""
+        thumb = self.thumbnail(frame)
+        previous, self.previous = self.previous, thumb
+        if self.slide is None:
+            self.slide = thumb
+            return None
+        if previous is not None and float(np.mean(np.abs(thumb - previous))) > self.settle:
+            return None  # Still moving
+
+        difference = float(np.mean(np.abs(thumb - self.slide)))
+        if difference < self.threshold:
+            self.candidate = None
+            return None
+        if self.candidate is None:
+            self.candidate = (timestamp, difference)
+            return None
+        change, self.candidate = self.candidate, None
+        self.slide = thumb
+        return change
+
+
+def sidecar_path(video):
+    return os.path.splitext(video)[0] + '.timeline.json'
+
+
+def is_done(video):
+    """True if the sidecar is complete and was made from this very file."""
+    path = sidecar_path(video)
+    if not os.path.exists(path):
+        return False
+    try:
+        with open(path) as f:
+            timeline = json.load(f)
+    except (OSError, ValueError):
+        return False
+    stat = os.stat(video)
+    return (timeline.get('version') == TIMELINE_VERSION and timeline.get('source_size') == stat.st_size
+            and timeline.get('source_mtime') == int(stat.st_mtime))
+
+
+def write_timeline(video, timeline):
+    path = sidecar_path(video)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(timeline, f, indent=1)
+    os.replace(tmp, path)  # Never leave a half-written sidecar that would count as done
+    return path
+
+
+# Per-worker state, built once by init_worker
+worker = {}
+
+
+def init_worker(options):
+    cv2.setNumThreads(1)  # One video per core; OpenCV's own threads would only compete
+    worker['options'] = options
+    worker['hands'] = None
+    if options['gestures']:
+        from pipeline import make_hands
+
+        worker['hands'] = make_hands(model_complexity=options['complexity'])
+    worker['calibration'] = None
+    if options['calibration']:
+        from calibration import load_calibration
+
+        worker['calibration'] = load_calibration(options['calibration'])
+
+
+def analyze_video(video):
+    """Runs the detectors over one video and writes its sidecar. Returns (video, summary)."""
+    from bench import COOLDOWNS
+    from pipeline import GesturePipeline
+
+    options = worker['options']
+    stride = options['stride']
+    started = time.perf_counter()
+    cap = cv2.VideoCapture(video)
+    if not cap.isOpened():
+        return video, "cannot open"
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    pipeline = None
+    if worker['hands'] is not None:
+        pipeline = GesturePipeline(worker['hands'], calibration=worker['calibration'],
+                                   flip=not options['mirrored'])
+    slides = SlideChangeDetector() if options['slides'] else None
+    calibration = None
+    gestures, triggers, changes = [], [], []
+    last_fired = {}
+    last_gesture = None
+    index = 0
+    analyzed = 0
+    try:
+        while True:
+            if index % stride:
+                if not cap.grab():  # Skipped frames are demuxed but never converted
+                    break
+                index += 1
+                continue
+            success, frame = cap.read()
+            if not success:
+                break
+            timestamp = index / fps
+            index += 1
+            analyzed += 1
+
+            if pipeline is not None:
+                out = pipeline.process(frame, timestamp)
+                if out.gesture != last_gesture:  # Only record when the gesture changes
+                    last_gesture = out.gesture
+                    gestures.append({'time': round(timestamp, 3), 'gesture': out.gesture})
+                if out.action is not None:
+                    group, cooldown = COOLDOWNS[out.action]
+                    if timestamp - last_fired.get(group, float('-inf')) >= cooldown:
+                        last_fired[group] = timestamp
+                        triggers.append({'time': round(timestamp, 3), 'action': out.action})
+            if slides is not None:
+                if worker['calibration'] is not None:
+                    if calibration is None:
+                        calibration = worker['calibration'].for_frame(frame.shape[1], frame.shape[0],
+                                                                      mirror=options['mirrored'])
+                    frame = calibration.rectify(frame, slides.size)  # Only the screen, already thumbnail-sized
+                change = slides.update(frame, timestamp)
+                if change is not None:
+                    changes.append({'time': round(change[0], 3), 'difference': round(change[1], 1)})
+    finally:
+        cap.release()
+
+    stat = os.stat(video)
+    elapsed = time.perf_counter() - started
+    timeline = {
+        'version': TIMELINE_VERSION,
+        'video': os.path.basename(video),
+        'source_size': stat.st_size,
+        'source_mtime': int(stat.st_mtime),
+        'fps': fps,
+        'frames': index,
+        'duration': round(index / fps, 3),
+        'stride': stride,
+        'mirrored': options['mirrored'],
+        'analyzed_frames': analyzed,
+        'analysis_seconds': round(elapsed, 2),
+        'gestures': gestures,
+        'triggers': triggers,
+        'slide_changes': changes,
+    }
+    write_timeline(video, timeline)
+    return video, (f"{index} frames ({index / elapsed:.0f}/s), {len(triggers)} trigger(s), "
+                   f"{len(changes)} slide change(s)")
+
+
+def safe_analyze(video):
+    """analyze_video that reports a broken file instead of stopping the whole pool."""
+    try:
+        return analyze_video(video)
+    except Exception as e:
+        return video, f"failed: {e}"
+
+
+def find_videos(paths):
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            videos.extend(p for p in glob.glob(os.path.join(path, '**', '*'), recursive=True)
+                          if p.lower().endswith(VIDEO_EXTENSIONS))
+        else:
+            videos.append(path)
+    return sorted(videos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write gesture and slide-change timelines for recorded videos")
+    parser.add_argument('paths', nargs='+', help="videos or folders (searched recursively)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="processes, one video each")
+    parser.add_argument('--stride', type=int, default=3, help="analyze every Nth frame")
+    parser.add_argument('--complexity', type=int, default=0, choices=(0, 1))
+    parser.add_argument('--no-gestures', action='store_true', help="skip hand detection (screen recordings)")
+    parser.add_argument('--no-slides', action='store_true', help="skip slide-change detection")
+    parser.add_argument('--raw-camera', action='store_true',
+                        help="videos straight from the camera, not mirrored like CameraRecorder output")
+    parser.add_argument('--calibration', help="look for slide changes only on the calibrated screen area")
+    parser.add_argument('--force', action='store_true', help="redo videos that already have a timeline")
+    args = parser.parse_args()
+
+    videos = find_videos(args.paths)
+    todo = [v for v in videos if args.force or not is_done(v)]
+    print(f"{len(videos)} video(s), {len(videos) - len(todo)} already done, {len(todo)} to analyze")
+    if not todo:
+        return
+
+    options = {
+        'stride': max(1, args.stride),
+        'complexity': args.complexity,
+        'gestures': not args.no_gestures,
+        'slides': not args.no_slides,
+        'calibration': args.calibration,
+        'mirrored': not args.raw_camera,
+    }
+    started = time.perf_counter()
+    done = 0
+    # Each worker loads the hand model once and keeps it for all its videos
+    with mp.Pool(max(1, min(args.workers, len(todo))), initializer=init_worker, initargs=(options,)) as pool:
+        for video, summary in pool.imap_unordered(safe_analyze, todo):
+            done += 1
+            print(f"[{done}/{len(todo)}] {video}: {summary}")
+    print(f"Analyzed {len(todo)} video(s) in {time.perf_counter() - started:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""Offline replay benchmark for the gesture pipeline.
+
+Feeds recorded videos or image folders through GesturePipeline with no
+camera and no window, and reports throughput, per-stage latency percentiles
+and, if a ground-truth file is given, when gestures fired compared to when
+they should have.
+
+    python bench.py lecture1.mp4 frames_dir/ --json bench.json
+    python bench.py lecture1.mp4 --truth lecture1.truth.csv --baseline bench.json
+    python bench.py lecture1.mp4 --realtime && python bench.py lecture1.mp4 --backend live
+
+Ground truth is a CSV with a header line "time,action" (seconds from the start
+of the recording, action is left/right/record). A file named
+<video>.truth.csv next to a video is picked up automatically.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from motion import MotionGate
+from pipeline import GesturePipeline, make_hands
+from scheduler import AdaptiveScheduler
+from sources import open_source
+
+STAGES = ('capture', 'flip', 'motion', 'convert', 'inference', 'decision', 'total')
+# Same cooldowns as the live dispatcher in detect/testcampi.py: (group, seconds)
+COOLDOWNS = {'left': ('slide', 1.1), 'right': ('slide', 1.1), 'record': ('record', 1.0)}
+
+
+def iter_frames(source, fps=30.0, realtime=False):
+    """Yields (timestamp, frame, decode seconds) from any source, as fast as it decodes or paced like a camera."""
+    cap = open_source(source, fps=fps, realtime=realtime)
+    if not cap.isOpened():
+        print(f"Error: cannot open {source}")
+        return
+    try:
+        while True:
+            success, frame = cap.read()
+            if not success:
+                break
+            yield cap.timestamp, frame, cap.last_decode
+    finally:
+        cap.release()
+
+
+def read_ground_truth(path):
+    with open(path, newline='') as f:
+        return sorted((float(row['time']), row['action'].strip()) for row in csv.DictReader(f))
+
+
+def truth_sidecar(source):
+    path = os.path.splitext(source.rstrip('/\\'))[0] + '.truth.csv'
+    return path if os.path.exists(path) else None
+
+
+def percentiles(samples):
+    if not samples:
+        return {'p50': None, 'p95': None, 'p99': None}
+    p50, p95, p99 = np.percentile(np.asarray(samples) * 1000, [50, 95, 99])
+    return {'p50': round(float(p50), 3), 'p95': round(float(p95), 3), 'p99': round(float(p99), 3)}
+
+
+def match_triggers(triggers, truth, early=0.2, late=1.5):
+    """Pairs each labelled gesture with the first matching trigger inside [t - early, t + late]."""
+    used = set()
+    latencies = []
+    missed = 0
+    for t_truth, action in truth:
+        for i, (t_fired, fired) in enumerate(triggers):
+            if i not in used and fired == action and t_truth - early <= t_fired <= t_truth + late:
+                used.add(i)
+                latencies.append(t_fired - t_truth)
+                break
+        else:
+            missed += 1
+    return {
+        'labelled': len(truth),
+        'hits': len(latencies),
+        'missed': missed,
+        'false_triggers': len(triggers) - len(used),
+        'latency_ms': percentiles(latencies),
+    }
+
+
+def run_benchmark(source, pipeline, truth=None, fps=30.0, limit=None, size=None, keep_gestures=False,
+                  realtime=False):
+    """Replays one source. size=(w, h) resizes frames first to mimic another camera resolution."""
+    samples = {stage: [] for stage in STAGES}
+    last_fired = {}
+    triggers = []
+    gestures = []
+    frames = 0
+    wall_start = time.perf_counter()
+
+    for timestamp, frame, decode_time in iter_frames(source, fps, realtime):
+        if limit is not None and frames >= limit:
+            break
+        frames += 1
+        if size is not None and (frame.shape[1], frame.shape[0]) != tuple(size):
+            start = time.perf_counter()
+            frame = cv2.resize(frame, tuple(size), interpolation=cv2.INTER_AREA)
+            decode_time += time.perf_counter() - start
+        samples['capture'].append(decode_time)
+        if not pipeline.should_process():
+            if keep_gestures:
+                gestures.append(None)
+            continue
+
+        out = pipeline.process(frame, timestamp)
+        if keep_gestures:
+            gestures.append(out.gesture)
+        for stage, elapsed in pipeline.timings.items():
+            samples[stage].append(elapsed)
+        samples['total'].append(sum(pipeline.timings.values()) + decode_time)
+
+        if out.action is not None:
+            group, cooldown = COOLDOWNS[out.action]
+            if timestamp - last_fired.get(group, float('-inf')) >= cooldown:
+                last_fired[group] = timestamp
+                triggers.append((timestamp, out.action))
+
+    wall = time.perf_counter() - wall_start
+    results = {
+        'source': source,
+        'frames': frames,
+        'processed': len(samples['total']),
+        'fps': round(frames / wall, 2) if wall > 0 else None,
+        'stages_ms': {stage: percentiles(values) for stage, values in samples.items()},
+        'triggers': [{'time': round(t, 3), 'action': a} for t, a in triggers],
+    }
+    if truth is not None:
+        results['accuracy'] = match_triggers(triggers, truth)
+    if keep_gestures:
+        results['gestures'] = gestures
+    gate = pipeline.motion_gate
+    if gate is not None:
+        results['inferences_saved'] = gate.skipped
+    hands = pipeline.tracker.hands
+    if getattr(hands, 'live', False):
+        results['live'] = hands.stats()
+    if hasattr(hands, 'light_runs'):
+        results['model_runs'] = {'light': hands.light_runs, 'full': hands.full_runs,
+                                 'escalations': hands.escalations}
+    return results
+
+
+def print_results(results):
+    print(f"\n{results['source']}: {results['frames']} frames "
+          f"({results['processed']} processed) at {results['fps']} FPS")
+    print(f"  {'stage':<10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for stage, p in results['stages_ms'].items():
+        if p['p50'] is not None:
+            print(f"  {stage:<10} {p['p50']:>8.2f} {p['p95']:>8.2f} {p['p99']:>8.2f}")
+    accuracy = results.get('accuracy')
+    if accuracy:
+        latency = accuracy['latency_ms']
+        print(f"  gestures: {accuracy['hits']}/{accuracy['labelled']} hit, {accuracy['missed']} missed, "
+              f"{accuracy['false_triggers']} false; trigger latency p50 {latency['p50']} ms, p95 {latency['p95']} ms")
+    else:
+        print(f"  {len(results['triggers'])} trigger(s), no ground truth")
+    if 'inferences_saved' in results:
+        print(f"  motion gate saved {results['inferences_saved']}/{results['processed']} inferences")
+    runs = results.get('model_runs')
+    if runs:
+        print(f"  model: {runs['light']} light / {runs['full']} full runs, {runs['escalations']} escalation(s)")
+    live = results.get('live')
+    if live:
+        latency = live.get('result_latency_ms', {})
+        print(f"  live stream: {live['completed']}/{live['submitted']} frames inferred, "
+              f"{live['dropped']} dropped while busy; result latency p50 {latency.get('p50')} ms, "
+              f"p95 {latency.get('p95')} ms")
+
+
+def check_regression(results, baseline, tolerance):
+    """Returns a list of human-readable regressions against a previous --json run."""
+    previous = {(r['source'], r.get('backend', 'legacy')): r for r in baseline}
+    problems = []
+    for r in results:
+        old = previous.get((r['source'], r.get('backend', 'legacy')))
+        if old is None:
+            continue
+        if old['fps'] and r['fps'] < old['fps'] * (1 - tolerance):
+            problems.append(f"{r['source']}: FPS {r['fps']} < baseline {old['fps']}")
+        old_p95 = old['stages_ms']['total']['p95']
+        new_p95 = r['stages_ms']['total']['p95']
+        if old_p95 and new_p95 and new_p95 > old_p95 * (1 + tolerance):
+            problems.append(f"{r['source']}: p95 frame time {new_p95} ms > baseline {old_p95} ms")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recordings through the gesture pipeline")
+    parser.add_argument('sources', nargs='+', help="video files, folders of images or synthetic[:WxH]")
+    parser.add_argument('--truth', help="ground-truth CSV (only with a single source)")
+    parser.add_argument('--fps', type=float, default=30.0, help="frame rate of image folders")
+    parser.add_argument('--limit', type=int, help="stop after this many frames per source")
+    parser.add_argument('--complexity', type=int, default=1, choices=(0, 1))
+    parser.add_argument('--backend', default='legacy', choices=('legacy', 'live'),
+                        help="blocking Hands.process() or the asynchronous Tasks HandLandmarker")
+    parser.add_argument('--dynamic', action='store_true',
+                        help="track with the light model and re-acquire with the full one (--complexity 1)")
+    parser.add_argument('--hand-model', help="hand_landmarker.task for --backend live")
+    parser.add_argument('--realtime', action='store_true',
+                        help="feed frames at the source frame rate like a camera (always on for --backend live)")
+    parser.add_argument('--no-roi', action='store_true', help="always run on the full frame")
+    parser.add_argument('--adaptive', action='store_true', help="use the adaptive scheduler like the live loop")
+    parser.add_argument('--motion-gate', action='store_true', help="skip inference on static frames like the live loop")
+    parser.add_argument('--json', help="write the results to this file")
+    parser.add_argument('--baseline', help="results of a previous --json run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.1, help="allowed slowdown vs baseline (0.1 = 10%%)")
+    args = parser.parse_args()
+
+    if args.truth and len(args.sources) > 1:
+        parser.error("--truth needs exactly one source; use <video>.truth.csv sidecars instead")
+    if args.limit is None and any(s.startswith('synthetic') for s in args.sources):
+        parser.error("synthetic sources never end; give --limit")
+
+    all_results = []
+    for source in args.sources:
+        truth_path = args.truth or truth_sidecar(source)
+        truth = read_ground_truth(truth_path) if truth_path else None
+        hands = make_hands(model_complexity=args.complexity, backend=args.backend, model_path=args.hand_model,
+                           dynamic=args.dynamic)
+        pipeline = GesturePipeline(hands, scheduler=AdaptiveScheduler() if args.adaptive else None,
+                                   roi_tracking=not args.no_roi,
+                                   motion_gate=MotionGate() if args.motion_gate else None)
+        # Fed faster than real time, the live runtime would drop almost every frame
+        results = run_benchmark(source, pipeline, truth, fps=args.fps, limit=args.limit,
+                                realtime=args.realtime or args.backend == 'live')
+        results['backend'] = args.backend
+        hands.close()
+        print_results(results)
+        all_results.append(results)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(all_results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = check_regression(all_results, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION: {problem}")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import json
+import os
+
+import cv2
+import numpy as np
+
+# Written by detect/videos/tesstcam.py, loaded by the gesture entry points at startup
+CALIBRATION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'calibration.json')
+
+
+def order_corners(points):
+    """Sorts four points into top-left, top-right, bottom-right, bottom-left."""
+    pts = np.asarray(points, dtype=np.float32).reshape(4, 2)
+    s = pts.sum(axis=1)
+    d = pts[:, 0] - pts[:, 1]
+    return np.array([pts[np.argmin(s)], pts[np.argmax(d)], pts[np.argmax(s)], pts[np.argmin(d)]],
+                    dtype=np.float32)
+
+
+class Calibration:
+    """Maps camera pixels onto the projected screen.
+
+    `corners` are the four screen corners as seen by the camera, in pixels
+    of a `frame_size` (w, h) image; `screen_size` is the slide resolution
+    they map to. The homography is computed once, and the remap tables for
+    warping whole frames are built on first use and cached.
+    """
+
+    def __init__(self, corners, frame_size, screen_size=(1920, 1080), ordered=False):
+        self.corners = np.asarray(corners, dtype=np.float32) if ordered else order_corners(corners)
+        self.frame_size = tuple(int(v) for v in frame_size)
+        self.screen_size = tuple(int(v) for v in screen_size)
+        sw, sh = self.screen_size
+        target = np.array([[0, 0], [sw - 1, 0], [sw - 1, sh - 1], [0, sh - 1]], dtype=np.float32)
+        self.homography = cv2.getPerspectiveTransform(self.corners, target)
+        self.maps = {}  # output size -> (map1, map2) for cv2.remap
+        self.path = None  # File it was loaded from or last saved to
+
+    def for_frame(self, width, height, mirror=False):
+        """The same calibration for frames of another size, optionally mirrored like the pipeline's."""
+        corners = self.corners * (width / self.frame_size[0], height / self.frame_size[1])
+        if mirror:
+            # Keep the labels: the screen's top-left corner is still (0, 0) on the slide
+            corners[:, 0] = width - 1 - corners[:, 0]
+        return Calibration(corners, (width, height), self.screen_size, ordered=True)
+
+    def to_screen(self, points):
+        """Camera (x, y) pixels -> screen pixels; accepts one point or an (N, 2) array."""
+        pts = np.asarray(points, dtype=np.float32)
+        mapped = cv2.perspectiveTransform(pts.reshape(-1, 1, 2), self.homography)
+        return mapped.reshape(pts.shape)
+
+    def contains(self, point):
+        return cv2.pointPolygonTest(self.corners.reshape(-1, 1, 2), tuple(map(float, point)), False) >= 0
+
+    def bbox(self, margin=0.1):
+        """Normalized (x0, y0, x1, y1) around the screen quad, grown by `margin` of its size on each side."""
+        w, h = self.frame_size
+        x0, y0 = self.corners.min(axis=0)
+        x1, y1 = self.corners.max(axis=0)
+        mx, my = (x1 - x0) * margin, (y1 - y0) * margin
+        return (max(0.0, float(x0 - mx) / w), max(0.0, float(y0 - my) / h),
+                min(1.0, float(x1 + mx) / w), min(1.0, float(y1 + my) / h))
+
+    def remap_tables(self, out_size=None):
+        """Fixed-point cv2.remap tables that warp a camera frame onto the screen rectangle."""
+        out_size = tuple(out_size or self.screen_size)
+        if out_size not in self.maps:
+            ow, oh = out_size
+            sw, sh = self.screen_size
+            scale = np.diag([sw / float(ow), sh / float(oh), 1.0])
+            inverse = np.linalg.inv(self.homography) @ scale  # output pixel -> camera pixel
+            xs, ys = np.meshgrid(np.arange(ow, dtype=np.float32), np.arange(oh, dtype=np.float32))
+            grid = np.stack([xs, ys, np.ones_like(xs)], axis=-1) @ inverse.T.astype(np.float32)
+            map_x = grid[..., 0] / grid[..., 2]
+            map_y = grid[..., 1] / grid[..., 2]
+            self.maps[out_size] = cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+        return self.maps[out_size]
+
+    def rectify(self, frame, out_size=None, dst=None):
+        """The screen area of a camera frame, warped to a flat rectangle."""
+        map1, map2 = self.remap_tables(out_size)
+        return cv2.remap(frame, map1, map2, cv2.INTER_LINEAR, dst=dst)
+
+    def to_dict(self):
+        return {
+            'corners': self.corners.round(2).tolist(),
+            'frame_size': list(self.frame_size),
+            'screen_size': list(self.screen_size),
+            'homography': self.homography.tolist(),
+        }
+
+
+def save_calibration(calibration, path=None):
+    path = path or CALIBRATION_PATH
+    with open(path, 'w') as f:
+        json.dump(calibration.to_dict(), f, indent=2)
+    calibration.path = path
+    return path
+
+
+def load_calibration(path=None):
+    """The saved calibration, or None if there is none (callers then use the whole frame)."""
+    path = path or CALIBRATION_PATH
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        calibration = Calibration(data['corners'], data['frame_size'], data.get('screen_size', (1920, 1080)))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error reading calibration {path}: {e}")
+        return None
+    calibration.path = path
+    print(f"Loaded calibration from {path}: screen {calibration.screen_size[0]}x{calibration.screen_size[1]}")
+    return calibration
@@ -0,0 +1,105 @@
+import threading
+import time
+
+
+class FrameGrabber:
+    """Reads camera frames on its own thread and keeps only the newest one.
+
+    The consumer always gets the freshest frame; frames that were overwritten
+    before anybody read them are counted as dropped. With a FramePool the
+    camera decodes into recycled buffers, and every frame returned by read()
+    belongs to the caller, who must pool.release() it.
+    """
+
+    def __init__(self, cap, metrics=None, pool=None):
+        self.cap = cap
+        self.metrics = metrics  # Optional StageMetrics; gets the 'capture' stage
+        self.pool = pool
+        self.shape = None       # Frame shape, known after the first read
+        self.new_frame = threading.Condition()
+        self.frame = None
+        self.frame_time = 0       # time.monotonic() when the frame in the slot was captured
+        self.read_time = 0        # capture time of the frame last returned by read()
+        self.frame_id = 0      # id of the frame currently in the slot
+        self.read_id = 0       # id of the last frame handed to the consumer
+        self.captured = 0
+        self.dropped = 0
+        self.failed = False
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.update)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def update(self):
+        """Thread function: pull frames from the camera as fast as it delivers them."""
+        while self.running:
+            buf = self.pool.acquire(self.shape) if self.pool is not None and self.shape else None
+            start = time.perf_counter()
+            success, frame = self.cap.read(buf)
+            if self.metrics is not None:
+                self.metrics.observe('capture', time.perf_counter() - start)
+            if self.pool is not None and frame is not buf:
+                # First frame, or the camera changed resolution: take over OpenCV's array
+                if buf is not None:
+                    self.pool.release(buf)
+                if success:
+                    frame = self.pool.adopt(frame)
+                    self.shape = frame.shape
+            if not success:
+                print("Error: Failed to capture frame.")
+                with self.new_frame:
+                    self.failed = True
+                    self.new_frame.notify_all()
+                break
+
+            with self.new_frame:
+                if self.frame_id > self.read_id:  # Previous frame was never consumed
+                    self.dropped += 1
+                    if self.pool is not None:
+                        self.pool.release(self.frame)
+                self.frame = frame
+                self.frame_time = time.monotonic()
+                self.frame_id += 1
+                self.captured += 1
+                self.new_frame.notify_all()
+
+    def read(self, timeout=1.0):
+        """Waits for a frame newer than the last one returned, like cap.read()."""
+        with self.new_frame:
+            self.new_frame.wait_for(
+                lambda: self.frame_id > self.read_id or self.failed or not self.running,
+                timeout
+            )
+            if self.frame_id == self.read_id:
+                return False, None
+            self.read_id = self.frame_id
+            self.read_time = self.frame_time
+            return True, self.frame
+
+    def ready(self):
+        """True if a frame newer than the last one returned is waiting."""
+        with self.new_frame:
+            return self.frame_id > self.read_id
+
+    def report(self):
+        with self.new_frame:
+            captured, dropped = self.captured, self.dropped
+        percent = 100.0 * dropped / captured if captured else 0.0
+        return f"Capture: {captured} frames, {dropped} dropped ({percent:.1f}%)"
+
+    def stop(self):
+        self.running = False
+        with self.new_frame:
+            self.new_frame.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=1)
+            self.thread = None
+        with self.new_frame:
+            if self.pool is not None and self.frame_id > self.read_id:
+                self.pool.release(self.frame)
+                self.read_id = self.frame_id
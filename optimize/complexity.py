@@ -0,0 +1,59 @@
+class ComplexitySwitcher:
+    """Runs the light hand model while tracking is steady and the full one otherwise.
+
+    Wraps two legacy Hands graphs (model_complexity 0 and 1) behind the same
+    process() call. The full model finds the hand, and after `stable`
+    confident frames in a row the light model takes over the tracking. As
+    soon as the light model loses the hand or its handedness score drops
+    below `min_confidence`, the full model is back in charge, already for
+    HandRoiTracker's full-frame retry of the same frame.
+    """
+
+    def __init__(self, light, full, min_confidence=0.85, stable=10):
+        self.light = light
+        self.full = full
+        self.min_confidence = min_confidence
+        self.stable = stable        # confident frames before handing over to the light model
+        self.escalated = True       # Start searching with the full model
+        self.confident = 0
+        self.light_runs = 0
+        self.full_runs = 0
+        self.escalations = 0
+        self.handovers = 0
+
+    @property
+    def model_complexity(self):
+        return 1 if self.escalated else 0
+
+    def process(self, rgb):
+        model = self.full if self.escalated else self.light
+        result = model.process(rgb)
+        if self.escalated:
+            self.full_runs += 1
+        else:
+            self.light_runs += 1
+
+        confident = False
+        if result.multi_hand_landmarks:
+            confident = min(h.classification[0].score for h in result.multi_handedness) >= self.min_confidence
+        if not confident:
+            if not self.escalated:
+                self.escalated = True
+                self.escalations += 1
+            self.confident = 0
+        else:
+            self.confident += 1
+            if self.escalated and self.confident >= self.stable:
+                self.escalated = False
+                self.handovers += 1
+        return result
+
+    def report(self):
+        runs = self.light_runs + self.full_runs
+        share = 100.0 * self.light_runs / runs if runs else 0.0
+        return (f"Model: {self.light_runs} light / {self.full_runs} full runs ({share:.0f}% light), "
+                f"{self.escalations} escalation(s), {self.handovers} hand-over(s)")
+
+    def close(self):
+        self.light.close()
+        self.full.close()
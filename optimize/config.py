@@ -0,0 +1,43 @@
+import json
+import os
+
+# Written by autotune.py, read by every gesture entry point at startup
+PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gesture_profile.json')
+
+# Keys a profile may set; entry points pass their own defaults for anything missing
+SETTINGS = ('width', 'height', 'model_complexity', 'min_detection_confidence', 'min_tracking_confidence')
+
+
+def load_profile(path=None, defaults=None):
+    """Returns `defaults` overridden by the tuning profile, if one exists."""
+    settings = dict(defaults or {})
+    path = path or PROFILE_PATH
+    if not os.path.exists(path):
+        return settings
+    try:
+        with open(path) as f:
+            profile = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error reading tuning profile {path}: {e}")
+        return settings
+
+    settings.update({key: profile[key] for key in SETTINGS if key in profile})
+    print(f"Loaded tuning profile from {path}: "
+          + ", ".join(f"{key}={settings[key]}" for key in SETTINGS if key in settings))
+    return settings
+
+
+def save_profile(settings, path=None, measured=None):
+    profile = {key: settings[key] for key in SETTINGS if key in settings}
+    if measured:
+        profile['measured'] = measured
+    path = path or PROFILE_PATH
+    with open(path, 'w') as f:
+        json.dump(profile, f, indent=2)
+    return path
+
+
+def hands_options(settings):
+    """The subset of settings that make_hands() understands."""
+    return {key: settings[key] for key in
+            ('model_complexity', 'min_detection_confidence', 'min_tracking_confidence') if key in settings}
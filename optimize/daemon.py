@@ -0,0 +1,342 @@
+"""Long-running gesture daemon with a local control socket.
+
+Everything slow happens once at startup: importing mediapipe and OpenCV,
+building the Hands graph and warming it on a blank frame, opening the camera
+and starting the KeyboardServer (sockets + Zeroconf). Detection is then
+started, paused and reconfigured over a Unix socket, so beginning the next
+presentation takes milliseconds.
+
+    python daemon.py &                       # initialise once, starts paused
+    python daemon.py --send start
+    python daemon.py --send pause
+    python daemon.py --send "set left_zone=0.35 model_complexity=0"
+    python daemon.py --send status
+    python daemon.py --send "profile start"  # sample stacks until "profile stop"
+
+Every command gets one JSON line back.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+
+from calibration import load_calibration
+from capture import FrameGrabber
+from config import hands_options, load_profile
+from metrics import StageMetrics
+from motion import MotionGate
+from pipeline import GesturePipeline, make_hands
+from sampler import StackSampler
+from scheduler import AdaptiveScheduler
+from sources import open_source
+
+SOCKET_PATH = '/tmp/gesture-daemon.sock'
+# Settings that need a new Hands graph when changed
+MODEL_SETTINGS = ('model_complexity', 'min_detection_confidence', 'min_tracking_confidence')
+
+
+def parse_value(text):
+    lowered = text.lower()
+    if lowered in ('on', 'true', 'yes'):
+        return True
+    if lowered in ('off', 'false', 'no'):
+        return False
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def warm_up(hands, width, height):
+    """Runs the graph once so the first real frame does not pay for lazy initialisation."""
+    start = time.perf_counter()
+    blank = np.zeros((height, width, 3), dtype=np.uint8)
+    for graph in (hands.light, hands.full) if hasattr(hands, 'light') else (hands,):
+        graph.process(blank)
+    return time.perf_counter() - start
+
+
+class GestureDaemon:
+    """Owns the model, camera and keyboard server for the whole session."""
+
+    def __init__(self, settings, source=0, socket_path=SOCKET_PATH, metrics_port=9108, sample_dir='.',
+                 record_screen=False, metrics_host='127.0.0.1'):
+        self.settings = dict(settings)
+        self.sampler = StackSampler(sample_dir)
+        self.socket_path = socket_path
+        self.lock = threading.Lock()         # Held while a frame is processed or settings change
+        self.detecting = threading.Event()  # Cleared while paused
+        self.running = True
+        self.control_socket = None
+
+        started = time.perf_counter()
+        self.hands = make_hands(**hands_options(self.settings), dynamic=True)
+        warm = warm_up(self.hands, self.settings['width'], self.settings['height'])
+        print(f"Hands model ready (warm-up {warm * 1000:.0f} ms)")
+
+        self.cap = open_source(source, self.settings['width'], self.settings['height'])
+        if not self.cap.isOpened():
+            raise RuntimeError("Camera not initialized. Check connection or permissions.")
+
+        self.metrics = StageMetrics()
+        self.grabber = FrameGrabber(self.cap, self.metrics).start()
+        self.pipeline = GesturePipeline(self.hands, scheduler=AdaptiveScheduler(target_latency=0.15),
+                                        left_zone=self.settings.get('left_zone', 0.3),
+                                        right_zone=self.settings.get('right_zone', 0.7),
+                                        motion_gate=MotionGate(), calibration=load_calibration())
+
+        from keyboard_server import GestureServer
+        from screenrec import BackgroundRecording
+
+        self.actions = GestureServer(BackgroundRecording() if record_screen else None)
+        self.server = self.actions.server
+
+        if metrics_port:
+            self.metrics.serve(metrics_port, metrics_host)
+        self.metrics.add_gauge('gesture_detecting', "1 while detection is running",
+                               lambda: self.detecting.is_set())
+        print(f"Daemon initialised in {time.perf_counter() - started:.1f} s")
+
+    ##################### Control socket #####################
+
+    def serve_control(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # Left over from a daemon that crashed
+        self.control_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.control_socket.bind(self.socket_path)
+        self.control_socket.listen(4)
+        thread = threading.Thread(target=self.accept_control)
+        thread.daemon = True
+        thread.start()
+        print(f"Control socket listening on {self.socket_path}")
+
+    def accept_control(self):
+        while self.running:
+            try:
+                conn, _ = self.control_socket.accept()
+            except OSError:
+                break
+            try:
+                with conn, conn.makefile('rw') as stream:
+                    for line in stream:
+                        reply = self.handle(line.strip())
+                        stream.write(json.dumps(reply) + '\n')
+                        stream.flush()
+            except OSError as e:
+                print(f"Control client disconnected: {e}")
+
+    def handle(self, line):
+        """Executes one control command and returns the reply."""
+        command, _, rest = line.partition(' ')
+        command = command.lower()
+        try:
+            if command in ('start', 'resume'):
+                if not self.detecting.is_set():
+                    with self.lock:
+                        self.pipeline.recognizer.reset()  # Don't finish a swipe begun before the pause
+                    self.detecting.set()
+                    print("Detection started")
+                return {'ok': True, 'state': 'running'}
+            if command == 'pause':
+                self.detecting.clear()
+                print("Detection paused")
+                return {'ok': True, 'state': 'paused'}
+            if command == 'set':
+                return {'ok': True, 'settings': self.apply(rest.split())}
+            if command == 'status':
+                return self.status()
+            if command == 'profile':
+                return self.profile(rest.split())
+            if command == 'quit':
+                self.running = False
+                self.detecting.set()  # Wake the main loop so it can exit
+                return {'ok': True, 'state': 'stopping'}
+        except (ValueError, KeyError) as e:
+            return {'ok': False, 'error': str(e)}
+        return {'ok': False, 'error': f"unknown command {command!r} (start, pause, resume, set, status, profile, quit)"}
+
+    def apply(self, assignments):
+        """Applies key=value pairs; model settings rebuild and re-warm the Hands graph."""
+        changes = {}
+        for assignment in assignments:
+            key, sep, value = assignment.partition('=')
+            if not sep:
+                raise ValueError(f"expected key=value, got {assignment!r}")
+            changes[key] = parse_value(value)
+
+        unknown = set(changes) - set(MODEL_SETTINGS) - {'left_zone', 'right_zone', 'target_latency',
+                                                       'motion_gate', 'roi'}
+        if unknown:
+            raise KeyError(f"unknown setting(s): {', '.join(sorted(unknown))}")
+
+        hands = None
+        if any(key in MODEL_SETTINGS and changes[key] != self.settings.get(key) for key in changes):
+            # Build the new graph while the old one keeps serving frames
+            options = hands_options(dict(self.settings, **changes))
+            hands = make_hands(**options, dynamic=True)
+            warm_up(hands, self.settings['width'], self.settings['height'])
+
+        with self.lock:
+            pipeline = self.pipeline
+            if hands is not None:
+                old, self.hands = self.hands, hands
+                pipeline.tracker.hands = hands
+                pipeline.tracker.roi = None
+                old.close()
+            if 'left_zone' in changes:
+                pipeline.left_zone = float(changes['left_zone'])
+            if 'right_zone' in changes:
+                pipeline.right_zone = float(changes['right_zone'])
+            if 'target_latency' in changes:
+                pipeline.scheduler.target_latency = float(changes['target_latency'])
+            if 'motion_gate' in changes:
+                pipeline.motion_gate = MotionGate() if changes['motion_gate'] else None
+            if 'roi' in changes:
+                pipeline.tracker.enabled = bool(changes['roi'])
+                pipeline.tracker.roi = None
+            self.settings.update(changes)
+        print(f"Settings changed: {changes}")
+        return self.settings
+
+    def profile(self, words):
+        """profile start [hz] | profile stop: samples every thread, then writes a collapsed-stack file."""
+        action = words[0].lower() if words else 'status'
+        if action == 'start':
+            hz = float(words[1]) if len(words) > 1 else None
+            if not self.sampler.start(hz):
+                raise ValueError("the profiler is already running")
+            return {'ok': True, 'profiling': True, 'hz': self.sampler.hz}
+        if action == 'stop':
+            path = self.sampler.stop()
+            if path is None:
+                raise ValueError("the profiler is not running")
+            return {'ok': True, 'profiling': False, 'path': os.path.abspath(path),
+                    'samples': self.sampler.samples, 'overhead': round(self.sampler.overhead(), 4)}
+        raise ValueError("expected 'profile start [hz]' or 'profile stop'")
+
+    def status(self):
+        with self.server.clients_lock:
+            clients = len(self.server.clients)
+        return {
+            'ok': True,
+            'state': 'running' if self.detecting.is_set() else 'paused',
+            'fps': round(self.metrics.fps(), 1),
+            'recording': self.actions.is_recording(),
+            'clients': clients,
+            'profiling': self.sampler.running,
+            'settings': self.settings,
+        }
+
+    ##################### Detection loop #####################
+
+    def run(self):
+        try:
+            while self.running:
+                if not self.detecting.wait(timeout=0.5):
+                    continue  # Paused: the grabber keeps the newest frame ready for resume
+                success, frame = self.grabber.read()
+                if not success:
+                    if self.grabber.failed:
+                        break
+                    continue
+
+                with self.lock:
+                    if not self.detecting.is_set() or not self.pipeline.should_process():
+                        continue
+                    out = self.pipeline.process(frame)
+                    timings = self.pipeline.timings
+                self.metrics.observe_all(timings)
+                self.metrics.frame_done()
+                if out.action is not None:
+                    self.actions.post(out.action)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        self.running = False
+        self.sampler.stop()  # Keep what was sampled if the daemon stops mid-profile
+        if self.control_socket is not None:
+            self.control_socket.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        self.actions.stop()
+        print(self.actions.report())
+        self.grabber.stop()
+        print(self.grabber.report())
+        print(self.cap.report())
+        print(self.pipeline.report())
+        print(self.metrics.log_line())
+        self.metrics.stop()
+        self.cap.release()
+        self.hands.close()
+
+
+def send_command(command, socket_path=SOCKET_PATH, timeout=30.0):
+    """Sends one command to a running daemon and returns its decoded reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)  # Model changes rebuild the graph, allow for that
+        sock.connect(socket_path)
+        sock.sendall(command.encode() + b'\n')
+        with sock.makefile('r') as stream:
+            return json.loads(stream.readline())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Persistent hand gesture daemon")
+    parser.add_argument('--send', metavar='COMMAND', help="send a command to the running daemon and exit")
+    parser.add_argument('--socket', default=SOCKET_PATH, help="control socket path")
+    parser.add_argument('--source', default='0',
+                        help="camera index or /dev/videoN, a video file, an image folder or synthetic")
+    parser.add_argument('--profile', help="tuning profile from autotune.py")
+    parser.add_argument('--metrics-port', type=int, default=9108, help="0 disables")
+    parser.add_argument('--metrics-host', default='127.0.0.1',
+                        help="address the metrics endpoint listens on (0.0.0.0 lets other machines scrape it)")
+    parser.add_argument('--start', action='store_true', help="begin detecting right away instead of paused")
+    parser.add_argument('--record-screen', action='store_true',
+                        help="pinch toggles a screen recording (screen-<time>.avi)")
+    parser.add_argument('--sample-dir', default='.', help="where 'profile stop' writes collapsed stacks")
+    args = parser.parse_args()
+
+    if args.send:
+        try:
+            reply = send_command(args.send, args.socket)
+        except OSError as e:
+            print(f"Error: no daemon on {args.socket}: {e}")
+            sys.exit(1)
+        print(json.dumps(reply, indent=2))
+        sys.exit(0 if reply.get('ok') else 1)
+
+    if os.path.exists(args.socket):
+        try:
+            send_command('status', args.socket, timeout=2.0)
+        except (OSError, ValueError):
+            pass  # Stale socket file, serve_control() replaces it
+        else:
+            print(f"Error: a daemon is already running on {args.socket}")
+            sys.exit(1)
+
+    settings = load_profile(args.profile, defaults={
+        'width': 320, 'height': 240, 'model_complexity': 1,
+        'min_detection_confidence': 0.75, 'min_tracking_confidence': 0.75,
+    })
+    daemon = GestureDaemon(settings, source=args.source, socket_path=args.socket,
+                           metrics_port=args.metrics_port, sample_dir=args.sample_dir,
+                           record_screen=args.record_screen, metrics_host=args.metrics_host)
+    daemon.serve_control()
+    # systemd stops services with SIGTERM; leave through the normal cleanup path
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.handle('quit'))
+    if args.start:
+        daemon.handle('start')
+    daemon.run()
+
+
+if __name__ == "__main__":
+    main()
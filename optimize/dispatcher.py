@@ -0,0 +1,81 @@
+import queue
+import threading
+import time
+
+
+class ActionDispatcher:
+    """Runs gesture actions on a worker thread so the vision loop never blocks.
+
+    Every action has a cooldown tracked by timestamp. Actions registered with
+    the same group share one cooldown (e.g. 'left' and 'right' slide changes).
+    post() is safe to call on every frame: repeats inside the cooldown window
+    are discarded immediately instead of piling up in the queue.
+    """
+
+    def __init__(self, maxsize=16):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.handlers = {}
+        self.cooldowns = {}
+        self.groups = {}
+        self.last_fired = {}
+        self.lock = threading.Lock()
+        self.posted = 0
+        self.suppressed = 0
+        self.dropped = 0
+        self.executed = 0
+        self.thread = None
+
+    def register(self, action, handler, cooldown=1.0, group=None):
+        self.handlers[action] = handler
+        self.groups[action] = group or action
+        self.cooldowns[self.groups[action]] = cooldown
+
+    def post(self, action, *args):
+        """Queues an action unless it is cooling down. Never blocks."""
+        if action not in self.handlers:
+            print(f"Unknown action: {action}")
+            return False
+
+        group = self.groups[action]
+        now = time.monotonic()
+        with self.lock:
+            self.posted += 1
+            if now - self.last_fired.get(group, float('-inf')) < self.cooldowns[group]:
+                self.suppressed += 1
+                return False
+            try:
+                self.queue.put_nowait((action, args))
+            except queue.Full:
+                self.dropped += 1
+                return False
+            self.last_fired[group] = now
+        return True
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def run(self):
+        """Worker thread: execute queued actions one after another."""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            action, args = item
+            try:
+                self.handlers[action](*args)
+            except Exception as e:
+                print(f"Error running action '{action}': {e}")
+            self.executed += 1
+
+    def report(self):
+        return (f"Actions: {self.posted} posted, {self.executed} executed, "
+                f"{self.suppressed} in cooldown, {self.dropped} dropped")
+
+    def stop(self, timeout=5):
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join(timeout=timeout)
+            self.thread = None
@@ -0,0 +1,76 @@
+import threading
+
+import numpy as np
+
+
+class FramePool:
+    """Reusable frame buffers with reference counting.
+
+    acquire() hands out a buffer with one reference. Every extra consumer
+    (e.g. the recorder's queue) calls retain(), and each owner calls release()
+    when done. At zero references the buffer returns to the free list. Buffers
+    are plain numpy arrays, so OpenCV can write into them through dst=. In
+    steady state the loop reuses the same few buffers and allocates nothing.
+    """
+
+    def __init__(self, max_free=16):
+        self.lock = threading.Lock()
+        self.max_free = max_free  # Buffers kept for reuse; more than that go to the GC
+        self.free = []
+        self.refs = {}            # id(buffer) -> [buffer, reference count]
+        self.allocated = 0
+        self.reused = 0
+
+    def acquire(self, shape, dtype=np.uint8):
+        """A buffer of this shape with one reference, recycled when possible."""
+        shape = tuple(shape)
+        with self.lock:
+            buf = None
+            for i, candidate in enumerate(self.free):
+                if candidate.shape == shape and candidate.dtype == dtype:
+                    buf = self.free.pop(i)
+                    break
+            if buf is None:
+                buf = np.empty(shape, dtype=dtype)
+                self.allocated += 1
+            else:
+                self.reused += 1
+            self.refs[id(buf)] = [buf, 1]
+        return buf
+
+    def adopt(self, buf):
+        """Takes ownership of an array allocated elsewhere (one reference)."""
+        with self.lock:
+            self.refs[id(buf)] = [buf, 1]
+            self.allocated += 1
+        return buf
+
+    def owns(self, buf):
+        with self.lock:
+            return id(buf) in self.refs
+
+    def retain(self, buf):
+        with self.lock:
+            self.refs[id(buf)][1] += 1
+        return buf
+
+    def release(self, buf):
+        """Drops one reference; buffers the pool doesn't know are ignored."""
+        with self.lock:
+            entry = self.refs.get(id(buf))
+            if entry is None or entry[0] is not buf:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self.refs[id(buf)]
+            if len(self.free) < self.max_free:
+                self.free.append(buf)
+
+    def report(self):
+        with self.lock:
+            in_use, free = len(self.refs), len(self.free)
+        total = self.allocated + self.reused
+        percent = 100.0 * self.reused / total if total else 0.0
+        return (f"Frame pool: {self.allocated} allocated, {self.reused} reused ({percent:.1f}%), "
+                f"{in_use} in use, {free} free")
@@ -0,0 +1,167 @@
+from collections import deque
+
+import numpy as np
+
+WRIST = 0
+THUMB_TIP = 4
+INDEX_TIP = 8
+MIDDLE_MCP = 9
+FINGER_TIPS = np.array([4, 8, 12, 16, 20])
+FINGER_BASES = np.array([2, 5, 9, 13, 17])  # Thumb MCP and the other fingers' knuckles
+PALM = np.array([0, 5, 9, 13, 17])
+
+# Feature layout: tip-to-wrist (5), tip-to-base (5), thumb-to-index tip (1),
+# all divided by the palm size (wrist to middle knuckle) so they do not depend
+# on camera resolution or on how far the presenter stands from the camera.
+DEFAULT_TEMPLATES = [
+    ('open_palm', [1.2, 1.8, 1.9, 1.8, 1.5, 0.6, 0.8, 0.85, 0.8, 0.65, 0.9]),
+    ('fist',      [0.9, 0.9, 0.9, 0.85, 0.8, 0.45, 0.35, 0.35, 0.35, 0.3, 0.35]),
+    ('point',     [0.9, 1.8, 0.9, 0.85, 0.8, 0.45, 0.8, 0.35, 0.35, 0.3, 0.9]),
+    ('pinch',     [1.1, 1.2, 1.7, 1.6, 1.4, 0.55, 0.5, 0.8, 0.75, 0.6, 0.1]),
+    ('pinch',     [1.4, 1.45, 1.8, 1.75, 1.5, 0.9, 0.6, 0.8, 0.75, 0.6, 0.1]),
+    ('pinch',     [1.0, 1.1, 0.9, 0.85, 0.8, 0.5, 0.5, 0.35, 0.35, 0.3, 0.1]),
+]
+# The thumb-index gap separates pinch from everything else; weigh it up. The
+# thumb's own distances vary most between people, so they count for less.
+FEATURE_WEIGHTS = np.array([0.5, 1, 1, 1, 1, 0.5, 1, 1, 1, 1, 3], dtype=np.float32)
+
+
+def landmarks_to_array(handlm, width, height):
+    """Converts MediaPipe hand landmarks to a (21, 3) array in pixels."""
+    points = np.array([(lm.x, lm.y, lm.z) for lm in handlm.landmark], dtype=np.float32)
+    points *= (width, height, width)
+    return points
+
+
+def hand_features(points):
+    """Scale-normalized features for one hand (21, 3) or a batch (N, 21, 3)."""
+    xy = points[..., :2]
+    palm = np.linalg.norm(xy[..., MIDDLE_MCP, :] - xy[..., WRIST, :], axis=-1)
+    palm = np.maximum(palm, 1e-6)
+    tips = xy[..., FINGER_TIPS, :]
+    tip_wrist = np.linalg.norm(tips - xy[..., WRIST:WRIST + 1, :], axis=-1)
+    tip_base = np.linalg.norm(tips - xy[..., FINGER_BASES, :], axis=-1)
+    pinch = np.linalg.norm(xy[..., THUMB_TIP, :] - xy[..., INDEX_TIP, :], axis=-1)
+    features = np.concatenate((tip_wrist, tip_base, pinch[..., None]), axis=-1)
+    return features / palm[..., None]
+
+
+def palm_size(points):
+    return float(np.linalg.norm(points[MIDDLE_MCP, :2] - points[WRIST, :2]))
+
+
+class GestureClassifier:
+    """Nearest-template classifier over hand_features() vectors."""
+
+    def __init__(self, templates=DEFAULT_TEMPLATES, max_distance=1.0):
+        self.max_distance = max_distance
+        self.labels = np.array([label for label, _ in templates])
+        self.templates = np.array([features for _, features in templates], dtype=np.float32)
+
+    def add_template(self, label, features):
+        self.labels = np.append(self.labels, label)
+        self.templates = np.vstack((self.templates, np.asarray(features, dtype=np.float32)))
+
+    def classify(self, features):
+        """Returns the closest template's label, or 'none' if nothing is close enough.
+
+        Accepts a single feature vector or a batch; a batch returns an array of labels.
+        """
+        diff = (features[..., None, :] - self.templates) * FEATURE_WEIGHTS
+        distances = np.linalg.norm(diff, axis=-1)
+        best = distances.argmin(axis=-1)
+        labels = np.where(distances.min(axis=-1) <= self.max_distance, self.labels[best], 'none')
+        return labels if labels.ndim else str(labels)
+
+
+class SwipeDetector:
+    """Flags a fast horizontal hand movement, measured in palm sizes per second."""
+
+    def __init__(self, min_travel=1.5, min_speed=4.0, window=0.4):
+        self.min_travel = min_travel  # palm sizes
+        self.min_speed = min_speed    # palm sizes per second
+        self.window = window          # seconds of history considered
+        self.history = deque()
+
+    def update(self, points, timestamp):
+        x = float(points[PALM, 0].mean())
+        self.history.append((timestamp, x, palm_size(points)))
+        while timestamp - self.history[0][0] > self.window:
+            self.history.popleft()
+
+        t0, x0, _ = self.history[0]
+        elapsed = timestamp - t0
+        if elapsed <= 0:
+            return None
+        palm = max(np.mean([p for _, _, p in self.history]), 1e-6)
+        travel = (x - x0) / palm
+        if abs(travel) >= self.min_travel and abs(travel) / elapsed >= self.min_speed:
+            self.history.clear()
+            return 'swipe_right' if travel > 0 else 'swipe_left'
+        return None
+
+    def reset(self):
+        self.history.clear()
+
+
+class SlideGate:
+    """Slide actions from gestures and pointing, without the way back undoing them.
+
+    Pointing into the left or right zone changes the slide. A swipe only
+    counts when it started in the neutral middle, so the stroke that brings
+    the hand back from a zone is not taken for a swipe the other way. After
+    any slide action the opposite direction is held off for `reverse_hold`
+    seconds.
+    """
+
+    def __init__(self, window=0.4, reverse_hold=1.5):
+        self.window = window              # seconds back to where a swipe started (SwipeDetector's window)
+        self.reverse_hold = reverse_hold
+        self.zones = deque()              # (timestamp, zone) of the last `window` seconds
+        self.last_action = None
+        self.last_time = float('-inf')
+        self.suppressed = 0
+
+    def update(self, gesture, zone, timestamp):
+        """zone is 'left', 'right' or None for the middle. Returns 'left', 'right' or None."""
+        self.zones.append((timestamp, zone))
+        while timestamp - self.zones[0][0] > self.window:
+            self.zones.popleft()
+
+        if gesture in ('swipe_left', 'swipe_right'):
+            action = None
+            if self.zones[0][1] is None:
+                action = 'left' if gesture == 'swipe_left' else 'right'
+        elif gesture != 'fist':  # A closed fist is the resting pose
+            action = zone
+        else:
+            action = None
+        if action is None:
+            return None
+        if action != self.last_action and timestamp - self.last_time < self.reverse_hold:
+            self.suppressed += 1
+            return None
+        self.last_action, self.last_time = action, timestamp
+        return action
+
+    def reset(self):
+        """Call when the hand is lost; the reverse hold-off stays in force."""
+        self.zones.clear()
+
+
+class GestureRecognizer:
+    """Per-frame gesture for one tracked hand: a swipe if one just finished, else the static pose."""
+
+    def __init__(self, classifier=None, swipe=None):
+        self.classifier = classifier or GestureClassifier()
+        self.swipe = swipe or SwipeDetector()
+
+    def update(self, points, timestamp):
+        swipe = self.swipe.update(points, timestamp)
+        if swipe is not None:
+            return swipe
+        return self.classifier.classify(hand_features(points))
+
+    def reset(self):
+        """Call when the hand is lost so a swipe never spans two sightings."""
+        self.swipe.reset()
@@ -0,0 +1,148 @@
+"""MediaPipe Tasks HandLandmarker in LIVE_STREAM mode behind the legacy Hands interface.
+
+Legacy Hands.process() blocks the caller for the whole inference. Here
+process() hands the frame to the landmarker with detect_async() and returns
+at once with the newest result that has come back through the callback.
+While the model is still busy, the runtime drops any new frames it is given,
+so the capture loop never waits on inference. The result is one inference
+old. Its `timestamp` is the capture time of the frame it belongs to, so
+gesture timing stays correct.
+
+The landmarker needs the model bundle, which is not in the repository:
+
+    wget -P optimize https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task
+"""
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+HAND_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hand_landmarker.task')
+
+
+class Landmark:
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+class HandLandmarks:
+    def __init__(self, landmarks):
+        self.landmark = [Landmark(lm.x, lm.y, lm.z) for lm in landmarks]
+
+
+class Category:
+    def __init__(self, label, score):
+        self.label = label
+        self.score = score
+
+
+class Handedness:
+    def __init__(self, categories):
+        self.classification = [Category(c.category_name, c.score) for c in categories]
+
+
+class LiveResult:
+    """A HandLandmarkerResult shaped like the legacy solution's output.
+
+    It is built fresh on every call, because HandRoiTracker rewrites the
+    landmarks in place.
+    """
+
+    def __init__(self, result=None, timestamp=None):
+        self.timestamp = timestamp  # Capture time of the frame this came from; None before the first result
+        self.multi_hand_landmarks = None
+        self.multi_handedness = None
+        if result is not None and result.hand_landmarks:
+            self.multi_hand_landmarks = [HandLandmarks(hand) for hand in result.hand_landmarks]
+            self.multi_handedness = [Handedness(categories) for categories in result.handedness]
+
+
+class LiveStreamHands:
+    """HandLandmarker (LIVE_STREAM) with a non-blocking process(rgb).
+
+    HandRoiTracker recognizes it by `live` and then passes the frame's
+    timestamp and keeps the crop fixed.
+    """
+
+    live = True
+
+    def __init__(self, model_path=None, max_num_hands=1, min_detection_confidence=0.75,
+                 min_tracking_confidence=0.75, window=300):
+        from mediapipe.tasks.python import vision
+        from mediapipe.tasks.python.core.base_options import BaseOptions
+
+        model_path = model_path or HAND_MODEL_PATH
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Hand landmarker model not found at {model_path}; "
+                                    "see optimize/handtasks.py for where to download it")
+        options = vision.HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=max_num_hands,
+            min_hand_detection_confidence=min_detection_confidence,
+            min_hand_presence_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            result_callback=self.on_result,
+        )
+        self.lock = threading.Lock()
+        self.pending = {}          # timestamp_ms -> (capture time, submit time)
+        self.result = None         # Newest HandLandmarkerResult
+        self.result_time = None
+        self.last_ms = -1
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        self.latencies = deque(maxlen=window)  # Submit to callback, seconds
+        self.landmarker = vision.HandLandmarker.create_from_options(options)
+
+    def process(self, rgb, timestamp=None):
+        """Queues an RGB frame and returns the newest finished result without waiting."""
+        import mediapipe as mp
+
+        now = time.monotonic()
+        # The runtime wants strictly increasing millisecond timestamps
+        ms = max(int(now * 1000), self.last_ms + 1)
+        self.last_ms = ms
+        with self.lock:
+            self.pending[ms] = (timestamp if timestamp is not None else now, now)
+            self.submitted += 1
+        self.landmarker.detect_async(mp.Image(image_format=mp.ImageFormat.SRGB, data=np.ascontiguousarray(rgb)), ms)
+        with self.lock:
+            return LiveResult(self.result, self.result_time)
+
+    def on_result(self, result, image, timestamp_ms):
+        now = time.monotonic()
+        with self.lock:
+            # Frames older than this one were dropped by the runtime while it was busy
+            stale = [ms for ms in self.pending if ms < timestamp_ms]
+            for ms in stale:
+                del self.pending[ms]
+            self.dropped += len(stale)
+            captured, submitted = self.pending.pop(timestamp_ms, (None, now))
+            self.result, self.result_time = result, captured
+            self.completed += 1
+            self.latencies.append(now - submitted)
+
+    def stats(self):
+        with self.lock:
+            latencies = list(self.latencies)
+            stats = {'submitted': self.submitted, 'completed': self.completed, 'dropped': self.dropped}
+        if latencies:
+            p50, p95 = np.percentile(np.asarray(latencies) * 1000, [50, 95])
+            stats['result_latency_ms'] = {'p50': round(float(p50), 3), 'p95': round(float(p95), 3)}
+        return stats
+
+    def report(self):
+        stats = self.stats()
+        text = (f"Live stream: {stats['submitted']} frames submitted, {stats['completed']} inferred, "
+                f"{stats['dropped']} dropped while busy")
+        if 'result_latency_ms' in stats:
+            text += f", result after {stats['result_latency_ms']['p50']:.1f} ms (p50)"
+        return text
+
+    def close(self):
+        self.landmarker.close()
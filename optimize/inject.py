@@ -0,0 +1,309 @@
+"""Keyboard and mouse injection without pyautogui's pauses.
+
+pyautogui sleeps `PAUSE` (0.1 s) after every call and looks up keys through
+a generic layer on each one. The backends here talk to the OS directly and
+never sleep:
+
+    uinput      Linux kernel virtual device (python-evdev, write access to /dev/uinput);
+                works under X11, Wayland and the console
+    xtest       X11 XTest extension (python-xlib)
+    pyautogui   any OS, with its per-call pause switched off
+    noop        records events only; for tests and benchmarks
+
+Events are tuples, and send() injects a batch with a single sync/flush:
+
+    ('key', 'right', True)    key down ('key', name, False is key up)
+    ('move', x, y)            absolute pointer position in screen pixels
+    ('button', True)          left button down (False is up)
+
+    python inject.py --backend noop --events 5000     # per-event injection latency
+"""
+import argparse
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# Key name -> (evdev code name, X keysym name)
+KEYS = {
+    'left': ('KEY_LEFT', 'Left'),
+    'right': ('KEY_RIGHT', 'Right'),
+    'up': ('KEY_UP', 'Up'),
+    'down': ('KEY_DOWN', 'Down'),
+    'pageup': ('KEY_PAGEUP', 'Prior'),
+    'pagedown': ('KEY_PAGEDOWN', 'Next'),
+    'space': ('KEY_SPACE', 'space'),
+    'enter': ('KEY_ENTER', 'Return'),
+    'esc': ('KEY_ESC', 'Escape'),
+    'home': ('KEY_HOME', 'Home'),
+    'end': ('KEY_END', 'End'),
+    'b': ('KEY_B', 'b'),
+    'f5': ('KEY_F5', 'F5'),
+    'shift': ('KEY_LEFTSHIFT', 'Shift_L'),
+}
+
+
+class Injector:
+    """Base class: subclasses implement emit(event) and flush().
+
+    Thread safe, so the action dispatcher and the pointer thread can share
+    one injector. Keeps the time spent per event for report().
+    """
+
+    name = 'base'
+
+    def __init__(self, screen_size=(1920, 1080), window=1000):
+        self.screen_size = tuple(screen_size)
+        self.lock = threading.Lock()
+        self.events = 0
+        self.batches = 0
+        self.event_times = deque(maxlen=window)  # Seconds per event, one entry per batch
+
+    def send(self, events):
+        """Injects a batch of events and makes them visible with one flush."""
+        events = list(events)
+        if not events:
+            return
+        with self.lock:
+            start = time.perf_counter()
+            for event in events:
+                self.emit(event)
+            self.flush()
+            elapsed = time.perf_counter() - start
+            self.events += len(events)
+            self.batches += 1
+            self.event_times.append(elapsed / len(events))
+
+    def press(self, key):
+        """Key down and up, as one batch."""
+        self.send([('key', key, True), ('key', key, False)])
+
+    def move(self, x, y):
+        self.send([('move', int(x), int(y))])
+
+    def button(self, down):
+        self.send([('button', bool(down))])
+
+    def emit(self, event):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def latency(self):
+        """(p50, p95) injection time per event in microseconds over recent batches."""
+        if not self.event_times:
+            return None, None
+        p50, p95 = np.percentile(np.asarray(self.event_times) * 1e6, [50, 95])
+        return float(p50), float(p95)
+
+    def report(self):
+        p50, p95 = self.latency()
+        latency = f"p50 {p50:.1f} us, p95 {p95:.1f} us per event" if p50 is not None else "nothing sent"
+        return f"Input ({self.name}): {self.events} events in {self.batches} batches, {latency}"
+
+    def close(self):
+        pass
+
+
+class NoopInjector(Injector):
+    """Keeps the last `keep` events instead of injecting them."""
+
+    name = 'noop'
+
+    def __init__(self, screen_size=(1920, 1080), keep=1000):
+        super().__init__(screen_size)
+        self.sent = deque(maxlen=keep)
+
+    def emit(self, event):
+        self.sent.append(event)
+
+
+class UInputInjector(Injector):
+    """Virtual keyboard and absolute pointer through /dev/uinput.
+
+    The two are separate devices, because desktops treat a device that has
+    both keys and absolute axes as a tablet. The pointer's axes span
+    `screen_size`; the compositor scales them to the real screen. The
+    pointer device is only created on first use.
+    """
+
+    name = 'uinput'
+
+    def __init__(self, screen_size=(1920, 1080)):
+        super().__init__(screen_size)
+        from evdev import UInput, ecodes
+
+        self.ecodes = ecodes
+        self.codes = {key: getattr(ecodes, code) for key, (code, _) in KEYS.items()}
+        self.keyboard = UInput({ecodes.EV_KEY: list(self.codes.values())}, name='gesture-keyboard')
+        self.pointer = None
+        self.dirty = set()
+
+    def pointer_device(self):
+        if self.pointer is None:
+            from evdev import AbsInfo, UInput
+
+            e = self.ecodes
+            w, h = self.screen_size
+            self.pointer = UInput({
+                e.EV_KEY: [e.BTN_LEFT],
+                e.EV_ABS: [(e.ABS_X, AbsInfo(0, 0, w - 1, 0, 0, 0)),
+                           (e.ABS_Y, AbsInfo(0, 0, h - 1, 0, 0, 0))],
+            }, name='gesture-pointer')
+        return self.pointer
+
+    def emit(self, event):
+        e = self.ecodes
+        kind = event[0]
+        if kind == 'key':
+            self.keyboard.write(e.EV_KEY, self.codes[event[1]], 1 if event[2] else 0)
+            self.dirty.add(self.keyboard)
+        elif kind == 'move':
+            device = self.pointer_device()
+            device.write(e.EV_ABS, e.ABS_X, event[1])
+            device.write(e.EV_ABS, e.ABS_Y, event[2])
+            self.dirty.add(device)
+        elif kind == 'button':
+            device = self.pointer_device()
+            device.write(e.EV_KEY, e.BTN_LEFT, 1 if event[1] else 0)
+            self.dirty.add(device)
+
+    def flush(self):
+        for device in self.dirty:
+            device.syn()
+        self.dirty.clear()
+
+    def close(self):
+        self.keyboard.close()
+        if self.pointer is not None:
+            self.pointer.close()
+
+
+class XTestInjector(Injector):
+    """X11 XTest fake input; keycodes are looked up once per key."""
+
+    name = 'xtest'
+
+    def __init__(self, screen_size=None):
+        from Xlib import X, XK, display
+        from Xlib.ext import xtest
+
+        self.X = X
+        self.xtest = xtest
+        self.display = display.Display()
+        screen = self.display.screen()
+        super().__init__(screen_size or (screen.width_in_pixels, screen.height_in_pixels))
+        self.keycodes = {key: self.display.keysym_to_keycode(XK.string_to_keysym(keysym))
+                         for key, (_, keysym) in KEYS.items()}
+
+    def emit(self, event):
+        X = self.X
+        kind = event[0]
+        if kind == 'key':
+            self.xtest.fake_input(self.display, X.KeyPress if event[2] else X.KeyRelease,
+                                  self.keycodes[event[1]])
+        elif kind == 'move':
+            self.xtest.fake_input(self.display, X.MotionNotify, x=event[1], y=event[2])
+        elif kind == 'button':
+            self.xtest.fake_input(self.display, X.ButtonPress if event[1] else X.ButtonRelease, 1)
+
+    def flush(self):
+        self.display.flush()  # One write to the X server for the whole batch
+
+    def close(self):
+        self.display.close()
+
+
+class PyAutoGUIInjector(Injector):
+    """Portable fallback: pyautogui with `_pause=False` on every call."""
+
+    name = 'pyautogui'
+
+    def __init__(self, screen_size=None):
+        import pyautogui
+
+        pyautogui.FAILSAFE = False  # A hand in the corner is not a reason to abort
+        self.pyautogui = pyautogui
+        super().__init__(screen_size or tuple(pyautogui.size()))
+
+    def emit(self, event):
+        gui = self.pyautogui
+        kind = event[0]
+        if kind == 'key':
+            (gui.keyDown if event[2] else gui.keyUp)(event[1], _pause=False)
+        elif kind == 'move':
+            gui.moveTo(event[1], event[2], _pause=False)
+        elif kind == 'button':
+            (gui.mouseDown if event[1] else gui.mouseUp)(_pause=False)
+
+
+BACKENDS = {
+    'uinput': UInputInjector,
+    'xtest': XTestInjector,
+    'pyautogui': PyAutoGUIInjector,
+    'noop': NoopInjector,
+}
+
+
+def open_injector(backend='auto', screen_size=None):
+    """The named backend, or with 'auto' the first of uinput, xtest, pyautogui that works here."""
+    if backend != 'auto':
+        injector = BACKENDS[backend](screen_size) if screen_size else BACKENDS[backend]()
+        print(f"Input injection: {injector.name}")
+        return injector
+
+    candidates = []
+    if os.access('/dev/uinput', os.W_OK):
+        candidates.append('uinput')
+    if os.environ.get('DISPLAY'):
+        candidates.append('xtest')
+    candidates.append('pyautogui')
+    for name in candidates:
+        try:
+            injector = BACKENDS[name](screen_size) if screen_size else BACKENDS[name]()
+        except Exception as e:  # Missing module, no permission, no X server
+            print(f"Input backend {name} unavailable: {e}")
+            continue
+        print(f"Input injection: {injector.name}")
+        return injector
+    print("Warning: no input backend available; key presses are dropped")
+    return NoopInjector(screen_size or (1920, 1080))
+
+
+def benchmark(injector, events=2000, batch_sizes=(1, 2, 10), key='shift'):
+    """Per-event injection time for each batch size, as {batch size: (p50, p95) in us}."""
+    results = {}
+    for size in batch_sizes:
+        injector.event_times.clear()
+        stream = [('key', key, i % 2 == 0) for i in range(events + events % 2)]  # Ends released
+        for i in range(0, len(stream), size):
+            injector.send(stream[i:i + size])
+        results[size] = injector.latency()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-event input injection latency")
+    parser.add_argument('--backend', default='noop', choices=['auto'] + list(BACKENDS),
+                        help="injection backend (real backends really press --key)")
+    parser.add_argument('--events', type=int, default=2000, help="events per batch size")
+    parser.add_argument('--batch', default='1,2,10', help="comma-separated batch sizes")
+    parser.add_argument('--key', default='shift', choices=list(KEYS), help="key to press and release")
+    args = parser.parse_args()
+
+    injector = open_injector(args.backend)
+    try:
+        results = benchmark(injector, args.events, [int(b) for b in args.batch.split(',')], args.key)
+    finally:
+        injector.close()
+    print(f"{'batch':>6} {'p50 us/event':>13} {'p95 us/event':>13}")
+    for size, (p50, p95) in results.items():
+        print(f"{size:>6} {p50:>13.2f} {p95:>13.2f}")
+    print("For comparison, pyautogui.press() sleeps 100000 us after every call by default")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,6 @@ import socket
 import threading
 from zeroconf import ServiceInfo, Zeroconf
 import logging
-from keyboard_server import keyboard
 import time
 
 class KeyboardServer:
@@ -111,6 +110,9 @@ class KeyboardServer:
             print(f"Command '{command}' sent to {active_clients} client(s)")
 
     def process_keyboard(self):
+        # Only the standalone server reads the keyboard; the gesture scripts just broadcast
+        import keyboard
+
         print("\nKeyboard controls:")
         print("→ or 'D' or 'L': Next slide")
         print("← or 'A' or 'H': Previous slide")
@@ -168,6 +170,63 @@ class KeyboardServer:
         except Exception as e:
             print(f"Error during cleanup: {e}")
 
+class GestureServer:
+    """KeyboardServer driven by gesture actions, shared by the gesture scripts.
+
+    'left' and 'right' go to the computers as PREV/NEXT and share one 1.1 s
+    cooldown. 'record' toggles `recorder` (screenrec.BackgroundRecording) on a
+    dispatcher of its own, since stopping waits for the video to be written,
+    and the clients show the new state from the "True"/"False" message.
+    Without a recorder 'record' is ignored.
+    """
+
+    def __init__(self, recorder=None, port=12345):
+        from dispatcher import ActionDispatcher
+
+        self.server = KeyboardServer(port)
+        accept_thread = threading.Thread(target=self.server.accept_connections)
+        accept_thread.daemon = True
+        accept_thread.start()
+
+        self.slides = ActionDispatcher()
+        self.slides.register('left', lambda: self.server.broadcast_command("PREV"), cooldown=1.1, group='slide')
+        self.slides.register('right', lambda: self.server.broadcast_command("NEXT"), cooldown=1.1, group='slide')
+        self.slides.start()
+
+        self.recorder = recorder
+        self.recording = None
+        if recorder is not None:
+            self.recording = ActionDispatcher(maxsize=2)
+            self.recording.register('record', self.toggle_recording, cooldown=1)  # Prevent rapid toggling
+            self.recording.start()
+
+    def post(self, action):
+        """Queues a pipeline action; never blocks."""
+        if action == 'record':
+            return self.recording is not None and self.recording.post(action)
+        return self.slides.post(action)
+
+    def toggle_recording(self):
+        self.server.broadcast_command(str(self.recorder.toggle()))
+
+    def is_recording(self):
+        return self.recorder is not None and self.recorder.active
+
+    def report(self):
+        lines = [self.slides.report()]
+        if self.recording is not None:
+            lines.append("Recording " + self.recording.report())
+        return '\n'.join(lines)
+
+    def stop(self):
+        self.slides.stop()
+        if self.recording is not None:
+            self.recording.stop(timeout=None)  # Let a stop in progress finish saving
+            if self.recorder.active:
+                self.recorder.stop()
+        self.server.stop()
+
+
 if __name__ == "__main__":
     try:
         print("Note: You might need to run this script with sudo for keyboard input")
@@ -0,0 +1,270 @@
+"""Session log of everything Hands.process found, for tuning without re-running inference.
+
+A log is a directory of raw little-endian column files plus meta.json:
+
+    time.bin        float64 (N,)              frame timestamp in seconds
+    count.bin       uint8   (N,)              hands found
+    landmarks.bin   float32 (N, H, 21, 3)     pixels of the mirrored frame
+    handedness.bin  int8    (N, H)            0 left, 1 right, -1 no hand
+    gesture.bin     int8    (N,)              index into meta 'gestures', -1 none
+    action.bin      int8    (N,)              index into meta 'actions', -1 none
+
+Files grow a chunk of frames at a time and are written through memory maps,
+so appending costs a few array stores per frame. The reader maps the same
+files read-only; a long lecture opens instantly and replays the decision
+logic with new thresholds at thousands of frames per second.
+
+    python landmarklog.py info sessions/session-20261018-101500
+    python landmarklog.py replay sessions/session-20261018-101500 --max-distance 0.8 --left-zone 0.25
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+HANDEDNESS = ('Left', 'Right')
+
+
+def columns(max_hands):
+    """name -> (dtype, shape of one frame)"""
+    return {
+        'time': (np.float64, ()),
+        'count': (np.uint8, ()),
+        'landmarks': (np.float32, (max_hands, 21, 3)),
+        'handedness': (np.int8, (max_hands,)),
+        'gesture': (np.int8, ()),
+        'action': (np.int8, ()),
+    }
+
+
+class LandmarkLog:
+    """Appends FrameResults to a log directory. Call close() to trim it to the frames written."""
+
+    def __init__(self, path, max_hands=2, chunk=4096, calibration=None):
+        self.path = path
+        self.max_hands = max_hands
+        self.chunk = chunk  # Frames added to every column file when it is full
+        self.calibration = calibration.to_dict() if calibration is not None else None
+        self.columns = columns(max_hands)
+        self.labels = {'gestures': [], 'actions': []}
+        self.frame_size = None
+        self.frames = 0
+        self.capacity = 0
+        self.maps = {}
+        self.write_time = 0.0
+        os.makedirs(path, exist_ok=True)
+        for name in self.columns:
+            open(self.file(name), 'wb').close()
+        self.grow()
+
+    @classmethod
+    def create(cls, directory, **kwargs):
+        """A new log in a timestamped subdirectory of `directory`."""
+        path = os.path.join(directory, datetime.now().strftime('session-%Y%m%d-%H%M%S'))
+        print(f"Logging landmarks to {path}")
+        return cls(path, **kwargs)
+
+    def file(self, name):
+        return os.path.join(self.path, name + '.bin')
+
+    def grow(self):
+        """Extends every column file by one chunk and maps them again."""
+        self.flush()
+        self.maps = {}
+        self.capacity += self.chunk
+        for name, (dtype, shape) in self.columns.items():
+            with open(self.file(name), 'r+b') as f:
+                f.truncate(self.capacity * int(np.prod(shape, dtype=int)) * np.dtype(dtype).itemsize)
+            self.maps[name] = np.memmap(self.file(name), dtype=dtype, mode='r+', shape=(self.capacity,) + shape)
+        self.write_meta()
+
+    def code(self, kind, label):
+        if label is None:
+            return -1
+        labels = self.labels[kind]
+        if label not in labels:
+            labels.append(label)
+        return labels.index(label)
+
+    def append(self, timestamp, out):
+        start = time.perf_counter()
+        if self.frames == self.capacity:
+            self.grow()
+        if self.frame_size is None:
+            self.frame_size = (out.frame.shape[1], out.frame.shape[0])
+        i = self.frames
+        m = self.maps
+        hands = out.hands[:self.max_hands]
+        m['time'][i] = timestamp
+        m['count'][i] = len(hands)
+        m['handedness'][i] = -1
+        for j, (label, points) in enumerate(hands):
+            m['landmarks'][i, j] = points
+            m['handedness'][i, j] = HANDEDNESS.index(label) if label in HANDEDNESS else -1
+        m['gesture'][i] = self.code('gestures', out.gesture)
+        m['action'][i] = self.code('actions', out.action)
+        self.frames += 1
+        self.write_time += time.perf_counter() - start
+
+    def write_meta(self):
+        meta = {
+            'frames': self.frames,
+            'max_hands': self.max_hands,
+            'frame_size': list(self.frame_size) if self.frame_size else None,
+            'calibration': self.calibration,
+            'gestures': self.labels['gestures'],
+            'actions': self.labels['actions'],
+        }
+        with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    def flush(self):
+        for array in self.maps.values():
+            array.flush()
+        if self.maps:
+            self.write_meta()
+
+    def report(self):
+        avg = self.write_time / self.frames * 1e6 if self.frames else 0.0
+        return f"Landmark log {self.path}: {self.frames} frames ({avg:.1f} us each)"
+
+    def close(self):
+        """Flushes and cuts the files down to the frames actually written."""
+        self.flush()
+        self.maps = {}
+        for name, (dtype, shape) in self.columns.items():
+            with open(self.file(name), 'r+b') as f:
+                f.truncate(self.frames * int(np.prod(shape, dtype=int)) * np.dtype(dtype).itemsize)
+        self.capacity = self.frames
+        self.write_meta()
+
+
+class LandmarkSession:
+    """Read-only view of a log: columns are memory-mapped numpy arrays of `frames` rows."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.frames = self.meta['frames']
+        self.frame_size = tuple(self.meta['frame_size']) if self.meta['frame_size'] else None
+        self.gestures = self.meta['gestures']
+        self.actions = self.meta['actions']
+        for name, (dtype, shape) in columns(self.meta['max_hands']).items():
+            if self.frames:
+                array = np.memmap(os.path.join(path, name + '.bin'), dtype=dtype, mode='r',
+                                  shape=(self.frames,) + shape)
+            else:
+                array = np.empty((0,) + shape, dtype=dtype)
+            setattr(self, name, array)
+
+    def __len__(self):
+        return self.frames
+
+    def calibration(self):
+        if not self.meta.get('calibration'):
+            return None
+        from calibration import Calibration
+
+        data = self.meta['calibration']
+        return Calibration(data['corners'], data['frame_size'], data['screen_size'], ordered=True)
+
+    def labels(self, kind):
+        """The logged gesture or action of every frame as an array of labels ('' for none)."""
+        codes = self.gesture if kind == 'gestures' else self.action
+        names = np.array(list(self.meta[kind]) + [''], dtype=object)
+        return names[np.asarray(codes, dtype=np.int64)]  # -1 picks the trailing ''
+
+
+def replay(session, pipeline):
+    """Runs pipeline's decision logic over a logged session.
+
+    `pipeline` is a GesturePipeline built without a model (hands=None) and
+    with the thresholds being tuned. Returns the gesture of every frame and
+    the actions that would have fired through the live cooldowns, as
+    [(seconds since the first frame, action)].
+    """
+    from bench import COOLDOWNS
+    from pipeline import FrameResult
+
+    w = session.frame_size[0] if session.frame_size else 1
+    if pipeline.calibration is not None and session.frame_size:
+        pipeline.map_frame(*session.frame_size)
+    times = np.asarray(session.time)
+    counts = np.asarray(session.count)
+    landmarks = np.asarray(session.landmarks)
+    handedness = np.asarray(session.handedness)
+    gestures = []
+    triggers = []
+    last_fired = {}
+    for i in range(session.frames):
+        out = FrameResult(None)
+        out.hands = [(HANDEDNESS[handedness[i, j]] if handedness[i, j] >= 0 else 'unknown', landmarks[i, j])
+                     for j in range(counts[i])]
+        pipeline.decide_hands(out, w, times[i])
+        gestures.append(out.gesture)
+        if out.action is not None:
+            group, cooldown = COOLDOWNS[out.action]
+            if times[i] - last_fired.get(group, float('-inf')) >= cooldown:
+                last_fired[group] = times[i]
+                triggers.append((float(times[i] - times[0]), out.action))
+    return gestures, triggers
+
+
+def summarize(labels):
+    names, counts = np.unique([label for label in labels if label], return_counts=True)
+    return ', '.join(f"{name} {count}" for name, count in zip(names, counts)) or 'nothing'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or replay a landmark session log")
+    parser.add_argument('command', choices=['info', 'replay'])
+    parser.add_argument('path', help="session directory written with --session-log")
+    parser.add_argument('--left-zone', type=float, default=0.3)
+    parser.add_argument('--right-zone', type=float, default=0.7)
+    parser.add_argument('--max-distance', type=float, default=1.0,
+                        help="gesture template distance; lower makes pinch and the other poses stricter")
+    parser.add_argument('--swipe-travel', type=float, default=1.5, help="palm sizes a swipe has to cover")
+    parser.add_argument('--swipe-speed', type=float, default=4.0, help="palm sizes per second")
+    parser.add_argument('--reverse-hold', type=float, default=1.5,
+                        help="seconds the opposite slide direction is ignored after a slide action")
+    parser.add_argument('--truth', help="CSV of time,action (seconds from the first frame) to score against")
+    args = parser.parse_args()
+
+    session = LandmarkSession(args.path)
+    duration = float(session.time[-1] - session.time[0]) if session.frames > 1 else 0.0
+    print(f"{session.frames} frames over {duration:.1f} s, frame size {session.frame_size}, "
+          f"{int(np.count_nonzero(session.count))} with hands")
+    print(f"Logged gestures: {summarize(session.labels('gestures'))}")
+    print(f"Logged actions: {summarize(session.labels('actions'))}")
+    if args.command == 'info':
+        return
+
+    from bench import match_triggers, read_ground_truth
+    from gestures import GestureClassifier, GestureRecognizer, SwipeDetector
+    from pipeline import GesturePipeline
+
+    recognizer = GestureRecognizer(GestureClassifier(max_distance=args.max_distance),
+                                   SwipeDetector(args.swipe_travel, args.swipe_speed))
+    pipeline = GesturePipeline(None, left_zone=args.left_zone, right_zone=args.right_zone,
+                               calibration=session.calibration())
+    pipeline.recognizer = recognizer
+    pipeline.slides.reverse_hold = args.reverse_hold
+    start = time.perf_counter()
+    gestures, triggers = replay(session, pipeline)
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {session.frames} frames in {elapsed:.2f} s "
+          f"({session.frames / elapsed if elapsed else 0:.0f} frames/s)")
+    print(f"Replayed gestures: {summarize(gestures)}")
+    print(f"Fired actions: {summarize([a for _, a in triggers])}")
+    if args.truth:
+        accuracy = match_triggers(triggers, read_ground_truth(args.truth))
+        print(f"Against {args.truth}: {accuracy['hits']}/{accuracy['labelled']} hit, "
+              f"{accuracy['false_triggers']} false trigger(s)")
+
+
+if __name__ == "__main__":
+    main()
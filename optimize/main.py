@@ -1,40 +1,91 @@
 import cv2
-import mediapipe as mp
-import pyautogui
+import signal
 import threading
 import time
-import numpy as np 
-import math
+import argparse
 from recordv3 import CameraRecorder
+from capture import FrameGrabber
+from framepool import FramePool
+from sources import open_source
+from calibration import load_calibration
+from screenfind import DriftMonitor
+from dispatcher import ActionDispatcher
+from scheduler import AdaptiveScheduler
+from motion import MotionGate
+from pipeline import GesturePipeline, make_hands
+from sampler import StackSampler
+from landmarklog import LandmarkLog
+from config import hands_options, load_profile
+from metrics import StageMetrics
 import keyboard_server as ps
-#import pyaudio 
 
 
 ###################### SET UP ######################################
-width_cam, height_cam = 640, 480
-mp_hand = mp.solutions.hands.Hands(False, 1, 1, 0.75, 0.5) # (static_image_mode, max_num_hands, min_detection_confidence, min_tracking_confidence, model_complexity)
-cap = cv2.VideoCapture(0)
-hand_status = ''
-t0 = 0
-t = 0
+parser = argparse.ArgumentParser(description="Hand gesture slide control and camera recording")
+parser.add_argument('--preview', action='store_true',
+                    help="show the camera window with overlays (off by default for projector deployments)")
+parser.add_argument('--metrics-port', type=int, default=9108,
+                    help="serve Prometheus metrics on this port (0 disables)")
+parser.add_argument('--metrics-host', default='127.0.0.1',
+                    help="address the metrics endpoint listens on (0.0.0.0 lets other machines scrape it)")
+parser.add_argument('--log-interval', type=float, default=30,
+                    help="seconds between metrics log lines (0 disables)")
+parser.add_argument('--source', default='0',
+                    help="camera index or /dev/videoN, a video file, an image folder or synthetic")
+parser.add_argument('--calibration', help="screen calibration from detect/videos/tesstcam.py (default: optimize/calibration.json)")
+parser.add_argument('--auto-calibrate', action='store_true',
+                    help="find the projector screen in the camera image when there is no calibration")
+parser.add_argument('--drift-interval', type=float, default=30,
+                    help="seconds between checks that the screen hasn't moved (0 disables)")
+parser.add_argument('--profile', help="tuning profile from autotune.py (default: gesture_profile.json here)")
+parser.add_argument('--backend', default='legacy', choices=('legacy', 'live'),
+                    help="blocking Hands.process() or the Tasks HandLandmarker in live-stream mode, which never blocks the loop")
+parser.add_argument('--fixed-complexity', action='store_true',
+                    help="always run the configured model instead of tracking with the light one")
+parser.add_argument('--hand-model', help="hand_landmarker.task for --backend live (default: optimize/hand_landmarker.task)")
+parser.add_argument('--no-motion-gate', action='store_true',
+                    help="run hand inference even when nothing in view moves")
+parser.add_argument('--session-log', metavar='DIR',
+                    help="keep every frame's landmarks and decisions under DIR for replay with landmarklog.py")
+parser.add_argument('--sample-stacks', action='store_true',
+                    help="profile all threads from the start (kill -USR2 <pid> toggles it at any time)")
+parser.add_argument('--sample-dir', default='.', help="where collapsed-stack profiles are written")
+args = parser.parse_args()
+preview = args.preview  # Headless: no drawing and no imshow
 
-# Add these global variables
-record_flag = False
-recording_thread = None
-last_toggle_time = 0
+width_cam, height_cam = 640, 480
+# Same values the positional Hands(False, 1, 1, 0.75, 0.5) call used; an autotuned profile overrides them
+settings = load_profile(args.profile, defaults={
+    'model_complexity': 1,
+    'min_detection_confidence': 0.75,
+    'min_tracking_confidence': 0.5,
+})
+mp_hand = make_hands(**hands_options(settings), backend=args.backend, model_path=args.hand_model,
+                     dynamic=not args.fixed_complexity)
+# Without a profile the camera keeps its default resolution, but still delivers MJPEG
+cap = open_source(args.source, settings.get('width'), settings.get('height'))
+metrics = StageMetrics()
+pool = FramePool()  # Camera, mirror and recorder buffers are recycled instead of allocated per frame
+grabber = FrameGrabber(cap, metrics, pool).start()  # Camera I/O runs off the inference loop
+# Gesture-to-action budget in seconds; the hand is tracked in a cropped region between detections
+pipeline = GesturePipeline(mp_hand, scheduler=AdaptiveScheduler(target_latency=0.15),
+                           left_zone=0.4, right_zone=0.6,
+                           motion_gate=None if args.no_motion_gate else MotionGate(), pool=pool,
+                           calibration=load_calibration(args.calibration))
+if args.session_log:
+    pipeline.log = LandmarkLog.create(args.session_log, calibration=pipeline.calibration)
+# Re-calibrates when the camera was bumped, or calibrates from scratch with --auto-calibrate
+drift = None
+if args.drift_interval and (pipeline.calibration is not None or args.auto_calibrate):
+    drift = DriftMonitor(pipeline.calibration, args.drift_interval, path=args.calibration)
 server = ps.KeyboardServer()
 accept_thread = threading.Thread(target=server.accept_connections)
 accept_thread.daemon = True
 accept_thread.start()
 
-# Add these global variables
-# record_flag = False
-# recording_thread = None
-# last_toggle_time = 0
-
 ###################################################################
 try:
-    recorder = CameraRecorder()
+    recorder = CameraRecorder(pool)
 except Exception as e:
     print(f"Error initializing audio device: {e}")
     print("Please check your microphone connection and permissions")
@@ -43,10 +94,6 @@ except Exception as e:
 
 ###################################################################
 
-def key_press(direction):
-    pyautogui.press(direction)
-
-
 '''
 def navigate_slide(frame, x, y):
     frame_height, frame_width = frame.shape[:2]
@@ -57,109 +104,123 @@ def navigate_slide(frame, x, y):
         key_press('right')
         time.sleep(1.1)
 '''
-def interact(frame, x, y):
-    frame_height, frame_width = frame.shape[:2]
-    global t0
-    t = time.time()
-    if t - t0 > 2: # exceed 2 seconds
-        print('Exceed 2 seconds')
-        t0 = time.time()
-        if x < frame_width * 0.4:
-            thread_sendl = threading.Thread(target=server.process_keyboard('left'))
-            thread_sendl.start()
-            #server.process_keyboard('left')
-            #time.sleep(1.5)
-        elif x > frame_width * 0.6:
-            thread_sendr = threading.Thread(target=server.process_keyboard('right'))
-            thread_sendr.start()
+# Slide commands run on the dispatcher thread, never on the camera loop
+dispatcher = ActionDispatcher()
+dispatcher.register('left', lambda: server.broadcast_command("PREV"), cooldown=2, group='slide')
+dispatcher.register('right', lambda: server.broadcast_command("NEXT"), cooldown=2, group='slide')
+dispatcher.start()
+# Stopping a recording waits for the writer and the audio merge, so toggles get their own thread
+recording = ActionDispatcher(maxsize=2)
+recording.register('record', recorder.toggle_recording, cooldown=1)
+recording.start()
+
+if args.metrics_port:
+    metrics.serve(args.metrics_port, args.metrics_host)
+if args.log_interval:
+    metrics.start_logging(args.log_interval)
+metrics.add_gauge('gesture_dropped_frames_total', "Camera frames overwritten before use",
+                  lambda: grabber.dropped, kind='counter')
+metrics.add_gauge('gesture_capture_fps', "Frames per second delivered by the source", cap.fps)
+metrics.add_gauge('gesture_decode_seconds', "Average time to decode one camera frame", cap.avg_decode)
+metrics.add_gauge('gesture_inferences_saved_total', "Inferences skipped because nothing moved",
+                  lambda: pipeline.motion_gate.skipped if pipeline.motion_gate else 0, kind='counter')
+metrics.add_gauge('gesture_inference_stride', "Inference runs on every Nth frame",
+                  lambda: pipeline.scheduler.stride)
+metrics.add_gauge('gesture_inference_scale', "Input scale handed to MediaPipe",
+                  lambda: pipeline.scheduler.scale)
+metrics.add_gauge('gesture_scheduler_changes_total', "Stride or scale changes made by the scheduler",
+                  lambda: pipeline.scheduler.changes, kind='counter')
+if hasattr(mp_hand, 'light_runs'):
+    metrics.add_gauge('gesture_light_model_runs_total', "Inferences on the light hand model",
+                      lambda: mp_hand.light_runs, kind='counter')
+    metrics.add_gauge('gesture_full_model_runs_total', "Inferences on the full hand model",
+                      lambda: mp_hand.full_runs, kind='counter')
+metrics.add_gauge('gesture_recording', "1 while the camera recording is on", lambda: recorder.is_recording)
+metrics.add_gauge('gesture_recording_queue', "Frames waiting for the video writer",
+                  lambda: recorder.frame_queue.qsize())
     
-######################### MAIN PROCESS ################################
-while True:
-    success, frame = cap.read()
-    frame_shape = frame.shape 
-    if not success:
-        break 
-
-    frame = cv2.flip(frame, 1)
-
-    
-    # if frame_shape is None:
-    #     frame_shape = frame.shape
-    
-    frame.flags.writeable = False 
-    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) 
-    result = mp_hand.process(rgb_frame)
-
-
+# Stack sampling profiler; SIGUSR2 starts it and the next SIGUSR2 writes the flamegraph input
+sampler = StackSampler(args.sample_dir)
+if hasattr(signal, 'SIGUSR2'):
+    signal.signal(signal.SIGUSR2, lambda signum, frame: sampler.toggle())
+if args.sample_stacks:
+    sampler.start()
 
-    frame.flags.writeable = True
-    left_coordinate = None
-    right_coordinate = None  
-    left_hand_detected, right_hand_detected = False, False
-    x_center, y_center = None, None
-    
-
-
-    if result.multi_hand_landmarks:
-        for handlm, handedness in  zip(result.multi_hand_landmarks, result.multi_handedness):
-            hand_label = handedness.classification[0].label
-            h, w, _ = frame_shape
-
-            cx, cy = int(handlm.landmark[8].x * w), int(handlm.landmark[8].y * h)
-            if hand_label == "Left":
-                left_hand_detected = True
-                left_coordinate = (cx, cy)
-            else: 
-                right_hand_detected = True
-                right_coordinate = (cx, cy)
+######################### MAIN PROCESS ################################
+try:
+    while True:
+        success, frame = grabber.read()
+        if not success:
+            break 
+
+        # Every frame is shown and recorded, but inference only runs when the scheduler says so
+        if pipeline.should_process():
+            out = pipeline.process(frame, grabber.read_time)  # Swipe timing follows capture, not inference
+            if drift is not None and drift.check(frame) is not None:
+                pipeline.set_calibration(drift.calibration)
+            pool.release(frame)  # Only the mirrored copy is used from here on
+            frame = out.frame
+            metrics.observe_all(pipeline.timings)
+            metrics.frame_done()
+            if out.action == 'record':
+                recording.post('record', frame)
+            elif out.action is not None:
+                dispatcher.post(out.action)
 
             #----------------- Draw -----------------------#
-            #cv2.circle(frame, (int(x_center), int(y_center)), 10, (255, 255, 0), -1) 
-            cv2.circle(frame, (cx, cy), 10, (0, 255, 0), -1)
-
-            # Hiển thị tọa độ ngón trỏ trên frame
-            '''
-            if left_hand_detected:
-                cv2.putText(frame, f"Left Index: {left_coordinate}", (10, 40), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
-            
-            '''
-            '''
-            if right_hand_detected:
-                cv2.putText(frame, f"Right Index: {right_coordinate}", (10, 80), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)      
-              '''
-
-            if hand_label == "Right":
-                # Process right hand for slide navigation and recording control
-                thumb_tip = handlm.landmark[4]
-                index_tip = handlm.landmark[8]
-                
-                x_thumb, y_thumb = int(thumb_tip.x * w), int(thumb_tip.y * h)
-                x_index, y_index = int(index_tip.x * w), int(index_tip.y * h)
-                
-                cv2.circle(frame, (x_thumb, y_thumb), 10, (255, 0, 0), -1)
-                cv2.circle(frame, (x_index, y_index), 10, (0, 255, 0), -1)
-                
-                # Check for thumb and index finger collision
-                distance = math.hypot(x_thumb - x_index, y_thumb - y_index)
-                if distance < 24 :
-                    recorder.toggle_recording(frame)
-                    cv2.circle(frame, ((x_thumb + x_index) // 2, (y_thumb + y_index) // 2), 10, (0, 255, 255), -1)
-
-                else:
-                    # If not in collision, use for slide navigation
-                    interact(frame, x_index, y_index)
-                
-
-    recorder.add_frame(frame)
-    cv2.imshow("Hand Frame", frame)
-    key = cv2.waitKey(1)
-    if key == 27:
-        recorder.cleanup()
-        break
-
-
+            if preview:
+                draw_start = time.perf_counter()
+                for hand_label, points in out.hands:
+                    cv2.circle(frame, (int(points[8, 0]), int(points[8, 1])), 10, (0, 255, 0), -1)
+                if out.gesture is not None:
+                    cv2.circle(frame, out.thumb, 10, (255, 0, 0), -1)
+                    cv2.circle(frame, out.index, 10, (0, 255, 0), -1)
+                    cv2.putText(frame, out.gesture, (10, 150), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
+                    if out.gesture == 'pinch':
+                        cv2.circle(frame, ((out.thumb[0] + out.index[0]) // 2, (out.thumb[1] + out.index[1]) // 2),
+                                   10, (0, 255, 255), -1)
+                metrics.observe('draw', time.perf_counter() - draw_start)
+        else:
+            mirrored = pipeline.mirror(frame)
+            pool.release(frame)
+            frame = mirrored
+
+        record_start = time.perf_counter()
+        recorder.add_frame(frame)
+        metrics.observe('record', time.perf_counter() - record_start)
+        if not preview:
+            pool.release(frame)  # The recorder holds its own reference while recording
+            continue
+
+        display_start = time.perf_counter()
+        cv2.imshow("Hand Frame", frame)
+        key = cv2.waitKey(1)
+        metrics.observe('display', time.perf_counter() - display_start)
+        pool.release(frame)
+        if key == 27:
+            recorder.cleanup()
+            break
+except KeyboardInterrupt:  # Ctrl-C is the way out when there is no window
+    pass
+
+
+sampler.stop()
+dispatcher.stop()
+print(dispatcher.report())
+recording.stop(timeout=None)  # Let a stop in progress finish saving
+grabber.stop()
+print(grabber.report())
+print(cap.report())
+print(pool.report())
+if drift is not None:
+    print(drift.report())
+print(pipeline.report())
+if pipeline.log is not None:
+    pipeline.log.close()
+    print(pipeline.log.report())
+print(metrics.log_line())
+metrics.stop()
 cap.release()
 recorder.cleanup()
-cv2.destroyAllWindows()
\ No newline at end of file
+if preview:
+    cv2.destroyAllWindows()
\ No newline at end of file
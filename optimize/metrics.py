@@ -0,0 +1,164 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram bucket bounds in seconds, tuned for a 30 fps loop on a Pi
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class StageMetrics:
+    """Per-stage timing of the vision loop.
+
+    Every stage keeps a cumulative Prometheus histogram plus the last `window`
+    samples for rolling quantiles. Observations may come from any thread.
+    Scrape with serve(), or get a summary with log_line().
+    """
+
+    def __init__(self, window=300):
+        self.lock = threading.Lock()
+        self.window = window
+        self.buckets = {}   # stage -> per-bucket counts (last entry is +Inf)
+        self.sums = {}
+        self.counts = {}
+        self.recent = {}    # stage -> deque of the latest samples
+        self.gauges = []    # (name, help, type, fn) evaluated at scrape time
+        self.frames = 0
+        self.frame_times = deque(maxlen=window)
+        self.server = None
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            if stage not in self.counts:
+                self.buckets[stage] = [0] * (len(BUCKETS) + 1)
+                self.sums[stage] = 0.0
+                self.counts[stage] = 0
+                self.recent[stage] = deque(maxlen=self.window)
+            self.buckets[stage][bisect_left(BUCKETS, seconds)] += 1
+            self.sums[stage] += seconds
+            self.counts[stage] += 1
+            self.recent[stage].append(seconds)
+
+    def observe_all(self, timings):
+        for stage, seconds in timings.items():
+            self.observe(stage, seconds)
+
+    def frame_done(self):
+        with self.lock:
+            self.frames += 1
+            self.frame_times.append(time.monotonic())
+
+    def add_gauge(self, name, help_text, fn, kind='gauge'):
+        """Exports fn() under `name` on every scrape (kind may be 'counter')."""
+        self.gauges.append((name, help_text, kind, fn))
+
+    def fps(self):
+        with self.lock:
+            if len(self.frame_times) < 2:
+                return 0.0
+            span = self.frame_times[-1] - self.frame_times[0]
+            return (len(self.frame_times) - 1) / span if span > 0 else 0.0
+
+    def quantiles(self, stage):
+        with self.lock:
+            samples = sorted(self.recent.get(stage, ()))
+        if not samples:
+            return {}
+        return {q: samples[min(int(q * len(samples)), len(samples) - 1)] for q in QUANTILES}
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        fps = self.fps()
+        with self.lock:
+            stages = list(self.counts)
+            snapshot = {s: (list(self.buckets[s]), self.sums[s], self.counts[s]) for s in stages}
+            frames = self.frames
+
+        lines = ['# HELP gesture_stage_seconds Time spent in each stage of the vision loop',
+                 '# TYPE gesture_stage_seconds histogram']
+        for stage in stages:
+            buckets, total, count = snapshot[stage]
+            cumulative = 0
+            for bound, n in zip(BUCKETS + ('+Inf',), buckets):
+                cumulative += n
+                lines.append(f'gesture_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'gesture_stage_seconds_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'gesture_stage_seconds_count{{stage="{stage}"}} {count}')
+
+        lines += [f'# HELP gesture_stage_recent_seconds Stage time quantiles over the last {self.window} samples',
+                  '# TYPE gesture_stage_recent_seconds gauge']
+        for stage in stages:
+            for q, value in self.quantiles(stage).items():
+                lines.append(f'gesture_stage_recent_seconds{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+
+        lines += ['# HELP gesture_frames_total Frames that went through inference',
+                  '# TYPE gesture_frames_total counter',
+                  f'gesture_frames_total {frames}',
+                  '# HELP gesture_fps Processed frames per second (rolling)',
+                  '# TYPE gesture_fps gauge',
+                  f'gesture_fps {fps:.2f}']
+        for name, help_text, kind, fn in self.gauges:
+            try:
+                value = float(fn())
+            except Exception:
+                continue
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}', f'{name} {value:g}']
+        return '\n'.join(lines) + '\n'
+
+    def log_line(self):
+        parts = [f"{self.fps():.1f} fps"]
+        with self.lock:
+            stages = list(self.counts)
+        for stage in stages:
+            p50 = self.quantiles(stage).get(0.5)
+            if p50 is not None:
+                parts.append(f"{stage} {p50 * 1000:.1f}")
+        return "[metrics] " + " | ".join(parts) + " ms (p50)"
+
+    def serve(self, port, host='127.0.0.1'):
+        """Serves /metrics on a daemon thread; only to this machine unless `host` says otherwise."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every few seconds would flood the console
+
+        try:
+            self.server = ThreadingHTTPServer((host, port), Handler)
+        except OSError as e:
+            print(f"Error starting metrics endpoint on port {port}: {e}")
+            return
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        print(f"Metrics available at http://{host}:{port}/metrics")
+
+    def start_logging(self, interval=30.0):
+        """Prints log_line() every `interval` seconds on a daemon thread."""
+        def run():
+            while True:
+                time.sleep(interval)
+                print(self.log_line())
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -0,0 +1,62 @@
+import time
+
+import cv2
+
+
+class MotionGate:
+    """Skips hand inference while nothing in front of the camera moves.
+
+    Each frame is shrunk to a tiny blurred grayscale image and compared
+    against a slowly updated background. If too few pixels differ and no hand
+    was seen last time, there is nothing for MediaPipe to find. The first
+    frame that shows motion goes straight to inference. A held-still hand is
+    never gated because a visible hand always passes, and `max_skip` forces a
+    check now and then in case a hand crept in slower than the background
+    adapts.
+    """
+
+    def __init__(self, size=(80, 60), threshold=12, min_area=0.004, alpha=0.05, max_skip=45):
+        self.size = size              # (w, h) of the comparison image
+        self.threshold = threshold    # grey-level change that counts as motion
+        self.min_area = min_area      # share of changed pixels needed to wake up
+        self.alpha = alpha            # background learning rate
+        self.max_skip = max_skip      # consecutive skips before a forced inference
+        self.background = None
+        self.skipped_in_row = 0
+        self.checked = 0
+        self.skipped = 0
+        self.check_time = 0.0
+
+    def moved(self, frame):
+        """True if the frame differs from the background model; updates the model."""
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+        if self.background is None:
+            self.background = gray.astype('float32')
+            return True
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self.background))
+        changed = cv2.countNonZero(cv2.threshold(diff, self.threshold, 255, cv2.THRESH_BINARY)[1])
+        cv2.accumulateWeighted(gray, self.background, self.alpha)
+        return changed >= self.min_area * gray.size
+
+    def should_infer(self, frame, hand_visible):
+        """Call once per frame that would otherwise go to inference."""
+        start = time.perf_counter()
+        moved = self.moved(frame)
+        self.check_time += time.perf_counter() - start
+        self.checked += 1
+
+        if moved or hand_visible or self.skipped_in_row >= self.max_skip:
+            self.skipped_in_row = 0
+            return True
+        self.skipped_in_row += 1
+        self.skipped += 1
+        return False
+
+    def report(self):
+        if not self.checked:
+            return "Motion gate: no frames checked"
+        percent = 100.0 * self.skipped / self.checked
+        return (f"Motion gate: {self.skipped}/{self.checked} inferences saved ({percent:.1f}%), "
+                f"check {self.check_time / self.checked * 1000:.2f} ms/frame")
@@ -0,0 +1,349 @@
+"""Multi-process gesture engine.
+
+Capture, inference, gesture decision and display run in separate processes so
+the pipeline can use every core of the Pi instead of one GIL-bound thread.
+Frames live in a shared-memory ring; the queues between stages only carry
+slot indices and a few landmark numbers.
+
+    python mp_engine.py --workers 2 --preview
+"""
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+STAGES = ('capture', 'inference', 'decision', 'display')
+# Layout of the shared stats array: [frames, avg ms] per stage, then totals
+STAT_DROPPED = 2 * len(STAGES)
+STAT_STALE = STAT_DROPPED + 1
+STAT_LATENCY = STAT_STALE + 1
+STAT_SAVED = STAT_LATENCY + 1
+
+
+class FrameRing:
+    """A fixed number of BGR frame slots in shared memory, addressed by index."""
+
+    def __init__(self, slots, shape, name=None):
+        size = slots * int(np.prod(shape))
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    def info(self):
+        return self.shm.name, self.slots, self.shape
+
+    @classmethod
+    def attach(cls, info):
+        name, slots, shape = info
+        return cls(slots, shape, name=name)
+
+    def close(self):
+        del self.frames
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def record_stat(stats, stage, elapsed, alpha=0.1):
+    """Updates a stage's frame count and moving-average latency (ms)."""
+    i = 2 * STAGES.index(stage)
+    with stats.get_lock():
+        stats[i] += 1
+        ms = elapsed * 1000
+        stats[i + 1] = ms if stats[i] == 1 else stats[i + 1] + alpha * (ms - stats[i + 1])
+
+
+def capture_stage(source, width, height, ring_info, free_q, infer_q, stats, stop):
+    from sources import open_source
+
+    cap = open_source(source, width, height)
+    if not cap.isOpened():
+        print("Error: Camera not initialized. Check connection or permissions.")
+        stop.set()
+        return
+
+    ring = FrameRing.attach(ring_info)
+    frame_id = 0
+    frame = resized = None  # Decode and resize buffers, reused for every frame
+    try:
+        while not stop.is_set():
+            success, frame = cap.read(frame)
+            if not success:
+                print("Error: Failed to capture frame.")
+                stop.set()
+                break
+            captured = time.monotonic()
+            start = time.perf_counter()
+
+            try:
+                slot = free_q.get_nowait()
+            except queue.Empty:  # Every slot is still in flight downstream
+                with stats.get_lock():
+                    stats[STAT_DROPPED] += 1
+                continue
+
+            source_frame = frame
+            if frame.shape[:2] != (height, width):
+                resized = cv2.resize(frame, (width, height), dst=resized)
+                source_frame = resized
+            cv2.flip(source_frame, 1, dst=ring.frames[slot])
+            frame_id += 1
+            infer_q.put((slot, frame_id, captured))
+            record_stat(stats, 'capture', time.perf_counter() - start)
+    finally:
+        print(cap.report())
+        cap.release()
+        ring.close()
+
+
+def inference_stage(ring_info, infer_q, decision_q, free_q, stats, stop, hands_settings, motion_gate):
+    from motion import MotionGate
+    from pipeline import make_hands  # Only inference workers pay for loading the model
+
+    hands = make_hands(**hands_settings)
+    gate = MotionGate() if motion_gate else None
+    hand_visible = False
+    rgb_frame = None
+    ring = FrameRing.attach(ring_info)
+    try:
+        while not stop.is_set():
+            try:
+                item = infer_q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            # Always work on the newest frame; hand stale slots straight back
+            while True:
+                try:
+                    newer = infer_q.get_nowait()
+                except queue.Empty:
+                    break
+                free_q.put(item[0])
+                with stats.get_lock():
+                    stats[STAT_STALE] += 1
+                item = newer
+
+            slot, frame_id, captured = item
+            if gate is not None and not gate.should_infer(ring.frames[slot], hand_visible):
+                # Static scene with no hand: pass an empty result on so the slot still reaches display
+                decision_q.put((slot, frame_id, captured, []))
+                with stats.get_lock():
+                    stats[STAT_SAVED] += 1
+                continue
+
+            start = time.perf_counter()
+            rgb_frame = cv2.cvtColor(ring.frames[slot], cv2.COLOR_BGR2RGB, dst=rgb_frame)
+            result = hands.process(rgb_frame)
+
+            detected = []
+            if result.multi_hand_landmarks:
+                for handlm, handedness in zip(result.multi_hand_landmarks, result.multi_handedness):
+                    label = handedness.classification[0].label
+                    points = [(lm.x, lm.y, lm.z) for lm in handlm.landmark]
+                    detected.append((label, points))
+            hand_visible = bool(detected)
+            decision_q.put((slot, frame_id, captured, detected))
+            record_stat(stats, 'inference', time.perf_counter() - start)
+    finally:
+        hands.close()
+        ring.close()
+
+
+def decision_stage(width, height, decision_q, display_q, event_q, stats, stop):
+    from gestures import GestureRecognizer, SlideGate
+
+    recognizer = GestureRecognizer()
+    slides = SlideGate(window=recognizer.swipe.window)
+    last_frame = 0
+    while not stop.is_set():
+        try:
+            slot, frame_id, captured, detected = decision_q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+
+        start = time.perf_counter()
+        events = []
+        # With several inference workers results can arrive out of order; never act on an older frame
+        if frame_id > last_frame:
+            last_frame = frame_id
+            right = [points for label, points in detected if label == "Right"]
+            if not right:
+                recognizer.reset()
+                slides.reset()
+            for points in right:
+                points = np.array(points, dtype=np.float32) * (width, height, width)
+                gesture = recognizer.update(points, captured)
+                x_index = points[8, 0]
+                zone = 'left' if x_index < width * 0.3 else 'right' if x_index > width * 0.7 else None
+                if gesture == 'pinch':
+                    events.append('record')
+                else:
+                    action = slides.update(gesture, zone, captured)
+                    if action is not None:
+                        events.append(action)
+            for event in events:
+                event_q.put((event, captured))
+
+        display_q.put((slot, captured, detected, events))
+        record_stat(stats, 'decision', time.perf_counter() - start)
+
+
+def display_stage(ring_info, display_q, free_q, stats, stop, preview):
+    ring = FrameRing.attach(ring_info)
+    try:
+        while not stop.is_set():
+            try:
+                slot, captured, detected, events = display_q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            start = time.perf_counter()
+            if preview:
+                frame = ring.frames[slot]
+                h, w = frame.shape[:2]
+                for label, points in detected:
+                    for index in (4, 8):
+                        cx, cy = int(points[index][0] * w), int(points[index][1] * h)
+                        cv2.circle(frame, (cx, cy), 10, (0, 255, 0), -1)
+                if events:
+                    cv2.putText(frame, ', '.join(events), (10, 30),
+                                cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
+                cv2.imshow("Hand Frame", frame)
+                if cv2.waitKey(1) == 27:  # Press Esc to exit
+                    stop.set()
+            free_q.put(slot)
+
+            record_stat(stats, 'display', time.perf_counter() - start)
+            latency = (time.monotonic() - captured) * 1000
+            with stats.get_lock():
+                stats[STAT_LATENCY] += 0.1 * (latency - stats[STAT_LATENCY])
+    finally:
+        if preview:
+            cv2.destroyAllWindows()
+        ring.close()
+
+
+def queue_depth(q):
+    try:
+        return q.qsize()
+    except NotImplementedError:  # macOS
+        return -1
+
+
+def run_engine(on_event, source=0, width=320, height=240, workers=1, slots=8,
+               preview=False, hands_settings=None, motion_gate=True, report_every=5.0):
+    """Runs the pipeline until Esc/Ctrl-C, calling on_event(name) for each gesture."""
+    ring = FrameRing(slots, (height, width, 3))
+    free_q = mp.Queue()
+    for slot in range(slots):
+        free_q.put(slot)
+    infer_q, decision_q, display_q, event_q = mp.Queue(), mp.Queue(), mp.Queue(), mp.Queue()
+    stats = mp.Array('d', STAT_SAVED + 1)
+    stop = mp.Event()
+
+    processes = [
+        mp.Process(target=capture_stage, name='capture',
+                   args=(source, width, height, ring.info(), free_q, infer_q, stats, stop)),
+        mp.Process(target=decision_stage, name='decision',
+                   args=(width, height, decision_q, display_q, event_q, stats, stop)),
+        mp.Process(target=display_stage, name='display',
+                   args=(ring.info(), display_q, free_q, stats, stop, preview)),
+    ]
+    for i in range(workers):
+        processes.append(mp.Process(target=inference_stage, name=f'inference-{i}',
+                                    args=(ring.info(), infer_q, decision_q, free_q, stats, stop,
+                                          hands_settings or {}, motion_gate)))
+    for process in processes:
+        process.daemon = True
+        process.start()
+    print(f"Engine started: {workers} inference worker(s), {slots} frame slots")
+
+    queues = {'capture': free_q, 'inference': infer_q, 'decision': decision_q, 'display': display_q}
+    last_report = time.monotonic()
+    try:
+        while not stop.is_set():
+            try:
+                event, captured = event_q.get(timeout=0.1)
+                on_event(event)
+            except queue.Empty:
+                pass
+
+            if time.monotonic() - last_report >= report_every:
+                last_report = time.monotonic()
+                print(report(stats, queues))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        for process in processes:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+        print(report(stats, queues))
+        ring.close()
+
+
+def report(stats, queues):
+    with stats.get_lock():
+        values = list(stats)
+    parts = []
+    for i, stage in enumerate(STAGES):
+        # The capture "queue" is the pool of free slots; the others are backlog
+        label = 'free' if stage == 'capture' else 'q'
+        parts.append(f"{stage} {values[2 * i + 1]:.1f} ms {label}={queue_depth(queues[stage])}")
+    return (' | '.join(parts) + f" | e2e {values[STAT_LATENCY]:.0f} ms, "
+            f"{int(values[0])} frames, {int(values[STAT_DROPPED])} dropped, "
+            f"{int(values[STAT_STALE])} stale, {int(values[STAT_SAVED])} inferences saved")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process hand gesture engine")
+    parser.add_argument('--source', default='0',
+                        help="camera index or /dev/videoN, a video file, an image folder or synthetic")
+    parser.add_argument('--width', type=int, help="default: tuning profile, else 320")
+    parser.add_argument('--height', type=int, help="default: tuning profile, else 240")
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 1) - 3),
+                        help="inference processes (default: cores left after the other stages)")
+    parser.add_argument('--slots', type=int, default=8, help="frames in the shared-memory ring")
+    parser.add_argument('--preview', action='store_true', help="show the camera window")
+    parser.add_argument('--profile', help="tuning profile from autotune.py")
+    parser.add_argument('--no-motion-gate', action='store_true',
+                        help="run inference even when nothing in view moves")
+    parser.add_argument('--record-screen', action='store_true', help="pinch toggles a screen recording (screen-<time>.avi)")
+    args = parser.parse_args()
+    source = int(args.source) if args.source.isdigit() else args.source
+
+    from config import hands_options, load_profile
+
+    settings = load_profile(args.profile, defaults={
+        'width': 320, 'height': 240, 'model_complexity': 1,
+        'min_detection_confidence': 0.75, 'min_tracking_confidence': 0.75,
+    })
+
+    from keyboard_server import GestureServer
+    from screenrec import BackgroundRecording
+
+    server = GestureServer(BackgroundRecording() if args.record_screen else None)
+
+    try:
+        run_engine(server.post, source=source, width=args.width or settings['width'],
+                   height=args.height or settings['height'], workers=args.workers, slots=args.slots,
+                   preview=args.preview, hands_settings=hands_options(settings),
+                   motion_gate=not args.no_motion_gate)
+    finally:
+        server.stop()
+        print(server.report())
+
+
+if __name__ == "__main__":
+    main()
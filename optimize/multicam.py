@@ -0,0 +1,201 @@
+"""Gesture control from several cameras with one shared hand model.
+
+Every camera gets its own capture thread, ROI tracker, motion gate and
+gesture recognizer, but they all share a single MediaPipe Hands graph, so
+adding a camera costs no extra model memory. One loop picks the camera that
+has waited longest for inference among those with a fresh frame. It keeps
+the share of wall time spent in inference under --budget. The gestures from
+all cameras are merged into one event stream, and one gesture seen by two
+cameras at once fires only once.
+
+    python multicam.py lectern=0 wide=/dev/video2 --budget 0.8
+"""
+import argparse
+import threading
+import time
+
+from capture import FrameGrabber
+from config import hands_options, load_profile
+from motion import MotionGate
+from pipeline import GesturePipeline, make_hands
+from sources import open_source
+
+
+class CameraFeed:
+    """One camera and the per-camera state of the pipeline."""
+
+    def __init__(self, name, source, hands, width, height, **pipeline_options):
+        self.name = name
+        self.cap = open_source(source, width, height)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Camera {name} ({source}) not initialized. Check connection or permissions.")
+        self.grabber = FrameGrabber(self.cap).start()
+        self.pipeline = GesturePipeline(hands, motion_gate=MotionGate(), **pipeline_options)
+        self.last_served = 0.0
+        self.inferences = 0
+        self.busy = 0.0
+        self.events = 0
+
+    def report(self):
+        avg = self.busy / self.inferences * 1000 if self.inferences else 0.0
+        return (f"[{self.name}] {self.inferences} frames processed ({avg:.1f} ms avg), "
+                f"{self.events} event(s); {self.cap.report()}; {self.grabber.report()}; "
+                + self.pipeline.report().replace('\n', '; '))
+
+    def close(self):
+        self.grabber.stop()
+        self.cap.release()
+
+
+class MultiCameraEngine:
+    """Shares one Hands graph between cameras and merges their gestures.
+
+    MediaPipe's video mode tracks one stream, so the shared graph runs in
+    static image mode. Each feed's HandRoiTracker keeps the hand crop for its
+    own camera, which is what keeps per-frame cost low between detections.
+    """
+
+    def __init__(self, sources, hands_settings=None, width=320, height=240, budget=0.8,
+                 merge_window=0.5, **pipeline_options):
+        self.hands = make_hands(static_image_mode=True, **(hands_settings or {}))
+        self.feeds = [CameraFeed(name, source, self.hands, width, height, **pipeline_options)
+                      for name, source in sources]
+        self.budget = budget              # max share of wall time spent in inference
+        self.merge_window = merge_window  # same action from another camera within this is a duplicate
+        self.stopped = []                 # feeds whose camera failed, kept for the report
+        self.last_event = {}              # action -> (time, camera)
+        self.duplicates = 0
+        self.started = None
+        self.busy = 0.0
+        self.running = False
+
+    def next_feed(self):
+        """The camera with a fresh frame that was served least recently."""
+        ready = [feed for feed in self.feeds if feed.grabber.ready()]
+        return min(ready, key=lambda feed: feed.last_served) if ready else None
+
+    def merge(self, feed, action, now):
+        """True if this is a new event rather than another camera's view of the last one."""
+        last = self.last_event.get(action)
+        if last is not None and last[1] != feed.name and now - last[0] < self.merge_window:
+            self.duplicates += 1
+            return False
+        self.last_event[action] = (now, feed.name)
+        return True
+
+    def run(self, on_event):
+        """Processes frames until stop(); on_event(action, camera) gets the merged stream."""
+        self.running = True
+        self.started = time.monotonic()
+        next_allowed = 0.0
+        try:
+            while self.running and self.feeds:
+                wait = next_allowed - time.monotonic()
+                if wait > 0:  # Over budget: give the CPU back before the next inference
+                    time.sleep(wait)
+
+                feed = self.next_feed()
+                if feed is None:
+                    for failed in [f for f in self.feeds if f.grabber.failed]:
+                        print(f"Camera {failed.name} stopped delivering frames")
+                        failed.close()
+                        self.feeds.remove(failed)
+                        self.stopped.append(failed)
+                    time.sleep(0.002)
+                    continue
+
+                success, frame = feed.grabber.read(timeout=0)
+                if not success:
+                    continue
+                feed.last_served = time.monotonic()
+                start = time.perf_counter()
+                out = feed.pipeline.process(frame, feed.last_served)
+                elapsed = time.perf_counter() - start
+                feed.inferences += 1
+                feed.busy += elapsed
+                self.busy += elapsed
+                # Idle long enough afterwards that busy / wall stays at the budget
+                next_allowed = time.monotonic() + elapsed * (1.0 / self.budget - 1.0)
+
+                if out.action is not None and self.merge(feed, out.action, feed.last_served):
+                    feed.events += 1
+                    on_event(out.action, feed.name)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.running = False
+
+    def stop(self):
+        self.running = False
+
+    def report(self):
+        wall = time.monotonic() - self.started if self.started else 0.0
+        load = self.busy / wall if wall else 0.0
+        lines = [feed.report() for feed in self.feeds + self.stopped]
+        lines.append(f"Multi-camera: inference load {load:.0%} of budget {self.budget:.0%}, "
+                     f"{self.duplicates} duplicate event(s) merged")
+        return '\n'.join(lines)
+
+    def close(self):
+        for feed in self.feeds:
+            feed.close()
+        self.hands.close()
+
+
+def parse_source(text, index):
+    """'name=source' or just 'source'; numeric sources are camera indices."""
+    name, sep, source = text.partition('=')
+    if not sep:
+        name, source = f"cam{index}", text
+    return name, int(source) if source.isdigit() else source
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hand gesture slide control from several cameras")
+    parser.add_argument('sources', nargs='+', help="cameras as name=source, e.g. lectern=0 wide=/dev/video2")
+    parser.add_argument('--budget', type=float, default=0.8,
+                        help="share of one core inference may use (0.8 = 80%%)")
+    parser.add_argument('--profile', help="tuning profile from autotune.py")
+    parser.add_argument('--report-every', type=float, default=30.0, help="seconds between reports (0 disables)")
+    parser.add_argument('--record-screen', action='store_true', help="pinch toggles a screen recording (screen-<time>.avi)")
+    args = parser.parse_args()
+
+    settings = load_profile(args.profile, defaults={
+        'width': 320, 'height': 240, 'model_complexity': 1,
+        'min_detection_confidence': 0.75, 'min_tracking_confidence': 0.75,
+    })
+
+    from keyboard_server import GestureServer
+    from screenrec import BackgroundRecording
+
+    server = GestureServer(BackgroundRecording() if args.record_screen else None)
+
+    engine = MultiCameraEngine([parse_source(s, i) for i, s in enumerate(args.sources)],
+                               hands_settings=hands_options(settings), width=settings['width'],
+                               height=settings['height'], budget=args.budget)
+
+    def on_event(action, camera):
+        print(f"{action} from {camera}")
+        server.post(action)
+
+    if args.report_every:
+        def log_reports():
+            while engine.running or engine.started is None:
+                time.sleep(args.report_every)
+                print(engine.report())
+
+        thread = threading.Thread(target=log_reports)
+        thread.daemon = True
+        thread.start()
+
+    try:
+        engine.run(on_event)
+    finally:
+        print(engine.report())
+        engine.close()
+        server.stop()
+        print(server.report())
+
+
+if __name__ == "__main__":
+    main()
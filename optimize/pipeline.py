@@ -0,0 +1,211 @@
+import time
+
+import cv2
+import numpy as np
+
+from gestures import GestureRecognizer, SlideGate, landmarks_to_array
+from roi import HandRoiTracker
+
+
+def make_hands(model_complexity=1, min_detection_confidence=0.75, min_tracking_confidence=0.75,
+               max_num_hands=1, static_image_mode=False, backend='legacy', model_path=None, dynamic=False):
+    """Legacy blocking Hands, or with backend='live' the asynchronous Tasks HandLandmarker.
+
+    dynamic=True with model_complexity 1 tracks with the light model and only
+    falls back to the full one to find the hand again (see complexity.py).
+    """
+    if backend == 'live':
+        from handtasks import LiveStreamHands
+
+        return LiveStreamHands(model_path, max_num_hands, min_detection_confidence, min_tracking_confidence)
+    if dynamic and model_complexity == 1 and not static_image_mode:
+        from complexity import ComplexitySwitcher
+
+        options = dict(min_detection_confidence=min_detection_confidence,
+                       min_tracking_confidence=min_tracking_confidence, max_num_hands=max_num_hands)
+        return ComplexitySwitcher(make_hands(model_complexity=0, **options),
+                                  make_hands(model_complexity=1, **options))
+
+    import mediapipe as mp
+
+    return mp.solutions.hands.Hands(
+        static_image_mode=static_image_mode,
+        max_num_hands=max_num_hands,
+        min_detection_confidence=min_detection_confidence,
+        min_tracking_confidence=min_tracking_confidence,
+        model_complexity=model_complexity
+    )
+
+
+class FrameResult:
+    """What the pipeline made of one camera frame."""
+
+    def __init__(self, frame):
+        self.frame = frame    # Mirrored BGR frame, safe to draw on
+        self.hands = []       # (label, (21, 3) landmark array in pixels)
+        self.gesture = None   # Gesture of the controlling (right) hand
+        self.action = None    # 'left', 'right', 'record' or None
+        self.thumb = None     # Thumb tip (x, y) of the controlling hand
+        self.index = None     # Index tip (x, y) of the controlling hand
+        self.screen = None    # Index tip in projector pixels, when calibrated
+        self.screen_size = None  # (w, h) of those projector pixels
+
+
+class GesturePipeline:
+    """Frame -> landmarks -> gesture -> action, shared by the live scripts and offline tools.
+
+    The caller owns capture, display and what to do with the action. The
+    duration of every stage of the last frame is left in self.timings
+    (seconds). With a FramePool the mirrored frame in FrameResult.frame is a
+    pooled buffer the caller must release; the RGB and resize buffers are
+    reused internally either way. With a Calibration, inference only looks at
+    the area around the projected screen and the slide zones are measured on
+    the screen instead of the camera image. With a LandmarkLog, the hands
+    and decisions of every processed frame are kept for offline replay.
+    flip=False is for footage that is already mirrored, like CameraRecorder
+    output; flipping it again would swap the hands' Left/Right labels.
+    """
+
+    def __init__(self, hands, scheduler=None, roi_tracking=True, left_zone=0.3, right_zone=0.7,
+                 motion_gate=None, pool=None, calibration=None, log=None, flip=True):
+        self.tracker = HandRoiTracker(hands, enabled=roi_tracking)
+        self.scheduler = scheduler  # None: process every frame at full size
+        self.motion_gate = motion_gate  # None: never skip inference on static scenes
+        self.hand_visible = False
+        self.recognizer = GestureRecognizer()
+        self.slides = SlideGate(window=self.recognizer.swipe.window)
+        self.left_zone = left_zone
+        self.right_zone = right_zone
+        self.pool = pool
+        self.flip = flip
+        self.calibration = calibration
+        self.mapping = None  # Calibration for the current (mirrored) frame size
+        self.log = log  # LandmarkLog: every processed frame's hands and decisions are appended
+        self.rgb = None  # Conversion buffer, reused while the input size stays the same
+        self.timings = {}
+
+    def should_process(self):
+        """Call once per captured frame; False means skip inference for it."""
+        if self.scheduler is None:
+            return True
+        self.scheduler.tick()
+        return self.scheduler.should_process()
+
+    def process(self, frame, timestamp=None):
+        if timestamp is None:
+            timestamp = time.monotonic()
+        timings = self.timings = {}
+
+        start = time.perf_counter()
+        frame = self.mirror(frame)
+        flipped = time.perf_counter()
+        timings['flip'] = flipped - start
+
+        if self.motion_gate is not None:
+            infer = self.motion_gate.should_infer(frame, self.hand_visible)
+            gated = time.perf_counter()
+            timings['motion'] = gated - flipped
+            if not infer:  # Static scene with no hand: nothing MediaPipe could find
+                self.recognizer.reset()
+                out = FrameResult(frame)
+                if self.log is not None:
+                    self.log.append(timestamp, out)
+                return out
+            flipped = gated
+
+        if self.calibration is not None:
+            self.map_frame(frame.shape[1], frame.shape[0])
+        small = self.scheduler.prepare(frame) if self.scheduler is not None else frame
+        if self.rgb is None or self.rgb.shape != small.shape:
+            self.rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+        else:
+            cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=self.rgb)
+        rgb_frame = self.rgb
+        converted = time.perf_counter()
+        timings['convert'] = converted - flipped
+
+        result = self.tracker.process(rgb_frame, timestamp)
+        inferred = time.perf_counter()
+        timings['inference'] = inferred - converted
+        if self.scheduler is not None:
+            self.scheduler.record(inferred - flipped)
+
+        out = FrameResult(frame)
+        if getattr(result, 'timestamp', None) is not None:
+            timestamp = result.timestamp  # Asynchronous backends answer for an earlier frame
+        self.decide(out, result, timestamp)
+        self.hand_visible = bool(out.hands)
+        if self.log is not None:
+            self.log.append(timestamp, out)
+        timings['decision'] = time.perf_counter() - inferred
+        return out
+
+    def mirror(self, frame):
+        """Flipped copy of a camera frame, in a pooled buffer if there is a pool."""
+        if not self.flip:  # Already mirrored: the frame itself, or a pooled copy the caller releases
+            if self.pool is None:
+                return frame
+            buf = self.pool.acquire(frame.shape)
+            np.copyto(buf, frame)
+            return buf
+        if self.pool is None:
+            return cv2.flip(frame, 1)
+        return cv2.flip(frame, 1, dst=self.pool.acquire(frame.shape))
+
+    def set_calibration(self, calibration):
+        """Swaps in a new calibration, e.g. after the camera was bumped."""
+        self.calibration = calibration
+        self.mapping = None
+        if self.log is not None:
+            self.log.calibration = calibration.to_dict()  # Replays use the latest screen position
+        self.tracker.bounds = None
+        self.tracker.roi = None
+
+    def map_frame(self, w, h):
+        """Scales the calibration to this frame size once and limits the hand search to the screen."""
+        if self.mapping is None or self.mapping.frame_size != (w, h):
+            self.mapping = self.calibration.for_frame(w, h, mirror=True)
+            self.tracker.bounds = self.mapping.bbox()
+
+    def decide(self, out, result, timestamp):
+        h, w = out.frame.shape[:2]
+        if result.multi_hand_landmarks:
+            for handlm, handedness in zip(result.multi_hand_landmarks, result.multi_handedness):
+                out.hands.append((handedness.classification[0].label, landmarks_to_array(handlm, w, h)))
+        self.decide_hands(out, w, timestamp)
+
+    def decide_hands(self, out, w, timestamp):
+        """Gesture and action from out.hands; also used to replay landmark logs without a frame."""
+        right = [points for label, points in out.hands if label == "Right"]
+        if not right:
+            self.recognizer.reset()
+            self.slides.reset()
+            return
+
+        points = right[0]
+        out.gesture = self.recognizer.update(points, timestamp)
+        out.thumb = (int(points[4, 0]), int(points[4, 1]))
+        out.index = (int(points[8, 0]), int(points[8, 1]))
+
+        position = out.index[0] / float(w)
+        if self.mapping is not None:
+            out.screen = tuple(float(v) for v in self.mapping.to_screen(points[8, :2]))
+            out.screen_size = self.mapping.screen_size
+            position = out.screen[0] / self.mapping.screen_size[0]
+
+        # Pinch toggles recording, swipes and pointing at the edges change slides
+        zone = 'left' if position < self.left_zone else 'right' if position > self.right_zone else None
+        if out.gesture == 'pinch':
+            out.action = 'record'
+        else:
+            out.action = self.slides.update(out.gesture, zone, timestamp)
+
+    def report(self):
+        lines = [self.tracker.report()]
+        if hasattr(self.tracker.hands, 'report'):  # Live-stream and switching backends keep their own counters
+            lines.append(self.tracker.hands.report())
+        if self.scheduler is not None:
+            lines.append(self.scheduler.report())
+        if self.motion_gate is not None:
+            lines.append(self.motion_gate.report())
+        return '\n'.join(lines)
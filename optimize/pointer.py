@@ -0,0 +1,172 @@
+"""Virtual pointer: the index fingertip drives the OS cursor, a pinch clicks.
+
+Fingertip positions are smoothed with a One Euro filter, which is steady
+when the hand rests and follows fast moves without lag. Cursor injection
+runs on its own thread and only ever injects the newest position. If the
+injector is slower than the camera, older positions are dropped (counted as
+coalesced) instead of queueing up behind it.
+"""
+import math
+import threading
+import time
+
+import numpy as np
+
+
+class OneEuroFilter:
+    """One Euro filter (Casiez et al. 2012) for an n-dimensional point."""
+
+    def __init__(self, min_cutoff=1.0, beta=0.05, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff  # Hz; lower = less jitter at rest
+        self.beta = beta              # speed coefficient; higher = less lag when moving
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.speed = None
+        self.last_time = None
+
+    @staticmethod
+    def alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, value, timestamp):
+        value = np.asarray(value, dtype=np.float64)
+        if self.value is None or timestamp <= self.last_time:
+            self.value, self.speed, self.last_time = value, np.zeros_like(value), timestamp
+            return value
+        dt = timestamp - self.last_time
+        self.last_time = timestamp
+
+        speed = (value - self.value) / dt
+        a_d = self.alpha(self.d_cutoff, dt)
+        self.speed = self.speed + a_d * (speed - self.speed)
+        cutoff = self.min_cutoff + self.beta * np.linalg.norm(self.speed)
+        a = self.alpha(cutoff, dt)
+        self.value = self.value + a * (value - self.value)
+        return self.value
+
+
+class PointerController:
+    """Turns FrameResults into cursor moves and clicks.
+
+    `move(x, y)`, `press()` and `release()` inject into the OS, e.g. the
+    methods of an inject.Injector.
+
+    Positions are normalized (0-1) on the projected screen when the pipeline
+    is calibrated. Otherwise the central `margin`-trimmed part of the camera
+    image is stretched over the screen, so the edges can be reached without
+    leaving the frame.
+    """
+
+    def __init__(self, move, press, release, screen_size, min_cutoff=1.0, beta=0.05, margin=0.1):
+        self.move = move
+        self.press = press
+        self.release = release
+        self.screen_size = screen_size  # OS screen in pixels
+        self.margin = margin
+        self.filter = OneEuroFilter(min_cutoff, beta)
+        self.lock = threading.Condition()
+        self.target = None     # (x, y, captured) waiting to be injected
+        self.buttons = []      # (down, captured) edges waiting to be injected
+        self.pressed = False   # Button state as requested by the hand
+        self.running = False
+        self.thread = None
+
+        self.updates = 0
+        self.moves = 0
+        self.coalesced = 0
+        self.clicks = 0
+        self.latencies = []
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def feed(self, out, captured):
+        """Call for every processed frame with its capture time (time.monotonic())."""
+        if out.index is None:  # No controlling hand: let go of the button and forget the motion
+            self.filter.reset()
+            self.set_button(False, captured)
+            return
+
+        if out.screen is not None:
+            nx, ny = out.screen[0] / out.screen_size[0], out.screen[1] / out.screen_size[1]
+        else:
+            h, w = out.frame.shape[:2]
+            span = 1.0 - 2 * self.margin
+            nx = (out.index[0] / float(w) - self.margin) / span
+            ny = (out.index[1] / float(h) - self.margin) / span
+
+        x, y = self.filter((min(max(nx, 0.0), 1.0), min(max(ny, 0.0), 1.0)), captured)
+        sw, sh = self.screen_size
+        with self.lock:
+            if self.target is not None:
+                self.coalesced += 1  # The injector hasn't caught up; the older position is dropped
+            self.target = (int(x * (sw - 1)), int(y * (sh - 1)), captured)
+            self.updates += 1
+            self.lock.notify()
+        self.set_button(out.gesture == 'pinch', captured)
+
+    def set_button(self, down, captured):
+        with self.lock:
+            if down != self.pressed:
+                self.pressed = down
+                self.buttons.append((down, captured))
+                self.lock.notify()
+
+    def run(self):
+        """Injector thread: newest position first, then any button changes."""
+        while self.running:
+            with self.lock:
+                self.lock.wait_for(lambda: self.target is not None or self.buttons or not self.running)
+                target, self.target = self.target, None
+                buttons, self.buttons = self.buttons, []
+
+            try:
+                if target is not None:
+                    x, y, captured = target
+                    self.move(x, y)
+                    self.moves += 1
+                    self.latencies.append(time.monotonic() - captured)
+                    if len(self.latencies) > 1000:
+                        del self.latencies[:500]
+                for down, _ in buttons:
+                    if down:
+                        self.press()
+                        self.clicks += 1
+                    else:
+                        self.release()
+            except Exception as e:
+                print(f"Pointer injection failed: {e}")
+
+    def latency(self):
+        """(p50, p95) input-to-cursor latency in ms over recent moves."""
+        if not self.latencies:
+            return None, None
+        p50, p95 = np.percentile(np.asarray(self.latencies) * 1000, [50, 95])
+        return float(p50), float(p95)
+
+    def report(self):
+        p50, p95 = self.latency()
+        latency = f"latency p50 {p50:.1f} ms, p95 {p95:.1f} ms" if p50 is not None else "no moves"
+        return (f"Pointer: {self.updates} positions, {self.moves} injected, {self.coalesced} coalesced, "
+                f"{self.clicks} click(s); {latency}")
+
+    def stop(self):
+        self.running = False
+        with self.lock:
+            self.lock.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=1)
+            self.thread = None
+        if self.pressed:
+            try:
+                self.release()
+            except Exception:
+                pass
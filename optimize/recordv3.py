@@ -10,11 +10,13 @@ import os
 from moviepy.editor import VideoFileClip, AudioFileClip, concatenate_videoclips
 
 class CameraRecorder:
-    def __init__(self):
+    def __init__(self, pool=None):
+        self.pool = pool  # FramePool: queue pooled frames by reference instead of copying
         self.frame_queue = queue.Queue(maxsize=300)  # Buffer for ~10 seconds at 30fps
         self.audio_queue = queue.Queue()
         self.is_recording = False
         self.is_running = True
+        self.state_lock = threading.Lock()  # No frame is queued once stop_recording has begun
         self.writer = None
         self.recording_thread = None
         self.audio_thread = None
@@ -127,22 +129,30 @@ class CameraRecorder:
             self.recording_thread.start()
     
     def process_frames(self):
-        while self.is_recording and self.is_running:
-            if not self.frame_queue.empty():
-                frame = self.frame_queue.get()
-                if self.writer is not None:
-                    self.writer.write(frame)
-            else:
-                time.sleep(0.001)
+        """Writes queued frames until recording has stopped and the queue is empty"""
+        while self.is_running:
+            try:
+                frame = self.frame_queue.get(timeout=0.05)
+            except queue.Empty:
+                if not self.is_recording:
+                    break
+                continue
+            if self.writer is not None:
+                self.writer.write(frame)
+            if self.pool is not None:
+                self.pool.release(frame)
     
     def stop_recording(self):
-        if self.is_recording:
-            print("Stopping recording...")
+        with self.state_lock:
+            stopping = self.is_recording
             self.is_recording = False
+        if stopping:
+            print("Stopping recording...")
             
-            # Wait for remaining frames
-            while not self.frame_queue.empty():
-                time.sleep(0.1)
+            # The writer thread finishes the frames already queued, then exits
+            if self.recording_thread is not None:
+                self.recording_thread.join()
+                self.recording_thread = None
             
             # Stop and save video
             if self.writer is not None:
@@ -168,21 +178,31 @@ class CameraRecorder:
                 self.final_filename
             )
             print(f"Recording saved as: {self.final_filename}")
-            
-            if self.recording_thread is not None:
-                self.recording_thread.join()
-                self.recording_thread = None
+
+            # Left over only when cleanup() stopped the writer early
+            while not self.frame_queue.empty():
+                frame = self.frame_queue.get_nowait()
+                if self.pool is not None:
+                    self.pool.release(frame)
     
     def add_frame(self, frame):
-        if self.is_recording:
+        with self.state_lock:
+            if not self.is_recording:
+                return
             # Add recording indicator
             cv2.circle(frame, (30, 30), 10, (0, 0, 255), -1)
             cv2.putText(frame, "REC", (50, 40), cv2.FONT_HERSHEY_SIMPLEX, 
                       1, (0, 0, 255), 2)
             
             if self.frame_queue.full():
-                self.frame_queue.get()
-            self.frame_queue.put(frame.copy())
+                dropped = self.frame_queue.get()
+                if self.pool is not None:
+                    self.pool.release(dropped)
+            # A pooled frame stays valid until the writer releases it; anything else may be reused by the caller
+            if self.pool is not None and self.pool.owns(frame):
+                self.frame_queue.put(self.pool.retain(frame))
+            else:
+                self.frame_queue.put(frame.copy())
     
     def cleanup(self):
         self.is_running = False
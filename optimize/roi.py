@@ -0,0 +1,104 @@
+import numpy as np
+
+
+class HandRoiTracker:
+    """Runs MediaPipe Hands on a padded crop around the last known hand.
+
+    While the hand is tracked only the crop is processed, and the landmarks
+    are mapped back to full-frame coordinates in place, so callers see the
+    same result object as from Hands.process(). When the hand is lost in the
+    crop the same frame is retried on the full image, or only on `bounds`
+    (normalized x0, y0, x1, y1) when the hand can only appear there, e.g.
+    around the calibrated projector screen.
+
+    Asynchronous backends (handtasks.LiveStreamHands) return results for
+    an earlier frame, so with them the moving crop is switched off and only
+    the fixed `bounds` are used.
+    """
+
+    def __init__(self, hands, enabled=True, padding=0.6, min_size=0.25, bounds=None):
+        self.hands = hands
+        self.live = getattr(hands, 'live', False)
+        self.enabled = enabled and not self.live
+        self.bounds = bounds
+        self.padding = padding    # extra margin around the landmark box, relative to its size
+        self.min_size = min_size  # smallest crop side, relative to the frame's shorter side
+        self.roi = None           # normalized (x0, y0, x1, y1) of the current crop
+        self.crop_runs = 0
+        self.full_runs = 0
+        self.lost = 0
+        self.crop_area = 0.0
+        self.full_area = 0.0
+
+    def infer(self, image, timestamp):
+        return self.hands.process(image, timestamp) if self.live else self.hands.process(image)
+
+    def process(self, rgb, timestamp=None):
+        h, w = rgb.shape[:2]
+        if self.enabled and self.roi is not None:
+            x0, y0 = int(self.roi[0] * w), int(self.roi[1] * h)
+            x1, y1 = int(self.roi[2] * w), int(self.roi[3] * h)
+            crop = np.ascontiguousarray(rgb[y0:y1, x0:x1])
+            result = self.infer(crop, timestamp)
+            self.crop_runs += 1
+            self.crop_area += (x1 - x0) * (y1 - y0) / float(w * h)
+            if result.multi_hand_landmarks:
+                self.to_full_frame(result, x0, y0, x1 - x0, y1 - y0, w, h)
+                self.update_roi(result, w, h)
+                return result
+            self.lost += 1
+            self.roi = None  # Hand left the crop, fall back to the whole frame
+
+        if self.bounds is not None:
+            x0, y0 = int(self.bounds[0] * w), int(self.bounds[1] * h)
+            x1, y1 = int(self.bounds[2] * w), int(self.bounds[3] * h)
+            result = self.infer(np.ascontiguousarray(rgb[y0:y1, x0:x1]), timestamp)
+            self.full_area += (x1 - x0) * (y1 - y0) / float(w * h)
+            if result.multi_hand_landmarks:
+                self.to_full_frame(result, x0, y0, x1 - x0, y1 - y0, w, h)
+        else:
+            result = self.infer(rgb, timestamp)
+            self.full_area += 1.0
+        self.full_runs += 1
+        if self.enabled and result.multi_hand_landmarks:
+            self.update_roi(result, w, h)
+        return result
+
+    def to_full_frame(self, result, x0, y0, crop_w, crop_h, w, h):
+        for handlm in result.multi_hand_landmarks:
+            for lm in handlm.landmark:
+                lm.x = (x0 + lm.x * crop_w) / w
+                lm.y = (y0 + lm.y * crop_h) / h
+                lm.z = lm.z * crop_w / w
+
+    def update_roi(self, result, w, h):
+        xs = [lm.x * w for handlm in result.multi_hand_landmarks for lm in handlm.landmark]
+        ys = [lm.y * h for handlm in result.multi_hand_landmarks for lm in handlm.landmark]
+        bx0, bx1, by0, by1 = min(xs), max(xs), min(ys), max(ys)
+
+        # Keep the current crop while the hand stays well inside it; a steady crop
+        # keeps MediaPipe's own tracking in consistent coordinates.
+        if self.roi is not None:
+            rx0, ry0, rx1, ry1 = self.roi[0] * w, self.roi[1] * h, self.roi[2] * w, self.roi[3] * h
+            margin = 0.1 * (rx1 - rx0)
+            if bx0 > rx0 + margin and bx1 < rx1 - margin and by0 > ry0 + margin and by1 < ry1 - margin:
+                return
+
+        # Square crop so MediaPipe sees an undistorted hand
+        side = max(bx1 - bx0, by1 - by0) * (1 + 2 * self.padding)
+        side = min(max(side, self.min_size * min(w, h)), min(w, h))
+        cx, cy = (bx0 + bx1) / 2, (by0 + by1) / 2
+        x0 = min(max(cx - side / 2, 0), w - side)
+        y0 = min(max(cy - side / 2, 0), h - side)
+        self.roi = (x0 / w, y0 / h, (x0 + side) / w, (y0 + side) / h)
+
+    def report(self):
+        runs = self.crop_runs + self.full_runs
+        if not runs:
+            return "ROI: no frames processed"
+        area = 100.0 * self.crop_area / self.crop_runs if self.crop_runs else 0.0
+        text = (f"ROI: {self.crop_runs}/{runs} inferences on crop "
+                f"(avg {area:.0f}% of frame), hand lost {self.lost} time(s)")
+        if self.bounds is not None and self.full_runs:
+            text += f", searches on {100.0 * self.full_area / self.full_runs:.0f}% of frame"
+        return text
@@ -0,0 +1,124 @@
+"""Sampling profiler for the running gesture scripts.
+
+A background thread wakes up `hz` times a second, reads the stack of every
+other thread with sys._current_frames() and counts identical stacks. Nothing
+is traced in between, so the loop runs at full speed. The sampler measures
+its own cost and lowers its rate whenever it would take more than
+`max_overhead` of one core.
+
+The output is in the collapsed-stack format ("thread;outer;...;inner count"
+per line) that flamegraph.pl, speedscope and inferno read directly:
+
+    flamegraph.pl profile-20261018-101500.collapsed > profile.svg
+
+Time spent inside MediaPipe or OpenCV shows up under the Python call that
+entered it, e.g. `process (solution_base.py)`.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+
+class StackSampler:
+    """Samples all threads' Python stacks; start()/stop() or toggle() at runtime."""
+
+    def __init__(self, directory='.', hz=100, max_overhead=0.02, max_depth=64):
+        self.directory = directory
+        self.hz = hz
+        self.max_overhead = max_overhead  # Share of one core the sampler may use
+        self.max_depth = max_depth
+        self.lock = threading.Lock()
+        self.thread = None
+        self.running = False
+        self.reset()
+
+    def reset(self):
+        self.counts = Counter()
+        self.samples = 0
+        self.sample_time = 0.0
+        self.started = None
+        self.interval = 1.0 / self.hz
+
+    def start(self, hz=None):
+        with self.lock:
+            if self.running:
+                return False
+            if hz:
+                self.hz = hz
+            self.reset()
+            self.running = True
+            self.started = time.perf_counter()
+            self.thread = threading.Thread(target=self.run, name='stack-sampler')
+            self.thread.daemon = True
+            self.thread.start()
+        print(f"Stack sampler started at {self.hz:g} Hz")
+        return True
+
+    def run(self):
+        me = threading.get_ident()
+        names = {}
+        while self.running:
+            time.sleep(self.interval)
+            start = time.perf_counter()
+            frames = sys._current_frames()
+            if len(names) != len(frames) or any(ident not in names for ident in frames):
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident != me:
+                    self.counts[self.collapse(names.get(ident, str(ident)), frame)] += 1
+            del frames
+            elapsed = time.perf_counter() - start
+            self.sample_time += elapsed
+            self.samples += 1
+            # Keep the cost under budget: slow down rather than slow the loop down
+            if elapsed > self.interval * self.max_overhead:
+                self.interval = min(elapsed / self.max_overhead, 1.0)
+            elif self.interval > 1.0 / self.hz and elapsed < self.interval * self.max_overhead / 2:
+                self.interval = max(self.interval * 0.9, 1.0 / self.hz)
+
+    def collapse(self, thread_name, frame):
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+            frame = frame.f_back
+        stack.append(thread_name.replace(';', ':'))
+        return ';'.join(reversed(stack))
+
+    def overhead(self):
+        """Share of wall time spent sampling so far."""
+        if self.started is None:
+            return 0.0
+        wall = time.perf_counter() - self.started
+        return self.sample_time / wall if wall > 0 else 0.0
+
+    def stop(self):
+        """Stops sampling and writes the collapsed stacks; returns the file path (None if not running)."""
+        with self.lock:
+            if not self.running:
+                return None
+            self.running = False
+            thread, self.thread = self.thread, None
+        thread.join(timeout=2)
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, datetime.now().strftime('profile-%Y%m%d-%H%M%S.collapsed'))
+        with open(path, 'w') as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+        print(self.report())
+        print(f"Stack samples written to {path}")
+        return path
+
+    def toggle(self):
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+    def report(self):
+        rate = 1.0 / self.interval if self.interval else 0.0
+        return (f"Stack sampler: {self.samples} samples, {len(self.counts)} distinct stacks, "
+                f"overhead {self.overhead():.2%}, rate {rate:.0f} Hz")
@@ -0,0 +1,138 @@
+import time
+
+import cv2
+
+
+class AdaptiveScheduler:
+    """Chooses how often to run hand inference and at what input size.
+
+    Inference latency and the interval between camera frames are tracked as
+    moving averages. From them the scheduler estimates the end-to-end gesture
+    latency (inference time plus the frames waited between detections) and
+    the share of wall time spent in inference. It then adjusts:
+      - stride: run inference on every Nth frame
+      - scale:  shrink the image handed to MediaPipe
+    Detection frequency drops when the CPU is saturated and rises again when
+    there is headroom. Quality only steps back up when the predicted load
+    and latency at the next level still leave a margin, and every level is
+    kept for at least `min_dwell` seconds, so a loop running right at a
+    threshold settles instead of flipping between two levels.
+    """
+
+    SCALES = (1.0, 0.75, 0.5)
+
+    def __init__(self, target_latency=0.15, max_stride=6, high_load=0.85, low_load=0.5,
+                 adjust_every=15, alpha=0.1, headroom=0.8, min_dwell=2.0, log_every=30.0):
+        self.target_latency = target_latency  # seconds from gesture to action
+        self.max_stride = max_stride
+        self.high_load = high_load
+        self.low_load = low_load
+        self.adjust_every = adjust_every      # processed frames between adjustments
+        self.alpha = alpha
+        self.headroom = headroom              # share of the budget a step back up may be predicted to use
+        self.min_dwell = min_dwell            # seconds a level is kept before the next change
+        self.log_every = log_every            # seconds between level-change log lines
+        self.changes = 0
+        self.changed_at = float('-inf')
+        self.logged_at = float('-inf')
+
+        self.stride = 1
+        self.scale_index = 0
+        self.avg_inference = None
+        self.avg_interval = None
+        self.last_tick = None
+        self.counter = 0
+        self.samples = 0
+        self.buffer = None  # Resize output, reused while the scale stays the same
+
+    @property
+    def scale(self):
+        return self.SCALES[self.scale_index]
+
+    def tick(self):
+        """Call once per frame pulled from the camera."""
+        now = time.perf_counter()
+        if self.last_tick is not None:
+            self.avg_interval = self.ewma(self.avg_interval, now - self.last_tick)
+        self.last_tick = now
+
+    def should_process(self):
+        self.counter += 1
+        if self.counter >= self.stride:
+            self.counter = 0
+            return True
+        return False
+
+    def prepare(self, frame):
+        """Resizes the frame to the current inference scale."""
+        if self.scale == 1.0:
+            return frame
+        h, w = frame.shape[:2]
+        size = (int(round(w * self.scale)), int(round(h * self.scale)))
+        if self.buffer is None or self.buffer.shape[:2] != (size[1], size[0]):
+            self.buffer = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        else:
+            cv2.resize(frame, size, dst=self.buffer, interpolation=cv2.INTER_AREA)
+        return self.buffer
+
+    def record(self, inference_time):
+        """Feed back how long one inference took (seconds)."""
+        self.avg_inference = self.ewma(self.avg_inference, inference_time)
+        self.samples += 1
+        if self.samples % self.adjust_every == 0 and self.avg_interval:
+            self.adjust()
+
+    def ewma(self, avg, value):
+        return value if avg is None else avg + self.alpha * (value - avg)
+
+    def load(self):
+        return self.avg_inference / (self.stride * self.avg_interval)
+
+    def latency(self):
+        return self.avg_inference + (self.stride - 1) * self.avg_interval
+
+    def adjust(self):
+        now = time.perf_counter()
+        if now - self.changed_at < self.min_dwell:
+            return
+        load, latency = self.load(), self.latency()
+        stride, scale_index = self.stride, self.scale_index
+
+        if latency > self.target_latency and self.scale_index < len(self.SCALES) - 1:
+            self.rescale(self.scale_index + 1)
+        elif load > self.high_load and self.stride < self.max_stride:
+            self.stride += 1
+        elif (latency > self.target_latency and self.stride > 1
+              and load * self.stride / (self.stride - 1) < self.high_load * self.headroom):
+            self.stride -= 1
+        elif load < self.low_load and latency < self.target_latency * self.headroom:
+            if self.stride > 1:
+                # Only come back down if the higher rate is still expected to leave headroom
+                if load * self.stride / (self.stride - 1) < self.high_load * self.headroom:
+                    self.stride -= 1
+            elif self.scale_index > 0:
+                # Only grow the input if the larger image is still expected to fit the budget
+                ratio = self.SCALES[self.scale_index - 1] / self.scale
+                if (self.avg_inference * ratio * ratio < self.target_latency * self.headroom
+                        and load * ratio * ratio < self.high_load * self.headroom):
+                    self.rescale(self.scale_index - 1)
+
+        if (stride, scale_index) != (self.stride, self.scale_index):
+            self.changes += 1
+            self.changed_at = now
+            if now - self.logged_at >= self.log_every:  # Live values are in the metrics gauges
+                self.logged_at = now
+                print(f"Scheduler: every {self.stride} frame(s) at {int(self.scale * 100)}% "
+                      f"(inference {self.avg_inference * 1000:.0f} ms, load {load:.0%})")
+
+    def rescale(self, index):
+        # Inference cost scales roughly with pixel count; re-seed the average accordingly
+        ratio = self.SCALES[index] / self.scale
+        self.avg_inference *= ratio * ratio
+        self.scale_index = index
+
+    def report(self):
+        if self.avg_inference is None:
+            return "Scheduler: no frames processed"
+        return (f"Scheduler: every {self.stride} frame(s) at {int(self.scale * 100)}%, "
+                f"inference {self.avg_inference * 1000:.1f} ms, {self.changes} level change(s)")
@@ -0,0 +1,220 @@
+"""Finds the projected screen in a camera frame without anyone clicking corners.
+
+Two ways to find it:
+  - brightest quadrilateral: the lit projection is usually the largest bright
+    four-sided shape in view, so this needs nothing but a camera frame
+  - projected pattern: the projector shows full white, then full black, and
+    the screen is whatever changed between the two, whatever the room lighting
+
+    python screenfind.py --source 0 --save          # one pass, headless
+    python screenfind.py --pattern --save           # needs the projector as display
+
+DriftMonitor re-runs the cheap detector now and then while the gesture
+scripts run, and only re-calibrates when the corners have really moved.
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from calibration import Calibration, load_calibration, order_corners, save_calibration
+
+
+def find_quad(mask, min_area=0.05):
+    """Corners of the largest convex four-sided contour in a binary mask, or None."""
+    h, w = mask.shape[:2]
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    for contour in sorted(contours, key=cv2.contourArea, reverse=True)[:5]:
+        area = cv2.contourArea(contour)
+        if area < min_area * w * h:
+            break
+        quad = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
+        if len(quad) == 4 and cv2.isContourConvex(quad):
+            return order_corners(quad.reshape(4, 2))
+    return None
+
+
+def refine(gray, corners):
+    """Sub-pixel corner positions; the contour approximation is only pixel-accurate."""
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 20, 0.1)
+    pts = corners.reshape(-1, 1, 2).astype(np.float32)
+    cv2.cornerSubPix(gray, pts, (5, 5), (-1, -1), criteria)
+    return pts.reshape(4, 2)
+
+
+def find_screen(frame, min_area=0.05, work_width=320):
+    """Corners of the brightest quadrilateral in a BGR frame (frame pixels), or None.
+
+    Detection runs on a copy shrunk to `work_width`, which is enough to
+    find the screen and keeps a drift check around a millisecond.
+    """
+    h, w = frame.shape[:2]
+    scale = min(1.0, work_width / float(w))
+    small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1 else frame
+    gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+    _, mask = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((5, 5), np.uint8))
+    corners = find_quad(mask, min_area)
+    if corners is None:
+        return None
+    return refine(gray, corners) / scale
+
+
+def find_screen_by_pattern(cap, window='calibration', settle=0.5, frames=3):
+    """Shows white then black full screen and finds what changed. Needs the projector as display."""
+    cv2.namedWindow(window, cv2.WINDOW_NORMAL)
+    cv2.setWindowProperty(window, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
+    shots = []
+    try:
+        for level in (255, 0):
+            cv2.imshow(window, np.full((720, 1280, 3), level, np.uint8))
+            deadline = time.monotonic() + settle  # Let the projector and camera exposure settle
+            while time.monotonic() < deadline:
+                cv2.waitKey(10)
+                cap.read()
+            # Average a few frames against sensor noise
+            stack = [cap.read()[1] for _ in range(frames)]
+            stack = [f for f in stack if f is not None]
+            if not stack:
+                return None
+            shots.append(np.mean([cv2.cvtColor(f, cv2.COLOR_BGR2GRAY) for f in stack], axis=0))
+    finally:
+        cv2.destroyWindow(window)
+
+    diff = cv2.GaussianBlur(np.clip(shots[0] - shots[1], 0, 255).astype(np.uint8), (5, 5), 0)
+    _, mask = cv2.threshold(diff, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((5, 5), np.uint8))
+    corners = find_quad(mask)
+    if corners is None:
+        return None
+    return refine(diff, corners)
+
+
+class DriftMonitor:
+    """Re-checks the screen position every `interval` seconds.
+
+    A check costs one detection on a shrunken frame. Only when the corners
+    have moved by more than `tolerance` (share of the screen diagonal) in
+    `confirm` checks in a row is a new calibration built; a presenter walking
+    in front of the screen breaks single detections, not a streak of them.
+    Started without a calibration, it keeps looking every `retry` seconds
+    and calibrates from scratch. New calibrations are saved to `path`, or
+    to the file the calibration was loaded from.
+    """
+
+    def __init__(self, calibration, interval=30.0, tolerance=0.02, confirm=3, retry=1.0, save=True, path=None):
+        self.calibration = calibration
+        self.path = path or (calibration.path if calibration is not None else None)
+        self.interval = interval
+        self.tolerance = tolerance
+        self.confirm = confirm
+        self.retry = retry   # Seconds between checks while confirming a move
+        self.save = save
+        self.next_check = time.monotonic() + (interval if calibration is not None else 0.0)
+        self.moved = []
+        self.checks = 0
+        self.recalibrations = 0
+        self.check_time = 0.0
+
+    def check(self, frame):
+        """Call with raw (unmirrored) camera frames; returns a new Calibration when the screen moved."""
+        now = time.monotonic()
+        if now < self.next_check:
+            return None
+        start = time.perf_counter()
+        corners = find_screen(frame)
+        self.check_time += time.perf_counter() - start
+        self.checks += 1
+
+        if corners is None and self.calibration is None:
+            self.next_check = now + self.retry
+            return None
+        if self.calibration is not None:
+            current = self.calibration.for_frame(frame.shape[1], frame.shape[0])
+            if corners is None or self.shift(current.corners, corners) <= self.tolerance:
+                self.moved = []
+                self.next_check = now + self.interval
+                return None
+
+        self.moved.append(corners)
+        if len(self.moved) < self.confirm:
+            self.next_check = now + self.retry
+            return None
+        if max(self.shift(self.moved[-1], c) for c in self.moved) > self.tolerance:
+            self.moved = self.moved[1:]  # Still moving or occluded; keep confirming
+            self.next_check = now + self.retry
+            return None
+
+        screen_size = self.calibration.screen_size if self.calibration is not None else (1920, 1080)
+        self.calibration = Calibration(np.mean(self.moved, axis=0), (frame.shape[1], frame.shape[0]),
+                                       screen_size, ordered=True)
+        self.moved = []
+        self.next_check = now + self.interval
+        self.recalibrations += 1
+        print(f"Screen found: calibrated ({self.recalibrations} time(s))")
+        if self.save:
+            save_calibration(self.calibration, self.path)
+        return self.calibration
+
+    @staticmethod
+    def shift(a, b):
+        """Largest corner displacement relative to the quad's diagonal."""
+        diagonal = np.linalg.norm(a[2] - a[0])
+        return float(np.max(np.linalg.norm(a - b, axis=1)) / diagonal) if diagonal else 1.0
+
+    def report(self):
+        avg = self.check_time / self.checks * 1000 if self.checks else 0.0
+        return (f"Drift check: {self.checks} check(s) ({avg:.1f} ms each), "
+                f"{self.recalibrations} re-calibration(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the projector screen and save the calibration")
+    parser.add_argument('--source', default='0',
+                        help="camera index or /dev/videoN, a video file, an image folder or synthetic")
+    parser.add_argument('--pattern', action='store_true',
+                        help="project white/black frames instead of looking for the brightest quad")
+    parser.add_argument('--screen', default='1920x1080', help="slide resolution the corners map to")
+    parser.add_argument('--frames', type=int, default=10, help="frames to try before giving up")
+    parser.add_argument('--save', action='store_true', help="write optimize/calibration.json")
+    args = parser.parse_args()
+
+    from sources import open_source, parse_size
+
+    cap = open_source(args.source)
+    if not cap.isOpened():
+        print("Error: Could not open video stream.")
+        return
+    corners, frame = None, None
+    try:
+        if args.pattern:
+            corners = find_screen_by_pattern(cap)
+            frame = cap.read()[1]
+        else:
+            for _ in range(args.frames):
+                success, frame = cap.read()
+                if not success:
+                    break
+                corners = find_screen(frame)
+                if corners is not None:
+                    break
+    finally:
+        cap.release()
+
+    if corners is None or frame is None:
+        print("No screen found. Is the projector on and in view?")
+        return
+    calibration = Calibration(corners, (frame.shape[1], frame.shape[0]), parse_size(args.screen))
+    print("Screen corners (TL, TR, BR, BL): "
+          + ", ".join(f"({x:.1f}, {y:.1f})" for x, y in calibration.corners))
+    previous = load_calibration()
+    if previous is not None:
+        shift = DriftMonitor.shift(previous.for_frame(*calibration.frame_size).corners, calibration.corners)
+        print(f"Moved {shift:.1%} of the screen diagonal since the saved calibration")
+    if args.save:
+        print(f"Calibration saved to {save_calibration(calibration)}")
+
+
+if __name__ == "__main__":
+    main()
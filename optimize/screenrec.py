@@ -0,0 +1,233 @@
+"""Screen recording that plays back at the true rate.
+
+A pyautogui/PIL screenshot of a 1080p desktop takes longer than a 30 fps
+frame interval, so recordings written at a declared 30 fps used to play back
+too fast. Here the screen is grabbed with mss. Its BGRA buffer is wrapped
+in NumPy without a copy and converted straight into a pooled BGR buffer.
+Each output slot of 1/fps seconds on the monotonic clock gets exactly one
+frame. When a grab runs late, the previous frame is repeated for the slots
+it missed. A grab that lands in a slot already written is dropped. The
+video therefore always lasts as long as the recording did. Encoding runs on
+a separate writer thread, so it overlaps with the next grab.
+
+    python screenrec.py --seconds 10 --fps 30    # records test.avi and prints the rates
+"""
+import argparse
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from framepool import FramePool
+
+
+class MssGrabber:
+    """One monitor through mss. Create it on the thread that grabs (X connections are per thread)."""
+
+    name = 'mss'
+
+    def __init__(self, monitor=1):
+        import mss
+
+        self.sct = mss.mss()
+        self.monitor = self.sct.monitors[monitor]
+        shot = self.sct.grab(self.monitor)
+        self.size = (shot.width, shot.height)  # Scaled and HiDPI outputs differ from the monitor geometry
+
+    def grab(self, dst):
+        shot = self.sct.grab(self.monitor)
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)  # No copy
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=dst)
+
+    def close(self):
+        self.sct.close()
+
+
+class PILGrabber:
+    """Fallback through PIL's ImageGrab (what pyautogui.screenshot() uses)."""
+
+    name = 'pil'
+
+    def __init__(self, monitor=1):
+        from PIL import ImageGrab
+
+        self.image_grab = ImageGrab
+        self.size = self.image_grab.grab().size
+
+    def grab(self, dst):
+        rgb = np.asarray(self.image_grab.grab().convert('RGB'))
+        return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR, dst=dst)
+
+    def close(self):
+        pass
+
+
+def open_grabber(monitor=1):
+    try:
+        return MssGrabber(monitor)
+    except ImportError:
+        print("Warning: mss is not installed (pip install mss); falling back to slow PIL screenshots")
+        return PILGrabber(monitor)
+
+
+class ScreenRecorder:
+    """Records the screen to `path` at a true `fps`; record() blocks until keep_going() is False."""
+
+    def __init__(self, path, fps=30.0, monitor=1, fourcc='XVID', size=None):
+        self.path = path
+        self.fps = fps
+        self.monitor = monitor
+        self.fourcc = fourcc
+        self.size = size            # (w, h) to scale the video to; None keeps the screen size
+        self.pool = FramePool(max_free=8)
+        self.queue = queue.Queue(maxsize=8)  # (frame, repeat count) waiting for the encoder
+        self.captured = 0
+        self.written = 0
+        self.duplicated = 0
+        self.dropped = 0
+        self.grab_time = 0.0
+        self.elapsed = 0.0
+        self.backend = None
+
+    def record(self, keep_going):
+        grabber = open_grabber(self.monitor)
+        self.backend = grabber.name
+        size = tuple(self.size or grabber.size)
+        writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, size)
+        writer_thread = threading.Thread(target=self.write_frames, args=(writer,), name='screen-writer')
+        writer_thread.start()
+        screen = None
+        previous = None
+        interval = 1.0 / self.fps
+        start = time.monotonic()
+        try:
+            while keep_going():
+                grab_start = time.perf_counter()
+                buf = self.pool.acquire((size[1], size[0], 3))
+                if self.size is None:
+                    frame = grabber.grab(buf)
+                    if frame is not buf:  # The screen changed size: OpenCV allocated a new array
+                        frame = cv2.resize(frame, size, dst=buf, interpolation=cv2.INTER_AREA)
+                else:
+                    screen = grabber.grab(screen)  # Full-size scratch buffer, reused
+                    frame = cv2.resize(screen, size, dst=buf, interpolation=cv2.INTER_AREA)
+                self.grab_time += time.perf_counter() - grab_start
+                self.captured += 1
+
+                slot = int((time.monotonic() - start) / interval)
+                if slot < self.written:
+                    self.dropped += 1  # This slot already has a frame
+                    self.pool.release(frame)
+                else:
+                    if slot > self.written and previous is not None:
+                        # The grab ran late: hold the last frame for the slots it missed
+                        self.pool.retain(previous)
+                        self.queue.put((previous, slot - self.written))
+                        self.duplicated += slot - self.written
+                        self.written = slot
+                    self.queue.put((self.pool.retain(frame), 1))  # One reference for the writer
+                    self.written += 1
+                    if previous is not None:
+                        self.pool.release(previous)
+                    previous = frame
+                delay = start + self.written * interval - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+        finally:
+            # Pad up to the stop time so the video is exactly as long as the recording
+            self.elapsed = time.monotonic() - start
+            missing = int(self.elapsed / interval) - self.written
+            if missing > 0 and previous is not None:
+                self.pool.retain(previous)
+                self.queue.put((previous, missing))
+                self.duplicated += missing
+                self.written += missing
+            if previous is not None:
+                self.pool.release(previous)
+            self.queue.put(None)
+            writer_thread.join()
+            writer.release()
+            grabber.close()
+
+    def write_frames(self, writer):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            frame, count = item
+            for _ in range(count):
+                writer.write(frame)
+            self.pool.release(frame)
+
+    def report(self):
+        rate = self.captured / self.elapsed if self.elapsed else 0.0
+        grab = self.grab_time / self.captured * 1000 if self.captured else 0.0
+        return (f"Screen recording ({self.backend}): {self.captured} grabs at {rate:.1f} fps "
+                f"({grab:.1f} ms each) for a {self.fps:g} fps video; {self.written} frames written, "
+                f"{self.duplicated} duplicated, {self.dropped} dropped")
+
+
+class BackgroundRecording:
+    """Screen recording that toggle() starts and stops on a thread of its own.
+
+    Every recording goes to a new file named with time.strftime(pattern).
+    stop() waits until the video is written, so call it off the vision loop.
+    """
+
+    def __init__(self, pattern='screen-%Y%m%d-%H%M%S.avi', fps=30.0):
+        self.pattern = pattern
+        self.fps = fps
+        self.active = False
+        self.recorder = None
+        self.thread = None
+
+    def toggle(self):
+        """Starts or stops recording; returns whether it is recording now."""
+        if self.active:
+            self.stop()
+        else:
+            self.start()
+        return self.active
+
+    def start(self):
+        self.recorder = ScreenRecorder(time.strftime(self.pattern), self.fps)
+        self.active = True
+        self.thread = threading.Thread(target=self.run, name='screen-recorder')
+        self.thread.start()
+        print(f"Recording the screen to {self.recorder.path}")
+
+    def run(self):
+        try:
+            self.recorder.record(lambda: self.active)
+        except Exception as e:
+            print(f"Error during screen recording: {e}")
+            self.active = False
+
+    def stop(self):
+        self.active = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+            print(self.recorder.report())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record the screen and report the achieved rate")
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--fps', type=float, default=30)
+    parser.add_argument('--monitor', type=int, default=1, help="mss monitor number (1 = primary)")
+    parser.add_argument('--size', help="scale the video to WxH, e.g. 1280x720")
+    parser.add_argument('--output', default='test.avi')
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.lower().split('x')) if args.size else None
+    recorder = ScreenRecorder(args.output, args.fps, args.monitor, size=size)
+    deadline = time.monotonic() + args.seconds
+    recorder.record(lambda: time.monotonic() < deadline)
+    print(recorder.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Frame sources behind one interface: cameras, video files, image folders, test patterns.
+
+Every source reads like cv2.VideoCapture (isOpened(), read([image]),
+release()), so FrameGrabber and the scripts take any of them. Each one also
+keeps its effective frame rate and the time spent decoding or producing
+frames. open_source() picks the backend from a string:
+
+    0, /dev/video2          camera through V4L2, negotiating MJPEG and the frame rate
+    lecture.mp4             video file
+    frames/                 folder of images, in name order
+    synthetic[:WxH]         moving test pattern, no hardware needed
+"""
+import glob
+import os
+import sys
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def fourcc_name(value):
+    value = int(value)
+    return ''.join(chr((value >> 8 * i) & 0xFF) for i in range(4)).strip('\x00') or '?'
+
+
+class FrameSource:
+    """Base class: subclasses implement next_frame(image) -> (success, frame, decode seconds)."""
+
+    def __init__(self, name, window=60):
+        self.name = name
+        self.frames = 0
+        self.decode_time = 0.0
+        self.last_decode = 0.0
+        self.timestamp = 0.0            # Seconds; media time for files, monotonic for live sources
+        self.read_times = deque(maxlen=window)
+
+    def isOpened(self):
+        return True
+
+    def read(self, image=None):
+        success, frame, decode = self.next_frame(image)
+        if success:
+            self.frames += 1
+            self.last_decode = decode
+            self.decode_time += decode
+            self.read_times.append(time.monotonic())
+        return success, frame
+
+    def next_frame(self, image):
+        raise NotImplementedError
+
+    def fps(self):
+        """Frames per second actually delivered over the last `window` reads."""
+        if len(self.read_times) < 2:
+            return 0.0
+        span = self.read_times[-1] - self.read_times[0]
+        return (len(self.read_times) - 1) / span if span > 0 else 0.0
+
+    def avg_decode(self):
+        return self.decode_time / self.frames if self.frames else 0.0
+
+    def report(self):
+        return (f"Source {self.name}: {self.frames} frames at {self.fps():.1f} fps, "
+                f"decode {self.avg_decode() * 1000:.2f} ms/frame")
+
+    def release(self):
+        pass
+
+
+class Pacer:
+    """Sleeps so that frames come out at `fps`, like a camera would deliver them."""
+
+    def __init__(self, fps):
+        self.interval = 1.0 / fps if fps else 0.0
+        self.next_time = None
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self.next_time is None or now - self.next_time > self.interval:
+            self.next_time = now  # First frame, or we fell behind: don't try to catch up
+        elif self.next_time > now:
+            time.sleep(self.next_time - now)
+        self.next_time += self.interval
+
+
+class V4L2Source(FrameSource):
+    """USB/CSI camera. Asks for MJPEG at the wanted size and frame rate and reports what it got.
+
+    Without MJPEG most webcams fall back to uncompressed YUYV, which the USB
+    bus can only carry at a low frame rate for anything above 320x240.
+    """
+
+    def __init__(self, device=0, width=None, height=None, fps=30, fourcc='MJPG'):
+        super().__init__(f"camera {device}")
+        backend = cv2.CAP_V4L2 if sys.platform.startswith('linux') else cv2.CAP_ANY
+        self.cap = cv2.VideoCapture(device, backend)
+        if not self.cap.isOpened():
+            return
+        # The format has to be set before the size: drivers pick the frame rates per format
+        if fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        if width and height:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps:
+            self.cap.set(cv2.CAP_PROP_FPS, fps)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Don't queue stale frames in the driver
+
+        self.format = fourcc_name(self.cap.get(cv2.CAP_PROP_FOURCC))
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.nominal_fps = self.cap.get(cv2.CAP_PROP_FPS)
+        print(f"Camera {device}: {self.width}x{self.height} {self.format} at {self.nominal_fps:g} fps")
+        if fourcc and self.format != fourcc:
+            print(f"Warning: camera {device} does not offer {fourcc}; frame rate may be limited")
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def next_frame(self, image):
+        if not self.cap.grab():  # Waits for the camera; not decode time
+            return False, None, 0.0
+        self.timestamp = time.monotonic()
+        start = time.perf_counter()
+        success, frame = self.cap.retrieve(image)
+        return success, frame, time.perf_counter() - start
+
+    def release(self):
+        self.cap.release()
+
+
+class FileSource(FrameSource):
+    """Video file. realtime=True plays at the file's frame rate instead of as fast as possible."""
+
+    def __init__(self, path, realtime=False, loop=False):
+        super().__init__(os.path.basename(path))
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        self.nominal_fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.pacer = Pacer(self.nominal_fps if realtime else None)
+        self.index = 0
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def next_frame(self, image):
+        self.pacer.wait()
+        start = time.perf_counter()
+        success, frame = self.cap.read(image)
+        if not success and self.loop and self.index:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = self.cap.read(image)
+        decode = time.perf_counter() - start
+        if success:
+            self.timestamp = self.index / self.nominal_fps
+            self.index += 1
+        return success, frame, decode
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageDirSource(FrameSource):
+    """Folder of still images read in name order, `fps` frames per second of media time."""
+
+    def __init__(self, path, fps=30.0, realtime=False, loop=False):
+        super().__init__(os.path.basename(path.rstrip('/\\')) + '/')
+        self.paths = sorted(p for p in glob.glob(os.path.join(path, '*'))
+                            if p.lower().endswith(IMAGE_EXTENSIONS))
+        self.nominal_fps = fps
+        self.loop = loop
+        self.pacer = Pacer(fps if realtime else None)
+        self.index = 0
+        self.position = 0
+
+    def isOpened(self):
+        return bool(self.paths)
+
+    def next_frame(self, image):
+        self.pacer.wait()
+        while True:
+            if self.position >= len(self.paths):
+                if not self.loop or not self.paths:
+                    return False, None, 0.0
+                self.position = 0
+            path = self.paths[self.position]
+            self.position += 1
+            start = time.perf_counter()
+            frame = cv2.imread(path)
+            decode = time.perf_counter() - start
+            if frame is not None:
+                break
+            print(f"Error: cannot read {path}")
+        if image is not None and image.shape == frame.shape:
+            image[...] = frame
+            frame = image
+        self.timestamp = self.index / self.nominal_fps
+        self.index += 1
+        return True, frame, decode
+
+
+class SyntheticSource(FrameSource):
+    """Generated test pattern: a bright disc sweeping across a gradient, paced at `fps`.
+
+    Stands in for a camera on machines without one; the moving disc keeps
+    the motion gate awake so the whole pipeline runs.
+    """
+
+    def __init__(self, width=320, height=240, fps=30.0, realtime=True):
+        super().__init__(f"synthetic {width}x{height}")
+        self.width = width
+        self.height = height
+        self.nominal_fps = fps
+        self.pacer = Pacer(fps if realtime else None)
+        gradient = np.linspace(40, 120, width, dtype=np.float32).astype(np.uint8)
+        self.background = np.dstack([np.tile(gradient, (height, 1))] * 3)
+        self.index = 0
+
+    def next_frame(self, image):
+        self.pacer.wait()
+        start = time.perf_counter()
+        if image is None or image.shape != self.background.shape:
+            image = np.empty_like(self.background)
+        image[...] = self.background
+        phase = (self.index % 90) / 90.0
+        center = (int(self.width * (0.1 + 0.8 * phase)), self.height // 2)
+        cv2.circle(image, center, max(4, self.height // 10), (230, 230, 230), -1)
+        cv2.putText(image, str(self.index), (5, self.height - 8), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.5, (0, 255, 255), 1)
+        self.timestamp = self.index / self.nominal_fps
+        self.index += 1
+        return True, image, time.perf_counter() - start
+
+
+def parse_size(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def open_source(spec, width=None, height=None, fps=None, realtime=True, loop=False, fourcc='MJPG'):
+    """Opens a camera index or device, video file, image folder or 'synthetic[:WxH]'."""
+    if isinstance(spec, int) or str(spec).isdigit() or str(spec).startswith('/dev/video'):
+        device = int(spec) if str(spec).isdigit() else spec
+        return V4L2Source(device, width, height, fps or 30, fourcc)
+    if str(spec).startswith('synthetic'):
+        _, _, size = spec.partition(':')
+        if size:
+            width, height = parse_size(size)
+        return SyntheticSource(width or 320, height or 240, fps or 30.0, realtime)
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, fps or 30.0, realtime, loop)
+    return FileSource(spec, realtime, loop)
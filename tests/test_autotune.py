@@ -0,0 +1,20 @@
+from autotune import agreement, f1_score
+
+
+def test_frames_without_hands_do_not_count():
+    recall, precision = agreement([None] * 100, [None] * 100)
+    assert f1_score(recall, precision) == 0.0
+
+
+def test_a_setting_that_misses_the_hand_scores_low():
+    reference = [None] * 90 + ['point'] * 10
+    recall, precision = agreement([None] * 100, reference)
+    assert recall == 0.0 and f1_score(recall, precision) == 0.0
+
+
+def test_recall_and_precision_are_separate():
+    reference = [None, 'point', 'point', 'pinch']
+    recall, precision = agreement(['fist', 'point', None, 'pinch'], reference)
+    assert recall == 2 / 3
+    assert precision == 2 / 3
+    assert agreement(reference, reference) == (1.0, 1.0)
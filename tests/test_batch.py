@@ -0,0 +1,119 @@
+import json
+import os
+
+import cv2
+import numpy as np
+
+import batch
+from batch import SlideChangeDetector, TIMELINE_VERSION, is_done, sidecar_path, write_timeline
+from test_gestures import HAND
+
+
+def slide(level):
+    frame = np.full((270, 480, 3), 30, dtype=np.uint8)
+    frame[60:200, 80:400] = level
+    return frame
+
+
+def test_change_is_dated_from_when_the_new_slide_is_steady():
+    detector = SlideChangeDetector()
+    changes = [detector.update(slide(200), t) for t in range(3)]
+    changes += [detector.update(slide(90), t) for t in range(3, 8)]
+    assert [c[0] for c in changes if c] == [4]  # Sample 3 differs from 2, so it is still moving
+
+
+def test_transitions_that_never_settle_are_ignored():
+    detector = SlideChangeDetector()
+    detector.update(slide(200), 0)
+    detector.update(slide(200), 1)
+    levels = [200, 60, 220, 40, 200, 200]  # Presenter walking past, back to the same slide
+    assert not any(detector.update(slide(level), 2 + i) for i, level in enumerate(levels))
+
+
+def test_sidecar_marks_a_video_done_until_it_changes(tmp_path):
+    video = tmp_path / 'lecture.mp4'
+    video.write_bytes(b'x' * 100)
+    assert not is_done(str(video))
+
+    stat = os.stat(video)
+    write_timeline(str(video), {'version': TIMELINE_VERSION, 'source_size': stat.st_size,
+                                'source_mtime': int(stat.st_mtime)})
+    assert sidecar_path(str(video)) == str(tmp_path / 'lecture.timeline.json')
+    assert not os.path.exists(sidecar_path(str(video)) + '.tmp')
+    assert is_done(str(video))
+
+    video.write_bytes(b'x' * 200)  # Re-recorded
+    assert not is_done(str(video))
+
+
+def test_broken_or_old_sidecars_are_redone(tmp_path):
+    video = tmp_path / 'lecture.avi'
+    video.write_bytes(b'x')
+    with open(sidecar_path(str(video)), 'w') as f:
+        f.write('{"version": ')
+    assert not is_done(str(video))
+    stat = os.stat(video)
+    write_timeline(str(video), {'version': TIMELINE_VERSION - 1, 'source_size': stat.st_size,
+                                'source_mtime': int(stat.st_mtime)})
+    assert not is_done(str(video))
+
+
+class Landmark:
+    def __init__(self, x, y):
+        self.x, self.y, self.z = x, y, 0.0
+
+
+class FakeHands:
+    """Finds a white block with a blue 'thumb' dot and labels it like MediaPipe would.
+
+    MediaPipe expects selfie (mirrored) images: there, a right hand's thumb
+    dot is on the block's right. Flipping the image again turns it into a
+    'Left' hand.
+    """
+
+    def process(self, rgb):
+        result = type('Result', (), {'multi_hand_landmarks': None, 'multi_handedness': None})()
+        white = (rgb > 200).all(axis=2)
+        dot = (rgb[..., 2] > 200) & (rgb[..., 0] < 80) & (rgb[..., 1] < 80)
+        if white.sum() < 50 or dot.sum() < 10:
+            return result
+        h, w = rgb.shape[:2]
+        ys, xs = np.nonzero(white)
+        cx, cy = xs.mean(), ys.mean()
+        label = 'Right' if np.nonzero(dot)[1].mean() > cx else 'Left'
+        points = HAND * 0.4
+        points += (cx - (points[:, 0].min() + points[:, 0].max()) / 2, cy - (points[:, 1].min() + points[:, 1].max()) / 2)
+        hand = type('Hand', (), {})()
+        hand.landmark = [Landmark(x / w, y / h) for x, y in points]
+        handedness = type('Handedness', (), {})()
+        handedness.classification = [type('Category', (), {'label': label, 'score': 0.99})()]
+        result.multi_hand_landmarks = [hand]
+        result.multi_handedness = [handedness]
+        return result
+
+
+def write_mirrored_swipe(path):
+    """A right hand as CameraRecorder saves it: rests in the middle, then swipes right."""
+    positions = [160] * 10 + list(np.linspace(160, 290, 6)) + [290] * 10
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 30.0, (320, 240))
+    for x in positions:
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        x = int(x)
+        frame[90:150, x - 20:x + 20] = 255
+        frame[100:112, x + 20:x + 32] = (255, 0, 0)  # Blue in BGR, right of the block
+        writer.write(frame)
+    writer.release()
+
+
+def test_mirrored_recording_fires_triggers(tmp_path, monkeypatch):
+    video = tmp_path / 'camera.avi'
+    write_mirrored_swipe(video)
+    monkeypatch.setattr(batch, 'worker', {
+        'options': {'stride': 1, 'gestures': True, 'slides': False, 'calibration': None, 'mirrored': True},
+        'hands': FakeHands(),
+        'calibration': None,
+    })
+    batch.analyze_video(str(video))
+    with open(sidecar_path(str(video))) as f:
+        timeline = json.load(f)
+    assert [t['action'] for t in timeline['triggers']] == ['right']
@@ -0,0 +1,51 @@
+import threading
+
+from dispatcher import ActionDispatcher
+
+
+def test_group_shares_one_cooldown():
+    dispatcher = ActionDispatcher()
+    dispatcher.register('left', lambda: None, cooldown=10, group='slide')
+    dispatcher.register('right', lambda: None, cooldown=10, group='slide')
+    dispatcher.register('record', lambda: None, cooldown=10)
+    assert dispatcher.post('left')
+    assert not dispatcher.post('right')
+    assert not dispatcher.post('left')
+    assert dispatcher.post('record')
+    assert (dispatcher.posted, dispatcher.suppressed) == (4, 2)
+
+
+def test_actions_run_on_the_worker_in_order():
+    done = threading.Event()
+    calls = []
+    dispatcher = ActionDispatcher().start()
+    dispatcher.register('left', lambda: calls.append(('left', threading.current_thread().name)), cooldown=0)
+    dispatcher.register('stop', done.set, cooldown=0)
+    dispatcher.post('left')
+    dispatcher.post('stop')
+    assert done.wait(2)
+    dispatcher.stop()
+    assert [action for action, _ in calls] == ['left']
+    assert calls[0][1] != threading.current_thread().name
+    assert dispatcher.executed == 2
+
+
+def test_a_failing_action_does_not_stop_the_worker():
+    done = threading.Event()
+    dispatcher = ActionDispatcher().start()
+    dispatcher.register('broken', lambda: 1 / 0, cooldown=0)
+    dispatcher.register('ok', done.set, cooldown=0)
+    dispatcher.post('broken')
+    dispatcher.post('ok')
+    assert done.wait(2)
+    dispatcher.stop()
+
+
+def test_full_queue_drops_without_blocking():
+    dispatcher = ActionDispatcher(maxsize=1)  # Not started: nothing drains the queue
+    dispatcher.register('a', lambda: None, cooldown=0)
+    dispatcher.register('b', lambda: None, cooldown=0)
+    assert dispatcher.post('a')
+    assert not dispatcher.post('b')
+    assert dispatcher.dropped == 1
+    assert not dispatcher.post('unknown')
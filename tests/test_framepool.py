@@ -0,0 +1,43 @@
+import numpy as np
+
+from framepool import FramePool
+
+
+def test_released_buffers_are_reused():
+    pool = FramePool()
+    first = pool.acquire((4, 6, 3))
+    pool.release(first)
+    assert pool.acquire((4, 6, 3)) is first
+    assert pool.acquire((4, 6, 3)) is not first
+    assert pool.acquire((2, 2, 3)).shape == (2, 2, 3)
+    assert (pool.allocated, pool.reused) == (3, 1)
+
+
+def test_retained_buffer_stays_out_until_the_last_release():
+    pool = FramePool()
+    buf = pool.retain(pool.acquire((4, 4)))
+    pool.release(buf)
+    assert pool.owns(buf)
+    assert pool.acquire((4, 4)) is not buf
+    pool.release(buf)
+    assert not pool.owns(buf)
+    assert pool.acquire((4, 4)) is buf
+
+
+def test_foreign_buffers_are_ignored_or_adopted():
+    pool = FramePool()
+    foreign = np.zeros((4, 4), dtype=np.uint8)
+    pool.release(foreign)
+    assert not pool.owns(foreign) and not pool.free
+    pool.adopt(foreign)
+    assert pool.owns(foreign)
+    pool.release(foreign)
+    assert pool.acquire((4, 4)) is foreign
+
+
+def test_free_list_is_bounded():
+    pool = FramePool(max_free=2)
+    buffers = [pool.acquire((2, 2)) for _ in range(4)]
+    for buf in buffers:
+        pool.release(buf)
+    assert len(pool.free) == 2
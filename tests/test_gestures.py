@@ -0,0 +1,79 @@
+import numpy as np
+
+from gestures import SlideGate, SwipeDetector
+from pipeline import FrameResult, GesturePipeline
+
+FPS = 30.0
+WIDTH, HEIGHT = 640, 480
+
+# Open hand pointing up, wrist at the origin, palm size 100 px
+HAND = np.array([
+    (0, 0), (-30, -20), (-50, -40), (-70, -60), (-90, -80),
+    (-30, -95), (-32, -130), (-33, -160), (-34, -190),
+    (0, -100), (0, -140), (0, -170), (0, -200),
+    (25, -95), (27, -130), (28, -160), (29, -185),
+    (50, -85), (55, -110), (58, -130), (60, -150),
+], dtype=np.float32)
+
+
+def hand_at(x, y=400):
+    """Hand landmarks (21, 3) with the index fingertip at x."""
+    points = np.zeros((21, 3), dtype=np.float32)
+    points[:, :2] = HAND + (x - HAND[8, 0], y)
+    return points
+
+
+def glide(start, end, frames):
+    return list(np.linspace(start, end, frames))
+
+
+def run(positions, pipeline=None):
+    """Feeds index-tip positions at 30 fps through the pipeline's decision; returns (time, action) pairs."""
+    pipeline = pipeline or GesturePipeline(None)
+    actions = []
+    for i, x in enumerate(positions):
+        out = FrameResult(np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8))
+        out.hands.append(('Right', hand_at(x)))
+        pipeline.decide_hands(out, WIDTH, i / FPS)
+        if out.action is not None:
+            actions.append((i / FPS, out.action))
+    return actions
+
+
+def test_point_then_return_does_not_undo_the_slide():
+    for hold in (15, 30, 55):
+        positions = [320] * 10 + glide(320, 560, 6) + [560] * hold + glide(560, 320, 6) + [320] * 90
+        fired = {action for _, action in run(positions)}
+        assert fired == {'right'}, (hold, fired)
+
+
+def test_swipe_from_the_middle_changes_slide():
+    positions = [400] * 10 + glide(400, 230, 5) + [230] * 3
+    actions = run(positions, GesturePipeline(None, left_zone=0.2, right_zone=0.8))
+    assert [action for _, action in actions] == ['left']
+
+
+def test_swipe_detector_needs_travel_and_speed():
+    detector = SwipeDetector()
+    fast = [detector.update(hand_at(x), i / FPS) for i, x in enumerate(glide(300, 500, 6))]
+    assert [s for s in fast if s] == ['swipe_right']
+    detector.reset()
+    slow = [detector.update(hand_at(x), i / FPS) for i, x in enumerate(glide(300, 500, 60))]
+    assert not any(slow)
+
+
+def test_slide_gate_holds_off_the_opposite_direction():
+    gate = SlideGate(reverse_hold=1.5)
+    assert gate.update('point', 'right', 0.0) == 'right'
+    assert gate.update('point', None, 0.5) is None
+    assert gate.update('swipe_left', None, 1.0) is None
+    assert gate.suppressed == 1
+    assert gate.update('swipe_left', None, 1.6) == 'left'
+    assert gate.update('fist', 'left', 2.0) is None
+
+
+def test_slide_gate_ignores_swipes_starting_in_a_zone():
+    gate = SlideGate(reverse_hold=0)
+    for i in range(5):
+        gate.update('point', 'right', i / FPS)
+    assert gate.update('swipe_left', None, 5 / FPS) is None
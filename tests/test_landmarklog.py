@@ -0,0 +1,59 @@
+import numpy as np
+
+from landmarklog import LandmarkLog, LandmarkSession, replay
+from pipeline import FrameResult, GesturePipeline
+from test_gestures import glide, hand_at
+
+
+def logged_frames():
+    """A hand that appears, swipes right from the middle, holds, and leaves: (timestamp, FrameResult)."""
+    positions = [None] * 3 + [320] * 5 + glide(320, 560, 6) + [560] * 4 + [None] * 2
+    pipeline = GesturePipeline(None)
+    frames = []
+    for i, x in enumerate(positions):
+        out = FrameResult(np.zeros((480, 640, 3), dtype=np.uint8))
+        if x is not None:
+            out.hands.append(('Right', hand_at(x)))
+            out.hands.append(('Left', hand_at(100)))
+        pipeline.decide_hands(out, 640, i / 30)
+        frames.append((i / 30, out))
+    return frames
+
+
+def test_round_trip_across_chunks(tmp_path):
+    frames = logged_frames()
+    log = LandmarkLog(str(tmp_path / 'session'), chunk=4)  # Several file extensions
+    for timestamp, out in frames:
+        log.append(timestamp, out)
+    log.close()
+
+    session = LandmarkSession(log.path)
+    assert len(session) == len(frames)
+    assert session.frame_size == (640, 480)
+    np.testing.assert_allclose(session.time, [t for t, _ in frames])
+    for i, (_, out) in enumerate(frames):
+        assert session.count[i] == len(out.hands)
+        for j, (label, points) in enumerate(out.hands):
+            assert ('Left', 'Right')[session.handedness[i, j]] == label
+            np.testing.assert_array_equal(session.landmarks[i, j], points)
+    assert list(session.labels('gestures')) == [out.gesture or '' for _, out in frames]
+    assert list(session.labels('actions')) == [out.action or '' for _, out in frames]
+
+
+def test_replay_reproduces_the_logged_decisions(tmp_path):
+    frames = logged_frames()
+    log = LandmarkLog(str(tmp_path / 'session'))
+    for timestamp, out in frames:
+        log.append(timestamp, out)
+    log.close()
+
+    gestures, triggers = replay(LandmarkSession(log.path), GesturePipeline(None))
+    assert gestures == [out.gesture for _, out in frames]
+    assert [action for _, action in triggers] == ['right']
+
+
+def test_empty_log_opens(tmp_path):
+    log = LandmarkLog(str(tmp_path / 'empty'))
+    log.close()
+    session = LandmarkSession(log.path)
+    assert len(session) == 0 and session.landmarks.shape == (0, 2, 21, 3)
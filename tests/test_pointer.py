@@ -0,0 +1,69 @@
+import threading
+
+import numpy as np
+
+from pipeline import FrameResult
+from pointer import OneEuroFilter, PointerController
+
+
+def test_filter_is_steady_at_rest_and_follows_fast_moves():
+    rng = np.random.default_rng(0)
+    smooth = OneEuroFilter(min_cutoff=1.0, beta=0.05)
+    rest = [smooth((0.5 + rng.normal(0, 0.01), 0.5), i / 30) for i in range(60)]
+    raw_jitter = 0.01
+    assert np.std([x for x, _ in rest[30:]]) < raw_jitter / 2
+
+    smooth = OneEuroFilter(min_cutoff=1.0, beta=0.05)
+    for i in range(30):
+        smooth((0.0, 0.0), i / 30)
+    moved = [smooth((i * 50.0, 0.0), 1 + i / 30) for i in range(1, 15)]
+    assert moved[-1][0] > 0.9 * 14 * 50.0  # Fast motion: little lag
+
+
+def test_filter_restarts_on_reset_and_on_time_going_back():
+    smooth = OneEuroFilter()
+    smooth((0.0, 0.0), 1.0)
+    assert tuple(smooth((1.0, 1.0), 0.5)) == (1.0, 1.0)
+    smooth.reset()
+    assert tuple(smooth((0.2, 0.3), 2.0)) == (0.2, 0.3)
+
+
+class FakeInjector:
+    def __init__(self):
+        self.events = []
+        self.done = threading.Event()
+
+    def move(self, x, y):
+        self.events.append(('move', x, y))
+
+    def press(self):
+        self.events.append(('press',))
+
+    def release(self):
+        self.events.append(('release',))
+        self.done.set()
+
+
+def frame_result(index=None, gesture=None, screen=None):
+    out = FrameResult(np.zeros((480, 640, 3), dtype=np.uint8))
+    out.index, out.gesture = index, gesture
+    if screen is not None:
+        out.screen, out.screen_size = screen, (1920, 1080)
+    return out
+
+
+def test_camera_edges_map_to_screen_edges_and_pinch_clicks():
+    injector = FakeInjector()
+    pointer = PointerController(injector.move, injector.press, injector.release, (1000, 500), margin=0.1)
+    pointer.feed(frame_result((10, 10), 'point'), 0.0)  # Inside the margin: clamped to the corner
+    assert pointer.target[:2] == (0, 0)
+    pointer.feed(frame_result(screen=(1919, 1079), index=(0, 0), gesture='pinch'), 1.0)
+    assert pointer.coalesced == 1  # Nothing injected the first position yet
+    assert pointer.pressed
+
+    pointer.start()
+    pointer.feed(frame_result(), 2.0)  # Hand gone: button released
+    assert injector.done.wait(2)
+    pointer.stop()
+    assert [e[0] for e in injector.events] == ['move', 'press', 'release']
+    assert pointer.clicks == 1
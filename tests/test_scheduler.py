@@ -0,0 +1,39 @@
+import scheduler
+from scheduler import AdaptiveScheduler
+
+
+def run(monkeypatch, sched, inference, seconds, clock):
+    """Drives the scheduler with a 30 fps camera and inference time inference(scale); returns the levels seen."""
+    monkeypatch.setattr(scheduler.time, 'perf_counter', lambda: clock[0])
+    levels = [(sched.stride, sched.scale)]
+    for _ in range(int(seconds * 30)):
+        clock[0] += 1 / 30
+        sched.tick()
+        if sched.should_process():
+            sched.record(inference(sched.scale))
+        if levels[-1] != (sched.stride, sched.scale):
+            levels.append((sched.stride, sched.scale))
+    return levels
+
+
+def test_settles_at_the_load_threshold(monkeypatch):
+    # 30 ms per inference: ~90% load every frame, ~45% every other frame
+    sched = AdaptiveScheduler(target_latency=0.15)
+    levels = run(monkeypatch, sched, lambda scale: 0.03 * scale ** 2, 60, [0.0])
+    assert levels == [(1, 1.0), (2, 1.0)]
+
+
+def test_steps_back_up_when_inference_gets_cheaper(monkeypatch):
+    sched = AdaptiveScheduler(target_latency=0.15)
+    clock = [0.0]
+    run(monkeypatch, sched, lambda scale: 0.2 * scale ** 2, 30, clock)
+    assert sched.stride > 1 or sched.scale < 1.0
+    run(monkeypatch, sched, lambda scale: 0.005 * scale ** 2, 60, clock)
+    assert (sched.stride, sched.scale) == (1, 1.0)
+
+
+def test_level_changes_are_rate_limited_in_the_log(monkeypatch, capsys):
+    sched = AdaptiveScheduler(target_latency=0.15, log_every=30.0)
+    run(monkeypatch, sched, lambda scale: 0.3 * scale ** 2, 20, [0.0])
+    assert sched.changes > 1
+    assert capsys.readouterr().out.count("Scheduler:") == 1
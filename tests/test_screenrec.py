@@ -0,0 +1,33 @@
+import time
+
+import cv2
+import numpy as np
+
+import screenrec
+from screenrec import ScreenRecorder
+
+
+class ScaledGrabber:
+    """Reports one size but delivers shots of another, like a HiDPI output."""
+
+    name = 'fake'
+
+    def __init__(self, monitor=1):
+        self.size = (64, 48)
+
+    def grab(self, dst):
+        bgra = np.full((96, 128, 4), 200, dtype=np.uint8)
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=dst)
+
+    def close(self):
+        pass
+
+
+def test_recording_survives_shots_of_another_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(screenrec, 'open_grabber', ScaledGrabber)
+    recorder = ScreenRecorder(str(tmp_path / 'screen.avi'), fps=20, fourcc='MJPG')
+    deadline = time.monotonic() + 0.3
+    recorder.record(lambda: time.monotonic() < deadline)
+    assert recorder.captured > 0
+    assert recorder.written == int(recorder.elapsed * 20)
+    assert not recorder.pool.refs